@@ -0,0 +1,104 @@
+"""
+Import-time benchmark for the app modules.
+
+Imports each module in a fresh interpreter under python -X importtime,
+parses the report and fails if the module's cumulative import time is over
+its budget, or if it imports one of the heavy libraries that must only be
+imported inside the features that use them. Streamlit is imported first,
+since main.py has always loaded it by the time a module is opened, so only
+what the module itself adds is counted. The heaviest direct imports of each module are listed so that a
+regression points at the dependency that caused it.
+
+Usage: python benchmarks/bench_imports.py [--runs N]
+"""
+
+import subprocess
+import sys
+from pathlib import Path
+
+project_root = Path(__file__).parent.parent
+
+# Already imported by main.py before any module is opened
+BASELINE = ('streamlit',)
+
+# Cumulative import time allowed per module, in milliseconds. The parser
+# modules share about 150 ms of numpy, srsly and regex compilation.
+BUDGETS_MS = {
+    'resume_parser': 300,
+    'modules.users': 300,
+    'modules.recruiters': 400,
+    'modules.admin': 50,
+    'modules.app': 100,
+    'modules.feedback': 50,
+    'modules.resume_store': 50,
+}
+
+# Never imported at module import time
+LAZY_IMPORTS = ('spacy', 'pandas', 'plotly', 'matplotlib', 'wordcloud', 'google.generativeai',
+                'dateparser', 'fitz', 'PyPDF2', 'scipy')
+
+# Direct imports listed per module
+TOP_IMPORTS = 5
+
+
+def parse_importtime(stderr):
+    """Return (depth, cumulative microseconds, module) for every line of an -X importtime report"""
+    rows = []
+    for line in stderr.splitlines():
+        if not line.startswith('import time:') or 'cumulative' in line:
+            continue
+        _, cumulative, name = line[len('import time:'):].split('|')
+        depth = (len(name) - len(name.lstrip()) - 1) // 2
+        rows.append((depth, int(cumulative), name.strip()))
+    return rows
+
+
+def measure(module):
+    """
+    Import module once after the baseline. Returns (total µs, [(µs, direct
+    import)], [eagerly imported heavy libraries]) or raises RuntimeError.
+    """
+    code = '; '.join(f'import {name}' for name in BASELINE + (module,))
+    result = subprocess.run([sys.executable, '-X', 'importtime', '-c', code],
+                            cwd=project_root, capture_output=True, text=True)
+    if result.returncode != 0:
+        raise RuntimeError(result.stderr.strip().splitlines()[-1])
+    rows = parse_importtime(result.stderr)
+    # Children are reported before their parent, so the module's line closes its block
+    end = max(i for i, (depth, _, name) in enumerate(rows) if depth == 0 and name == module)
+    start = end
+    while start > 0 and rows[start - 1][0] > 0:
+        start -= 1
+    children = [(cumulative, name) for depth, cumulative, name in rows[start:end] if depth == 1]
+    eager = sorted({lazy for _, _, name in rows[start:end] for lazy in LAZY_IMPORTS
+                    if name == lazy or name.startswith(lazy + '.')})
+    return rows[end][1], sorted(children, reverse=True)[:TOP_IMPORTS], eager
+
+
+def run_benchmark(runs=3):
+    """Time every budgeted module, keeping the fastest of runs imports"""
+    failures = []
+    print(f"{'module':<24} {'import (ms)':>11} {'budget (ms)':>11}   heaviest imports")
+    for module, budget in BUDGETS_MS.items():
+        try:
+            total, children, eager = min(measure(module) for _ in range(runs))
+        except RuntimeError as e:
+            print(f"{module:<24} {'failed':>11} {budget:>11}   {e}")
+            failures.append(module)
+            continue
+        heaviest = ', '.join(f"{name} {cumulative / 1000:.0f}" for cumulative, name in children)
+        print(f"{module:<24} {total / 1000:>11.1f} {budget:>11}   {heaviest}")
+        if eager:
+            print(f"{'':<48}imports {', '.join(eager)} eagerly")
+        if total / 1000 > budget or eager:
+            failures.append(module)
+    return failures
+
+
+if __name__ == '__main__':
+    runs = int(sys.argv[sys.argv.index('--runs') + 1]) if '--runs' in sys.argv else 3
+    failures = run_benchmark(runs)
+    if failures:
+        print(f"Over budget, eager or failed to import: {', '.join(failures)}")
+        sys.exit(1)
+    print("All modules within budget")
@@ -0,0 +1,82 @@
+"""
+Backtracking benchmark for the guarded parser regexes.
+
+Runs every pattern registered through utils.regex_guard against adversarial
+inputs (50 KB without newlines, repeated capitalized words, long runs of
+blank lines, ...) and fails if any single search takes longer than its
+time budget.
+
+Usage: python benchmarks/bench_regex.py
+"""
+
+import sys
+import time
+from pathlib import Path
+
+# Add project root to path to fix imports
+project_root = Path(__file__).parent.parent
+if str(project_root) not in sys.path:
+    sys.path.append(str(project_root))
+
+from utils.regex_guard import registered_patterns
+# Imported for their guarded patterns
+import utils.contact_scanner  # noqa: F401
+from utils.education import get_known_institution
+from utils.job_titles import get_title_pattern
+
+# The gazetteer patterns are only compiled on first use
+get_known_institution()
+get_title_pattern()
+
+SIZE = 50 * 1024
+
+
+def _fill(unit):
+    return (unit * (SIZE // len(unit) + 1))[:SIZE]
+
+
+ADVERSARIAL_INPUTS = {
+    'lowercase words, no newlines': _fill('lorem ipsum dolor sit amet '),
+    'repeated capitalized words': _fill('Senior Software Work Experience Education '),
+    'single 50 KB word': 'a' * SIZE,
+    'dotted word': _fill('a.'),
+    'repeated prepositions': _fill('in at with for of '),
+    'blank lines': '\n' * SIZE,
+    'blank lines then letters': _fill('\n\nSECTION HEADER WITHOUT COLON '),
+    'whitespace run': ' ' * SIZE,
+    'near-miss email': _fill('john.smith.contact@'),
+    'near-miss university': _fill('State Tech Univ '),
+}
+
+
+def worst_case(pattern):
+    """Return (seconds, input name) of the slowest search or findall of a pattern"""
+    worst_time, worst_input = 0.0, ''
+    for input_name, text in ADVERSARIAL_INPUTS.items():
+        for method in (pattern.search, pattern.findall):
+            started = time.perf_counter()
+            method(text)
+            elapsed = time.perf_counter() - started
+            if elapsed > worst_time:
+                worst_time, worst_input = elapsed, input_name
+    return worst_time, worst_input
+
+
+def run_benchmark():
+    """Time every guarded pattern on every adversarial input"""
+    failures = []
+    print(f"{'pattern':<34} {'worst input':<32} {'worst (ms)':>10}")
+    for name, pattern in sorted(registered_patterns().items()):
+        worst_time, worst_input = worst_case(pattern)
+        print(f"{name:<34} {worst_input:<32} {worst_time * 1000:>10.1f}")
+        if worst_time > pattern.timeout:
+            failures.append(name)
+    return failures
+
+
+if __name__ == '__main__':
+    failures = run_benchmark()
+    if failures:
+        print(f"Over budget: {', '.join(failures)}")
+        sys.exit(1)
+    print("All patterns within budget")
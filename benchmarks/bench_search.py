@@ -0,0 +1,96 @@
+"""
+Candidate search benchmark.
+
+Fills a temporary database with synthetic candidates, indexed by the
+candidates_fts triggers as they are inserted, and times ranked full-text
+searches against the LIKE '%term%' scans they replaced.
+
+Usage: python benchmarks/bench_search.py [candidate count]
+"""
+
+import os
+import random
+import sqlite3
+import sys
+import tempfile
+import time
+from pathlib import Path
+
+# Add project root to path to fix imports
+project_root = Path(__file__).parent.parent
+if str(project_root) not in sys.path:
+    sys.path.append(str(project_root))
+
+from utils import candidate_search
+from utils.lexicon_artifact import load_lexicons
+
+FIRST_NAMES = ['John', 'Jane', 'Priya', 'Wei', 'Carlos', 'Amara', 'Olga', 'Kenji', 'Fatima', 'Liam']
+LAST_NAMES = ['Smith', 'Garcia', 'Patel', 'Chen', 'Okafor', 'Ivanova', 'Tanaka', 'Haddad', 'Murphy', 'Jones']
+DOMAINS = ['gmail.com', 'example.com', 'outlook.com', 'university.edu']
+EDUCATION = ["Bachelor's in Computer Science", "Master's in Data Science", 'MBA', 'BSc in Physics']
+SEARCHES = [('All', 'python'), ('Skills', 'java, machine learning'), ('Name', 'joh'),
+            ('Email', 'gmail.com'), ('All', 'dev*, kubernetes')]
+
+
+def fill(conn, count, skills):
+    conn.execute('''
+        CREATE TABLE candidates (
+            id INTEGER PRIMARY KEY AUTOINCREMENT, first_name TEXT, last_name TEXT, email TEXT,
+            skills TEXT, education TEXT, resume_score INTEGER DEFAULT 0, status TEXT DEFAULT 'Active'
+        )
+    ''')
+    candidate_search.create_search_index(conn.cursor())
+    rng = random.Random(0)
+    rows = []
+    for i in range(count):
+        first, last = rng.choice(FIRST_NAMES), rng.choice(LAST_NAMES)
+        rows.append((first, last, f"{first.lower()}.{last.lower()}{i}@{rng.choice(DOMAINS)}",
+                     ','.join(rng.sample(skills, 8)), rng.choice(EDUCATION), rng.randint(0, 100)))
+    with conn:
+        conn.executemany('INSERT INTO candidates (first_name, last_name, email, skills, education, resume_score) '
+                         'VALUES (?, ?, ?, ?, ?, ?)', rows)
+
+
+def like_search(cursor, query):
+    conditions, params = [], []
+    for term in (term.strip().rstrip('*') for term in query.split(',')):
+        conditions.append('(first_name LIKE ? OR last_name LIKE ? OR email LIKE ? OR skills LIKE ?)')
+        params.extend([f'%{term}%'] * 4)
+    cursor.execute(f"SELECT * FROM candidates WHERE resume_score >= 50 AND status = 'Active' "
+                   f"AND ({' OR '.join(conditions)})", params)
+    return cursor.fetchall()
+
+
+def timed(function, repeat=5):
+    best, result = float('inf'), None
+    for _ in range(repeat):
+        started = time.perf_counter()
+        result = function()
+        best = min(best, time.perf_counter() - started)
+    return best * 1000, result
+
+
+def run_benchmark(count):
+    taxonomy = load_lexicons().taxonomy
+    skills = sorted(load_lexicons().skills)[:2000]
+    fd, path = tempfile.mkstemp(suffix='.db')
+    os.close(fd)
+    try:
+        conn = sqlite3.connect(path)
+        started = time.perf_counter()
+        fill(conn, count, skills)
+        print(f"Inserted and indexed {count:,} candidates in {time.perf_counter() - started:.1f} s")
+        cursor = conn.cursor()
+        print(f"{'category':<8} {'query':<24} {'fts (ms)':>9} {'hits':>8} {'like (ms)':>10} {'hits':>8}")
+        for category, query in SEARCHES:
+            fts_ms, fts_rows = timed(lambda: candidate_search.search(
+                cursor, query, category, taxonomy, "c.resume_score >= ? AND c.status = 'Active'", (50,)))
+            like_ms, like_rows = timed(lambda: like_search(cursor, query))
+            print(f"{category:<8} {query:<24} {fts_ms:>9.1f} {len(fts_rows):>8} {like_ms:>10.1f} {len(like_rows):>8}")
+        conn.close()
+    finally:
+        os.remove(path)
+
+
+if __name__ == "__main__":
+    run_benchmark(int(sys.argv[1]) if len(sys.argv) > 1 else 200_000)
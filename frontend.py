@@ -21,12 +21,33 @@ def display_message(message, message_type="info"):
     else:
         st.write(message)
 
-def display_pdf(pdf_bytes):
-    """Display a PDF using Streamlit"""
-    import base64
-    base64_pdf = base64.b64encode(pdf_bytes).decode('utf-8')
-    pdf_display = f'<iframe src="data:application/pdf;base64,{base64_pdf}" width="100%" height="600" type="application/pdf"></iframe>'
-    st.markdown(pdf_display, unsafe_allow_html=True)
+# Pages shown at first, and added by each "Show more pages"
+PREVIEW_PAGES_STEP = 2
+
+def _show_more_pages(shown_key):
+    st.session_state[shown_key] = st.session_state.get(shown_key, PREVIEW_PAGES_STEP) + PREVIEW_PAGES_STEP
+
+def _pdf_pages(preview, key):
+    shown_key = f"{key}_pages"
+    shown = st.session_state.get(shown_key, PREVIEW_PAGES_STEP)
+    with preview:
+        page_count = preview.page_count
+        for page_number in range(min(shown, page_count)):
+            # Served by URL from Streamlit's media store, not inlined into the page
+            st.image(preview.page_image(page_number), caption=f"Page {page_number + 1} of {page_count}",
+                     width="stretch")
+    if shown < page_count:
+        # Clicking reruns only the fragment, after the callback has raised the page count
+        st.button(f"Show more pages ({page_count - shown} more)", key=f"{key}_more",
+                  on_click=_show_more_pages, args=(shown_key,))
+
+def display_pdf(pdf, dpi=None):
+    """Preview a PDF (bytes, an Upload or an uploaded file) as page images rendered on demand"""
+    from utils.pdf_preview import PdfPreview
+
+    preview = PdfPreview(pdf, dpi)
+    # A fragment, so showing more pages reruns only the preview
+    st.fragment(_pdf_pages)(preview, f"pdf_preview_{preview.upload.content_hash[:16]}")
 
 def show_skills(skills):
     """Display skills using Streamlit"""
@@ -6,6 +6,9 @@ import os
 import sys  # Add this import
 from pathlib import Path
 
+from utils.assets import AssetError, require_assets
+from utils.warmup import start_warmup
+
 # This must be the first Streamlit command
 st.set_page_config(
     page_title="Resume Parser",
@@ -127,6 +130,12 @@ st.markdown("""
         margin-left: auto;
         margin-right: auto;
     }
+    .warmup-status {
+        text-align: center;
+        color: #888888;
+        margin-top: 0.6rem;
+        font-size: 0.75em;
+    }
     /* Style for input fields */
     .custom-input {
         margin-bottom: 0.7rem;
@@ -458,6 +467,7 @@ def login_page():
                 user/user123 | admin/admin123 | recruiter/recruiter123
             </div>
         """, unsafe_allow_html=True)
+        warmup_indicator()
         st.markdown('</div>', unsafe_allow_html=True)
     
     # Copyright text at bottom of page
@@ -467,6 +477,30 @@ def login_page():
         </div>
     """, unsafe_allow_html=True)
 
+def _warmup_status():
+    warmup = start_warmup()
+    finished, total, running = warmup.progress()
+    if warmup.ready:
+        status = "🟢 Ready"
+    elif warmup.done:
+        status = "🟠 Ready, some components will load on first use"
+    else:
+        status = f"⏳ Warming up: {running or 'starting'} ({finished}/{total})"
+    st.markdown(f'<div class="warmup-status">{status}</div>', unsafe_allow_html=True)
+
+def warmup_indicator():
+    """Show the background warmup progress, refreshing every second until it is done"""
+    st.fragment(run_every=None if start_warmup().done else 1)(_warmup_status)()
+
+def show_warmup_progress():
+    """
+    Open a module that parses resumes without waiting for the warmup; until
+    it is done, show its progress. A model the warmup is still loading is
+    waited for only when the module first needs it (see load_spacy_model).
+    """
+    if not start_warmup().done:
+        warmup_indicator()
+
 def navigate_to_module(module_name):
     """Function to handle module navigation"""
     st.session_state.current_module = module_name
@@ -540,6 +574,7 @@ def navigation_page():
                 if str(project_root) not in sys.path:
                     sys.path.append(str(project_root))
                 
+                show_warmup_progress()
                 from modules.users import process_user_mode
                 process_user_mode()
             except Exception as e:
@@ -557,6 +592,7 @@ def navigation_page():
                 if str(project_root) not in sys.path:
                     sys.path.append(str(project_root))
                 
+                show_warmup_progress()
                 from modules.recruiters import process_recruiters_mode
                 process_recruiters_mode()
                 
@@ -702,6 +738,16 @@ def navigation_page():
 # Main app logic
 def main():
     """Main application function"""
+    # Fail fast, before any module loads a model, if a vendored asset is missing or modified
+    try:
+        require_assets()
+    except AssetError as e:
+        st.error(str(e))
+        st.stop()
+    # Load models, lexicons and the database schema in the background while the user logs in;
+    # already running when the server was started with serve.py
+    start_warmup()
+
     # Add bottom margin to account for copyright footer
     st.markdown("""
         <style>
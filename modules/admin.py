@@ -1,12 +1,13 @@
 import streamlit as st
 import sqlite3
-import pandas as pd
-import plotly.express as px
+from functools import partial
 from pathlib import Path
 import sys
 import os
 from datetime import datetime
 
+from utils.blob_store import create_tables, delete_uploads, read_blob, storage_used
+
 # Initialize paths
 MODULE_DIR = Path(__file__).parent
 PROJECT_DIR = MODULE_DIR.parent
@@ -19,16 +20,8 @@ def init_database():
     try:
         db_path = DATA_DIR / 'user_pdfs.db'
         with sqlite3.connect(db_path) as conn:
-            cursor = conn.cursor()
-            cursor.execute('''
-                CREATE TABLE IF NOT EXISTS user_uploaded_pdfs (
-                    id INTEGER PRIMARY KEY,
-                    name TEXT NOT NULL,
-                    data BLOB NOT NULL,
-                    archived INTEGER DEFAULT 0
-                )
-            ''')
-            conn.commit()
+            # PDFs live in the blob store; the table keeps their hashes
+            create_tables(conn)
     except Exception as e:
         st.error(f"Database initialization error: {str(e)}")
         # Add debug information
@@ -149,7 +142,7 @@ def display_admin_dashboard():
         st.info("Successfully logged in as Administrator")
         
         # Create tabs with error handling for each tab
-        tab1, tab2 = st.tabs(["📄 Resume Management", "💬 Feedback Analytics"])
+        tab1, tab2, tab3 = st.tabs(["📄 Resume Management", "💬 Feedback Analytics", "⚖️ Scoring"])
         
         with tab1:
             try:
@@ -165,6 +158,12 @@ def display_admin_dashboard():
                 st.error(f"Error loading Feedback Analytics: {str(e)}")
                 st.info("This section encountered an error. Please check the feedback data file.")
         
+        with tab3:
+            try:
+                display_rescoring()
+            except Exception as e:
+                st.error(f"Error loading Scoring: {str(e)}")
+        
         # Add logout button with proper spacing
         st.markdown("<br>", unsafe_allow_html=True)
         col1, col2, col3 = st.columns([1, 1, 1])
@@ -177,6 +176,70 @@ def display_admin_dashboard():
         st.error(f"Dashboard error: {str(e)}")
         display_back_button()
 
+def display_rescoring():
+    """Show the scoring weights and re-score the candidates table after they change"""
+    from utils.rescoring import get_rescore_job
+    from utils.scoring import WEIGHTS_FILE, load_weights
+
+    st.subheader("Candidate Scoring")
+    try:
+        components = load_weights()['components']
+    except (OSError, ValueError) as e:
+        st.error(f"Scoring weights could not be read: {e}")
+        return
+    st.table([{'Component': name, 'Max Points': spec['max'], 'Features': ', '.join(spec['terms'])}
+              for name, spec in components.items()])
+    st.caption(f"Scores are computed when a candidate is added. After editing {WEIGHTS_FILE}, re-score "
+               "the candidates that have a stored parse result. Candidates added by hand, and scores "
+               "changed by a recruiter when adding a candidate, keep their score.")
+
+    job = get_rescore_job()
+    reanalyze = st.checkbox("Re-run the extractors over the cached resumes first", key="rescore_reanalyze",
+                            help="For changes to the parser or lexicons; uses the stored pages, not the models")
+    col1, col2 = st.columns(2)
+    with col1:
+        if st.button("Re-score candidates", type="primary", disabled=job.running, key="rescore_btn"):
+            if reanalyze:
+                from resume_parser import reanalyze_resume
+
+                job.start(reanalyze=reanalyze_resume)
+            else:
+                job.start()
+    with col2:
+        if st.button("Cancel", disabled=not job.running, key="rescore_cancel_btn"):
+            job.cancel()
+
+    # Refresh the progress every second while the job runs
+    st.session_state.rescore_watching = job.running
+    st.fragment(run_every=1 if job.running else None)(display_rescore_progress)()
+
+def display_rescore_progress():
+    """Progress of the re-scoring job, with a full rerun once it finishes to re-enable the buttons"""
+    from utils.rescoring import CANCELLED, DONE, FAILED, get_rescore_job
+
+    job = get_rescore_job()
+    if job.running:
+        fraction = job.processed / job.total if job.total else 0.0
+        st.progress(fraction, text=f"{job.processed:,} of {job.total:,} candidates, "
+                                   f"{job.updated:,} scores changed ({job.elapsed:.1f}s)")
+        return
+    if st.session_state.get('rescore_watching'):
+        st.session_state.rescore_watching = False
+        st.rerun()
+    if job.state == DONE:
+        st.success(f"Re-scored {job.processed:,} candidates in {job.elapsed:.1f}s, "
+                   f"{job.updated:,} scores changed")
+        if job.reanalyze is not None:
+            st.caption(f"{job.reanalyzed:,} re-analyzed from their cached pages; the others keep their parse result")
+        if job.skipped or job.kept:
+            st.info(f"{job.skipped:,} candidates without a stored parse result and {job.kept:,} with a score "
+                    "entered by hand kept their score")
+    elif job.state == CANCELLED:
+        st.warning(f"Cancelled after {job.processed:,} of {job.total:,} candidates, "
+                   f"{job.updated:,} scores changed")
+    elif job.state == FAILED:
+        st.error(f"Re-scoring failed: {job.error}")
+
 def authenticate_admin(username: str, password: str) -> bool:
     """Authenticate admin credentials"""
     try:
@@ -276,6 +339,9 @@ def get_sentiment_emoji(score):
         return "☹️"
 
 def display_feedback_data_enhanced():
+    import pandas as pd
+    import plotly.express as px
+
     try:
         feedback_file = DATA_DIR / 'feedback_data.csv'
         if not feedback_file.exists():
@@ -599,6 +665,8 @@ def display_feedback_data_enhanced():
 
 def delete_feedback(feedback_indices):
     """Delete selected feedback from the CSV file"""
+    import pandas as pd
+
     try:
         # Use the clean file for consistent format
         clean_file = DATA_DIR / 'feedback_data_clean.csv'
@@ -655,6 +723,8 @@ def delete_feedback(feedback_indices):
 
 def archive_feedback(indices):
     """Archive selected feedback entries"""
+    import pandas as pd
+
     try:
         # Use clean file for consistent format
         clean_file = DATA_DIR / 'feedback_data_clean.csv'
@@ -731,13 +801,13 @@ def display_uploaded_pdfs_enhanced():
     with col1:
         st.metric("Total Resumes", len(uploaded_pdfs) if uploaded_pdfs else 0)
     with col2:
-        active_count = sum(1 for _, _, archived in uploaded_pdfs if not archived)
-        archived_count = sum(1 for _, _, archived in uploaded_pdfs if archived)
+        active_count = sum(1 for _, _, archived, _ in uploaded_pdfs if not archived)
+        archived_count = sum(1 for _, _, archived, _ in uploaded_pdfs if archived)
         metric_label = "Archived Resumes" if st.session_state.show_archived else "Active Resumes"
         metric_value = archived_count if st.session_state.show_archived else active_count
         st.metric(metric_label, metric_value)
     with col3:
-        st.metric("Storage Used", f"{len(uploaded_pdfs)*0.5:.1f} MB" if uploaded_pdfs else "0 MB")
+        st.metric("Storage Used", f"{get_storage_used() / (1024 * 1024):.1f} MB")
     
     # Search and filter options
     search_term = st.text_input("Search resumes:", placeholder="Enter name or ID")
@@ -750,14 +820,15 @@ def display_uploaded_pdfs_enhanced():
             # Create filtered PDFs list for display
             pdf_data_list = []
             
-            for pdf_id, pdf_name, archived in uploaded_pdfs:
+            for pdf_id, pdf_name, archived, blob_hash in uploaded_pdfs:
                 if search_term and search_term.lower() not in pdf_name.lower() and search_term != str(pdf_id):
                     continue
                 
                 pdf_data_list.append({
                     "ID": pdf_id,
                     "Resume Name": pdf_name,
-                    "Status": "Archived" if archived else "Active"
+                    "Status": "Archived" if archived else "Active",
+                    "Blob": blob_hash
                 })
             
             if pdf_data_list:
@@ -810,16 +881,14 @@ def display_uploaded_pdfs_enhanced():
                         """, unsafe_allow_html=True)
                     
                     with col4:
-                        pdf_data = get_pdf_data(pdf_id)
-                        if pdf_data:
-                            # Single column for download button
-                            st.download_button(
-                                label="Download",
-                                data=pdf_data[1],
-                                file_name=pdf_name,
-                                mime="application/pdf",
-                                key=f"download_{pdf_id}"
-                            )
+                        # The file is only read from the blob store when the button is clicked
+                        st.download_button(
+                            label="Download",
+                            data=partial(read_blob, row["Blob"]),
+                            file_name=pdf_name,
+                            mime="application/pdf",
+                            key=f"download_{pdf_id}"
+                        )
                     
                     st.markdown("---")
                 
@@ -881,17 +950,10 @@ def display_uploaded_pdfs_enhanced():
         st.info("Resumes will appear here once users upload them.")
 
 def delete_pdfs(pdf_ids):
-    """Delete selected PDFs from the database"""
+    """Delete selected PDFs, and their files once no other upload refers to them"""
     try:
         conn = sqlite3.connect('data/user_pdfs.db')
-        cursor = conn.cursor()
-        
-        # Delete each PDF by ID
-        for pdf_id in pdf_ids:
-            cursor.execute("DELETE FROM user_uploaded_pdfs WHERE id=?", (pdf_id,))
-        
-        # Commit the changes
-        conn.commit()
+        delete_uploads(conn, pdf_ids)
         conn.close()
         return True
     except sqlite3.Error as e:
@@ -937,12 +999,12 @@ def get_uploaded_pdfs():
         if "archived" in column_names:
             if st.session_state.get('show_archived', False):
                 # Get all PDFs with their archived status
-                cursor.execute("SELECT id, name, archived FROM user_uploaded_pdfs")
+                cursor.execute("SELECT id, name, archived, blob_hash FROM user_uploaded_pdfs")
             else:
                 # Only get non-archived PDFs
-                cursor.execute("SELECT id, name, archived FROM user_uploaded_pdfs WHERE archived=0 OR archived IS NULL")
+                cursor.execute("SELECT id, name, archived, blob_hash FROM user_uploaded_pdfs WHERE archived=0 OR archived IS NULL")
         else:
-            cursor.execute("SELECT id, name, 0 as archived FROM user_uploaded_pdfs")
+            cursor.execute("SELECT id, name, 0 as archived, blob_hash FROM user_uploaded_pdfs")
             
         uploaded_pdfs = cursor.fetchall()
         conn.close()
@@ -952,18 +1014,17 @@ def get_uploaded_pdfs():
         st.error(f"Error fetching uploaded PDFs: {e}")
         return []
 
-def get_pdf_data(pdf_id):
+def get_storage_used():
+    """Bytes used by the stored PDFs, counting a resume uploaded several times once"""
     try:
         conn = sqlite3.connect('data/user_pdfs.db')
-        cursor = conn.cursor()
-        cursor.execute("SELECT name, data FROM user_uploaded_pdfs WHERE id=?", (pdf_id,))
-        pdf_data = cursor.fetchone()
+        used = storage_used(conn)
         conn.close()
-        return pdf_data
+        return used
 
     except sqlite3.Error as e:
-        st.error(f"Error fetching PDF data: {e}")
-        return None
+        st.error(f"Error fetching storage used: {e}")
+        return 0
 
 def process_pdf(file):
     """Process uploaded PDF with default settings"""
@@ -1,14 +1,26 @@
 import streamlit as st
 from streamlit_extras.add_vertical_space import add_vertical_space
-import google.generativeai as genai
 import os
-import PyPDF2 as pdf
 from dotenv import load_dotenv
+import io
 import json
+from utils import speculative
+from utils.uploads import max_upload_mb
 
 # Load environment variables
 load_dotenv()
 
+# Module level, so the speculative extraction started on upload is found again on Submit
+def input_pdf_text(upload):
+    import PyPDF2 as pdf
+
+    reader = pdf.PdfReader(upload.path or io.BytesIO(upload.data))
+    text = ""
+    for page in range(len(reader.pages)):
+        page = reader.pages[page]
+        text += str(page.extract_text())
+    return text
+
 def process_matcher_mode():
     # Get API key and configure
     api_key = os.getenv("GOOGLE_API_KEY")
@@ -16,6 +28,8 @@ def process_matcher_mode():
         st.error("Google API key not found. Please create a .env file with GOOGLE_API_KEY")
         st.stop()
 
+    # The Gemini client is slow to import, so only the matcher pays for it
+    import google.generativeai as genai
     genai.configure(api_key=api_key)
 
     def get_gemini_response(input_text):
@@ -69,14 +83,6 @@ def process_matcher_mode():
                 
             return f"Error generating response: {str(e)}"
 
-    def input_pdf_text(uploaded_file):
-        reader = pdf.PdfReader(uploaded_file)
-        text = ""
-        for page in range(len(reader.pages)):
-            page = reader.pages[page]
-            text += str(page.extract_text())
-        return text
-
     # Add this helper function at the beginning of your process_matcher_mode function
     def clean_markdown_formatting(text):
         """Remove markdown formatting characters from text."""
@@ -138,7 +144,11 @@ def process_matcher_mode():
     st.title("ATS Resume Score Analyzer using Gemini Flash")
     st.text("Improve Your Resume ATS Score Here")
     jd = st.text_area("Paste the Job Description")
-    uploaded_file = st.file_uploader("Upload Your Resume", type="pdf", help="Please upload the pdf")
+    uploaded_file = st.file_uploader("Upload Your Resume", type="pdf", help="Please upload the pdf",
+                                     max_upload_size=max_upload_mb())
+    if uploaded_file is not None:
+        # Extract the text while the job description is being pasted
+        speculative.submit(input_pdf_text, uploaded_file)
 
     submit = st.button("Submit")
 
@@ -146,7 +156,7 @@ def process_matcher_mode():
         if uploaded_file is not None:
             # Extract text from the PDF
             with st.spinner("Extracting text from resume..."):
-                text = input_pdf_text(uploaded_file)
+                text = speculative.result(input_pdf_text, uploaded_file)
             
             # Format the input prompt with extracted text and job description
             formatted_prompt = input_prompt_template.format(text=text, jd=jd)
@@ -7,89 +7,65 @@ import os
 from datetime import datetime
 import sqlite3
 from contextlib import contextmanager
-import pandas as pd
-import plotly.express as px
 import base64  # For CSV export functionality
-import csv  # For reading CSV files
-import wordcloud  # For word cloud generation
-import matplotlib.pyplot as plt
 
 # Add project root to path to fix imports
 project_root = Path(__file__).parent.parent
 if str(project_root) not in sys.path:
     sys.path.append(str(project_root))
 
-# Remove the spacy import that's causing issues
-# and replace with more resilient code
+from utils.assets import AssetError, load_spacy_model
+from utils.contact_scanner import contact_values
+from utils.text_normalizer import normalize_text
+from utils import candidate_search, speculative
+from utils.uploads import max_upload_mb, receive_upload
+from utils.parsed_resume import ParsedResume
+from utils.doc_cache import pin_pages, unpin_pages
+from utils.scoring import entry_years, score_resume, total_score
+from utils.lexicon_artifact import load_lexicons
+from utils.education import find_institution
+from utils.regex_guard import SECTION_HEADERS, NEXT_SECTION, JOB_TITLE, COMPANY_AFTER_PREPOSITION, COMPANY_LEADING, \
+    FIELD_OF_STUDY
 
 # Define a function to safely import optional dependencies
 def safe_import(module_name):
     try:
-        pass  # Add your code here
-    except Exception as e:
-        st.error(f"An error occurred: {str(e)}")
         return __import__(module_name)
     except ImportError:
         return None
 
-# Safely import optional dependencies
-fitz = safe_import('fitz')  # PyMuPDF
-PyPDF2 = safe_import('PyPDF2')
-spacy = safe_import('spacy')
-
-# Initialize NLP if available
-nlp = None
-if spacy:
+def get_nlp():
+    """
+    The spaCy model if available, loaded on first use. It is verified by the
+    asset manager at startup and never downloaded or installed here; without
+    it the regex fallbacks are used.
+    """
+    if not safe_import('spacy'):
+        return None
     try:
-        try:
-            # Try to load the model first
-            nlp = spacy.load('en_core_web_sm')
-        except OSError:
-            # If model not found, install it
-            st.info("Installing spaCy model. This may take a moment...")
-            import subprocess
-            subprocess.run([sys.executable, "-m", "spacy", "download", "en_core_web_sm"], 
-                          check=True, capture_output=True)
-            
-            # Try loading again
-            try:
-                nlp = spacy.load('en_core_web_sm')
-                st.success("spaCy model installed successfully!")
-            except Exception as e:
-                st.warning(f"Could not load spaCy model after installation: {e}")
-    except Exception as e:
-        st.warning(f"Could not set up spaCy: {e}")
-        
-        # Try alternative installation method if first one fails
-        try:
-            import subprocess
-            st.info("Trying alternative installation method...")
-            subprocess.run([sys.executable, "-m", "pip", "install", "https://github.com/explosion/spacy-models/releases/download/en_core_web_sm-3.7.0/en_core_web_sm-3.7.0-py3-none-any.whl"], 
-                          check=True, capture_output=True)
-            nlp = spacy.load('en_core_web_sm')
-            st.success("spaCy model installed via alternative method!")
-        except Exception as e2:
-            st.warning(f"All spaCy installation attempts failed: {e2}")
+        return load_spacy_model('en_core_web_sm')
+    except AssetError as e:
+        st.warning(f"Could not load spaCy model: {e}")
+        return None
 
 # Simplified PDF text extraction that doesn't depend on external modules
 def extract_text_from_pdf(file) -> str:
+    # Optional PDF libraries are imported on first use
+    fitz = safe_import('fitz')  # PyMuPDF
+    PyPDF2 = safe_import('PyPDF2')
     try:
         if fitz:
-            # Try PyMuPDF first
-            pdf_document = fitz.open(stream=file.read(), filetype="pdf")
-            file.seek(0)  # Reset file pointer
-            text = ""
-            for page_num in range(len(pdf_document)):
-                page = pdf_document.load_page(page_num)
-                text += page.get_text()
-            return text
+            # Try PyMuPDF first, on the upload's own bytes rather than a copy read from it
+            with receive_upload(file).open_pdf() as pdf_document:
+                text = "".join(page.get_text() for page in pdf_document)
+            return normalize_text(text).text
         elif PyPDF2:
             # Fall back to PyPDF2
             pdf_reader = PyPDF2.PdfReader(file)
             text = ""
             for page_num in range(len(pdf_reader.pages)):
                 text += pdf_reader.pages[page_num].extract_text()
-            return text
+            return normalize_text(text).text
         else:
             pass
             pass
@@ -102,29 +78,8 @@ def extract_text_from_pdf(file) -> str:
 # Cache skills parsing
 @st.cache_data
 def parse_all_skills() -> Set[str]:
-    skills_list = set()
-    try:
-        pass  # Add your code here
-    except Exception as e:
-        st.error(f"An error occurred: {str(e)}")
-        pass  # Add your code here
-    except Exception as e:
-        st.error(f"An error occurred: {str(e)}")
-        pass  # Add your code here
-    except Exception as e:
-        st.error(f"An error occurred: {str(e)}")
-        pass  # Add your code here
-    except Exception as e:
-        st.error(f"An error occurred: {str(e)}")
-        pass  # Add the code to execute here
-    except Exception as e:
-        st.error(f"An error occurred: {str(e)}")
-        with open('data/UpdatedSkills.csv', 'r') as file:
-            reader = csv.reader(file)
-            skills_list = {str(item).lower() for row in reader for item in row}
-    except FileNotFoundError:
-        st.warning("Skills database not found. Creating new one.")
-    return skills_list
+    # Skills come from the prebuilt lexicon artifact instead of re-reading the CSVs
+    return {skill.lower() for skill in load_lexicons().skills}
 
 # Import from resume_parser with backup implementations
 try:
@@ -132,7 +87,7 @@ try:
         extract_resume_info_from_pdf, extract_contact_number_from_resume,
         extract_education_from_resume, extract_experience,
         suggest_skills_for_job, show_colored_skills,
-        calculate_resume_score, extract_resume_info
+        extract_resume_info
     )
     parser_imported = True
 except ImportError as e:
@@ -160,25 +115,10 @@ except ImportError as e:
         # Extract sections from resume
         sections = extract_resume_sections(text)
         
-        # Extract email with improved pattern
-        email_pattern = r'[\w.+-]+@[\w-]+\.[\w.-]+'
-        email_matches = re.findall(email_pattern, text)
-        if email_matches:
-            result['email'] = email_matches[0]
-        
-        # Extract phone with more comprehensive pattern
-        phone_patterns = [
-            r'(?:\+\d{1,3}\s?)?\(?\d{3}\)?[-.\s]?\d{3}[-.\s]?\d{4}',  # (123) 456-7890
-            r'\d{3}[-.\s]?\d{3}[-.\s]?\d{4}',  # 123-456-7890
-            r'\+\d{1,3}\s\d{10}',  # +1 1234567890
-            r'\+\d{1,3}\s\d{1,4}\s\d{6,10}'  # +1 123 4567890
-        ]
-        
-        for pattern in phone_patterns:
-            phone_match = re.search(pattern, text)
-            if phone_match:
-                result['phone'] = phone_match.group(0)
-                break
+        # Extract email and phone with a single contact scan
+        contacts = contact_values(text)
+        result['email'] = contacts['email']
+        result['phone'] = contacts['phone']
         
         # Extract name - using multiple techniques
         # 1. Try NLP named entity recognition if available
@@ -219,31 +159,15 @@ except ImportError as e:
     def extract_resume_sections(text):
         sections = {}
         
-        # Common section headers in resumes
-        section_patterns = {
-            'education': r'(?:EDUCATION|ACADEMIC|QUALIFICATION|DEGREE)',
-            'experience': r'(?:EXPERIENCE|EMPLOYMENT|WORK|PROFESSIONAL|CAREER)',
-            'skills': r'(?:SKILLS|TECHNICAL|TECHNOLOGIES|EXPERTISE|PROFICIENCY)',
-            'projects': r'(?:PROJECTS|PROJECT EXPERIENCE)',
-            'certifications': r'(?:CERTIFICATIONS|CERTIFICATES)',
-            'summary': r'(?:SUMMARY|PROFILE|OBJECTIVE)'
-        }
-        
         # Find sections
-        for section_name, pattern in section_patterns.items():
-            section_matches = re.finditer(rf"^\s*{pattern}.*", text, re.IGNORECASE | re.MULTILINE)
-            for match in section_matches:
+        for section_name, header_pattern in SECTION_HEADERS.items():
+            for match in header_pattern.finditer(text):
                 section_start = match.start()
                 section_header = match.group(0).strip()
                 
                 # Find the start of the next section
-                next_section_start = len(text)
-                for other_pattern in section_patterns.values():
-                    other_matches = re.finditer(f"{other_pattern}.*?(?:\n|\r|\r\n)", text[section_start+len(section_header):], re.IGNORECASE | re.MULTILINE)
-                    for other_match in other_matches:
-                        next_start = section_start + len(section_header) + other_match.start()
-                        if next_start < next_section_start:
-                            next_section_start = next_start
+                next_match = NEXT_SECTION.search(text, section_start + len(section_header))
+                next_section_start = next_match.start() if next_match else len(text)
                 
                 # Extract the section content
                 sections[section_name] = text[section_start:next_section_start].strip()
@@ -252,6 +176,7 @@ except ImportError as e:
 
     # Helper function to extract name using NLP
     def extract_name_with_nlp(text):
+        nlp = get_nlp()
         if nlp:
             try:
                 # Process only first few hundred chars for speed
@@ -273,51 +198,20 @@ except ImportError as e:
     def extract_skills(text, skills_section=None):
         skills = []
         
-        # Common technical skills to look for
-        common_skills = [
-            # Programming Languages
-            "python", "java", "javascript", "typescript", "c", "c\\+\\+", "c#", "ruby", "go", "rust", 
-            "php", "swift", "kotlin", "r", "perl", "scala", "dart", "matlab", "bash", "powershell",
-            
-            # Web Technologies
-            "html", "css", "react", "angular", "vue", "node", "express", "django", "flask", "spring", 
-            "laravel", "asp\\.net", "wordpress", "bootstrap", "jquery", "redux", "graphql", "rest api",
-            
-            # Databases
-            "sql", "mysql", "postgresql", "mongodb", "oracle", "sqlite", "nosql", "redis", "cassandra", 
-            "dynamodb", "mariadb", "firebase", "elasticsearch",
-            
-            # Cloud & DevOps
-            "aws", "azure", "gcp", "docker", "kubernetes", "terraform", "jenkins", "ci/cd", "git", 
-            "github", "gitlab", "bitbucket", "cloudformation", "ansible", "puppet", "chef",
-            
-            # Data Science & ML
-            "machine learning", "deep learning", "pytorch", "tensorflow", "keras", "scikit-learn", 
-            "pandas", "numpy", "matplotlib", "tableau", "power bi", "data visualization", "statistics",
-            
-            # Mobile
-            "android", "ios", "react native", "flutter", "xamarin", "swift", "objective-c",
-            
-            # Other Tech Skills
-            "aws", "restful", "graphql", "microservices", "agile", "scrum", "jira"
-        ]
-        
         # First try to extract from dedicated skills section if available
         if skills_section:
             # Look for skills separated by commas, bullets, or new lines
             skill_matches = re.findall(r'(?:^|\n|,|•|\*)\s*([A-Za-z0-9#\+\-\.]+(?: [A-Za-z0-9#\+\-\.]+){0,2})\s*(?:,|$|\n|•|\*)', skills_section)
             for match in skill_matches:
-                skill = match.strip().lower()
-                if len(skill) > 2 and skill not in skills:  # Avoid too short skills and duplicates
+                skill = match.strip()
+                if len(skill) > 2:  # Avoid too short skills
                     skills.append(skill)
         
-        # Then look for common skills throughout the resume
-        for skill in common_skills:
-            if re.search(r'\b' + skill + r'\b', text.lower()):
-                if skill not in skills:
-                    skills.append(skill)
+        # Then look for every taxonomy skill and synonym throughout the resume
+        skills.extend(load_lexicons().match_skills(text))
         
-        return skills
+        # One canonical spelling per skill
+        return load_lexicons().taxonomy.canonical_list(skills)
 
     # Improved education extraction
     def extract_education_from_resume(text, education_section=None):
@@ -357,7 +251,7 @@ except ImportError as e:
             dates = extract_dates(surrounding_text)
             
             # Try to extract field of study
-            field_match = re.search(r'in\s+([A-Za-z\s]+?)(?:,|\.|from|\(|\)|\n|$)', surrounding_text, re.IGNORECASE)
+            field_match = FIELD_OF_STUDY.search(surrounding_text)
             field = field_match.group(1).strip() if field_match else ""
             
             education_entries.append({
@@ -385,17 +279,10 @@ except ImportError as e:
 
     # Helper to extract university names
     def extract_university(text):
-        # Common university/college indicators
-        university_patterns = [
-            r"(?:University|College|Institute|School) of [\w\s]+",
-            r"[\w\s]+ (?:University|College|Institute)",
-            r"[\w\s]+ (?:School)"
-        ]
-        
-        for pattern in university_patterns:
-            university_match = re.search(pattern, text, re.IGNORECASE)
-            if university_match:
-                return university_match.group(0).strip()
+        # Known institutions first, then "University of X" / "X College" shapes
+        university_match = find_institution(text)
+        if university_match:
+            return university_match.group(0).strip()
         
         return ""
 
@@ -458,19 +345,15 @@ except ImportError as e:
             entry = {}
             
             # Try to extract job title
-            title_match = re.search(r'((?:Senior|Junior|Lead|Principal|Chief)?\s*[\w\s]+?(?:Engineer|Developer|Designer|Manager|Director|Analyst|Consultant|Architect))', 
-                                   entry_text, re.IGNORECASE)
+            title_match = JOB_TITLE.search(entry_text)
             if title_match:
                 entry['title'] = title_match.group(1).strip()
             
             # Try to extract company name
-            company_patterns = [
-                r'(?:at|with|for)\s+([\w\s&]+?)(?:,|\.|in|\(|\)|\n|$)',
-                r'([\w\s&]+?)(?:,|\.|in|\(|\)|\n|$)'
-            ]
+            company_patterns = [COMPANY_AFTER_PREPOSITION, COMPANY_LEADING]
             
             for pattern in company_patterns:
-                company_match = re.search(pattern, entry_text, re.IGNORECASE)
+                company_match = pattern.search(entry_text)
                 if company_match:
                     company = company_match.group(1).strip()
                     if len(company) > 3 and len(company) < 40:  # Reasonable company name length
@@ -559,28 +442,82 @@ def create_candidates_table():
                 resume_score INTEGER DEFAULT 0,
                 submission_date TEXT,
                 status TEXT DEFAULT 'Active',
-                shortlisted INTEGER DEFAULT 0
+                shortlisted INTEGER DEFAULT 0,
+                parsed_resume BLOB,
+                page_hashes TEXT,
+                score_edited INTEGER DEFAULT 0
             )
         ''')
+        # Taxonomy skill IDs of each candidate, for search and analytics
+        cursor.execute('''
+            CREATE TABLE IF NOT EXISTS candidate_skills (
+                candidate_id INTEGER NOT NULL,
+                skill_id INTEGER NOT NULL,
+                PRIMARY KEY (candidate_id, skill_id)
+            )
+        ''')
+        cursor.execute('CREATE INDEX IF NOT EXISTS idx_candidate_skills_skill ON candidate_skills (skill_id)')
+        # Full-text index for search, kept in step with candidates by triggers
+        candidate_search.create_search_index(cursor)
+        conn.commit()
+
+def store_candidate_skill_ids(cursor, candidate_id, skills):
+    """Record the taxonomy IDs of a candidate's known skills"""
+    skill_ids = load_lexicons().taxonomy.ids_of(skills)
+    cursor.executemany('INSERT OR IGNORE INTO candidate_skills (candidate_id, skill_id) VALUES (?, ?)',
+                       [(candidate_id, skill_id) for skill_id in skill_ids])
+
+def migrate_candidates_table():
+    """
+    Add the shortlisted and parsed_resume columns to the candidates table if
+    they don't exist and index the skills of older candidates. Has no UI, so
+    it can run outside a page (see utils.warmup); returns whether shortlisted
+    was added and raises on errors.
+    """
+    with get_db_connection() as conn:
+        cursor = conn.cursor()
+        
+        # Check if shortlisted column exists
+        cursor.execute("PRAGMA table_info(candidates)")
+        columns = [column_info[1] for column_info in cursor.fetchall()]
+        
+        # Add shortlisted column if it doesn't exist
+        if 'shortlisted' not in columns:
+            cursor.execute('ALTER TABLE candidates ADD COLUMN shortlisted INTEGER DEFAULT 0')
+            conn.commit()
+        
+        # Add parsed_resume column (ParsedResume.to_bytes) if it doesn't exist
+        if 'parsed_resume' not in columns:
+            cursor.execute('ALTER TABLE candidates ADD COLUMN parsed_resume BLOB')
+            conn.commit()
+        
+        # Add page_hashes column (the resume's pages in utils.doc_cache) if it doesn't exist
+        if 'page_hashes' not in columns:
+            cursor.execute('ALTER TABLE candidates ADD COLUMN page_hashes TEXT')
+            conn.commit()
+        
+        # Add score_edited column (a score set by hand, kept by re-scoring) if it doesn't exist
+        if 'score_edited' not in columns:
+            cursor.execute('ALTER TABLE candidates ADD COLUMN score_edited INTEGER DEFAULT 0')
+            conn.commit()
+        
+        # Index the skill IDs of candidates stored before candidate_skills existed
+        cursor.execute('''
+            SELECT id, skills FROM candidates
+            WHERE skills != '' AND id NOT IN (SELECT candidate_id FROM candidate_skills)
+        ''')
+        for candidate_id, skills in cursor.fetchall():
+            store_candidate_skill_ids(cursor, candidate_id, skills.split(','))
         conn.commit()
+        
+        return 'shortlisted' not in columns
 
 def update_candidates_table_schema():
-    """Add shortlisted column to candidates table if it doesn't exist"""
+    """Add shortlisted and parsed_resume columns to candidates table if they don't exist"""
     try:
-        with get_db_connection() as conn:
-            cursor = conn.cursor()
-            
-            # Check if shortlisted column exists
-            cursor.execute("PRAGMA table_info(candidates)")
-            columns = [column_info[1] for column_info in cursor.fetchall()]
-            
-            # Add shortlisted column if it doesn't exist
-            if 'shortlisted' not in columns:
-                cursor.execute('ALTER TABLE candidates ADD COLUMN shortlisted INTEGER DEFAULT 0')
-                conn.commit()
-                st.success("Database schema updated successfully")
-            
-            return True
+        if migrate_candidates_table():
+            st.success("Database schema updated successfully")
+        return True
     except Exception as e:
         st.error(f"Error updating database schema: {e}")
         return False
@@ -625,28 +562,63 @@ def get_shortlisted_candidates():
             candidates.append(candidate)
         return candidates
 
+def candidate_doc_owner(candidate_id):
+    """Owner key of a candidate's pinned pages in the doc cache"""
+    return f"candidate:{candidate_id}"
+
 def add_candidate(first_name, last_name, email, phone, skills, 
                  experience_years=0, education="", resume_score=0, 
-                 submission_date=None, status="Active"):
-    """Add new candidate to database"""
+                 submission_date=None, status="Active", parsed_resume=None, doc=None, score_edited=False):
+    """
+    Add new candidate to database, with the ParsedResume it was extracted
+    into if any. With the parsed Doc of the resume, its cached pages are
+    recorded and kept, so the candidate can be re-analyzed without the models.
+    score_edited marks a resume_score the recruiter changed, which
+    re-scoring leaves alone.
+    """
+    page_hashes = doc.user_data.get('page_hashes') if doc is not None else None
     if not submission_date:
         submission_date = datetime.now().strftime('%Y-%m-%d %H:%M:%S')
         
-    # Convert skills list to comma-separated string
-    if isinstance(skills, list):
-        skills = ','.join(skills)
+    # Store one canonical spelling per skill as a comma-separated string
+    if isinstance(skills, str):
+        skills = skills.split(',')
+    skills = load_lexicons().taxonomy.canonical_list(skills or [])
     
     with get_db_connection() as conn:
         cursor = conn.cursor()
         cursor.execute('''
             INSERT INTO candidates 
             (first_name, last_name, email, phone, skills, experience_years, 
-            education, resume_score, submission_date, status)
-            VALUES (?, ?, ?, ?, ?, ?, ?, ?, ?, ?)
-        ''', (first_name, last_name, email, phone, skills, experience_years,
-              education, resume_score, submission_date, status))
+            education, resume_score, submission_date, status, parsed_resume, page_hashes, score_edited)
+            VALUES (?, ?, ?, ?, ?, ?, ?, ?, ?, ?, ?, ?, ?)
+        ''', (first_name, last_name, email, phone, ','.join(skills), experience_years,
+              education, resume_score, submission_date, status,
+              parsed_resume.to_bytes() if parsed_resume else None,
+              ','.join(page_hashes) if page_hashes else None, int(score_edited)))
+        candidate_id = cursor.lastrowid
+        store_candidate_skill_ids(cursor, candidate_id, skills)
         conn.commit()
-        return cursor.lastrowid
+    if page_hashes:
+        try:
+            pin_pages(candidate_doc_owner(candidate_id), page_hashes, doc.user_data['doc_pipeline'])
+        except Exception as e:
+            print(f"Error pinning cached pages of candidate {candidate_id}: {str(e)}")
+    return candidate_id
+
+def get_candidate_parsed_resume(candidate_id):
+    """Return the stored ParsedResume of a candidate, or None"""
+    with get_db_connection() as conn:
+        cursor = conn.cursor()
+        cursor.execute('SELECT parsed_resume FROM candidates WHERE id = ?', (candidate_id,))
+        row = cursor.fetchone()
+    if not row or not row['parsed_resume']:
+        return None
+    try:
+        return ParsedResume.from_bytes(row['parsed_resume'])
+    except ValueError as e:
+        print(f"Could not load parsed resume for candidate {candidate_id}: {e}")
+        return None
 
 # Updated delete_candidate function with better error handling
 def delete_candidate(candidate_id):
@@ -659,75 +631,46 @@ def delete_candidate(candidate_id):
             if not cursor.fetchone():
                 return False
             
-            # Then delete the candidate
+            # Then delete the candidate and its skill IDs
             cursor.execute('DELETE FROM candidates WHERE id = ?', (candidate_id,))
+            deleted = cursor.rowcount > 0
+            cursor.execute('DELETE FROM candidate_skills WHERE candidate_id = ?', (candidate_id,))
             conn.commit()
-            return cursor.rowcount > 0  # Return True if a row was deleted
+        try:
+            # Its cached pages can be evicted again
+            unpin_pages(candidate_doc_owner(candidate_id))
+        except Exception as e:
+            print(f"Error unpinning cached pages of candidate {candidate_id}: {str(e)}")
+        return deleted  # Return True if a row was deleted
     except Exception as e:
         st.error(f"Database error during deletion: {e}")
         return False
 
+def get_skill_counts():
+    """Return (skill, number of candidates) pairs, most common first, counted on skill IDs"""
+    taxonomy = load_lexicons().taxonomy
+    with get_db_connection() as conn:
+        cursor = conn.cursor()
+        cursor.execute('''
+            SELECT skill_id, COUNT(*) AS count FROM candidate_skills
+            GROUP BY skill_id ORDER BY count DESC
+        ''')
+        return [(taxonomy.name(row['skill_id']), row['count'])
+                for row in cursor.fetchall() if row['skill_id'] in taxonomy]
+
 def search_candidates(query=None, min_score=0, category="All", status="Active"):
-    """Search candidates based on criteria with improved filtering"""
+    """Search candidates based on criteria, the best matches first when there is a query"""
     with get_db_connection() as conn:
         cursor = conn.cursor()
         
-        base_query = '''
-            SELECT * FROM candidates 
-            WHERE resume_score >= ? 
-            AND status = ?
-        '''
-        params = [min_score, status]
-        
         if query:
-            # Split the query to support multiple search terms
-            search_terms = [term.strip() for term in query.split(',')]
-            
-            if category == "All":
-                # Search in all fields with OR between terms
-                conditions = []
-                for term in search_terms:
-                    conditions.append("first_name LIKE ?")
-                    conditions.append("last_name LIKE ?")
-                    conditions.append("email LIKE ?")
-                    conditions.append("skills LIKE ?")
-                    # Add parameters for each condition
-                    search_param = f'%{term}%'
-                    params.extend([search_param, search_param, search_param, search_param])
-                
-                base_query += f" AND ({' OR '.join(conditions)})"
-                
-            elif category == "Skills":
-                # For skills, we need to check if ANY of the terms match
-                skill_conditions = []
-                for term in search_terms:
-                    skill_conditions.append("skills LIKE ?")
-                    params.append(f'%{term}%')
-                
-                base_query += f" AND ({' OR '.join(skill_conditions)})"
-                
-            elif category == "Name":
-                # For names, check both first and last name
-                name_conditions = []
-                for term in search_terms:
-                    name_conditions.append("first_name LIKE ?")
-                    name_conditions.append("last_name LIKE ?")
-                    params.extend([f'%{term}%', f'%{term}%'])
-                
-                base_query += f" AND ({' OR '.join(name_conditions)})"
-                
-            elif category == "Email":
-                # For email, we need exact matches or partial
-                email_conditions = []
-                for term in search_terms:
-                    email_conditions.append("email LIKE ?")
-                    params.append(f'%{term}%')
-                
-                base_query += f" AND ({' OR '.join(email_conditions)})"
-        
-        # Execute the query
-        cursor.execute(base_query, params)
-        rows = cursor.fetchall()
+            # Full-text search over the candidates_fts index, ranked by bm25()
+            rows = candidate_search.search(cursor, query, category, load_lexicons().taxonomy,
+                                           'c.resume_score >= ? AND c.status = ?', (min_score, status))
+        else:
+            cursor.execute('SELECT * FROM candidates WHERE resume_score >= ? AND status = ?',
+                           (min_score, status))
+            rows = cursor.fetchall()
         candidates = []
         
         for row in rows:
@@ -743,6 +686,11 @@ def search_candidates(query=None, min_score=0, category="All", status="Active"):
 
 def sort_candidates(candidates, sort_option):
     """Sort candidates based on the selected option"""
+    # Search results already come most relevant first
+    if sort_option == "Relevance":
+        return candidates
+    import pandas as pd
+
     try:
         if sort_option == "Score (High to Low)":
             return sorted(candidates, key=lambda x: int(x.get('resume_score', 0)), reverse=True)
@@ -940,7 +888,8 @@ def process_recruiters_mode():
             with sort_col2:
                 sort_option = st.selectbox(
                     "",
-                    options=["Score (High to Low)", "Experience (High to Low)", "Recent First", "Name (A-Z)"],
+                    options=["Relevance", "Score (High to Low)", "Experience (High to Low)", "Recent First",
+                             "Name (A-Z)"],
                     label_visibility="collapsed",
                     key="sort_option"
                 )
@@ -960,27 +909,27 @@ def process_recruiters_mode():
                         st.info("""
                         **Tips for skills search:**
                         - Separate multiple skills with commas: "python, java"
-                        - Try using lowercase: "javascript" instead of "JavaScript"
-                        - Use simpler terms: "js" instead of "javascript"
+                        - Skills match whole words: "java" does not find "javascript"
+                        - Add * to match the start of a skill: "java*"
                         """)
                     elif search_category == "Name":
                         st.info("""
                         **Tips for name search:**
                         - Try searching for first name or last name separately
-                        - Check spelling and try partial names
+                        - Check spelling, or type just the start of a name: "joh"
                         """)
                     elif search_category == "Email":
                         st.info("""
                         **Tips for email search:**
-                        - Try searching for the domain: "@gmail.com"
-                        - Or search for just part of the email: "john"
+                        - Try searching for the domain: "gmail.com"
+                        - Or for the start of the email: "john"
                         """)
                     else:
                         st.info("""
                         **Tips for better search results:**
                         - For multiple skills, separate them with commas: "python, java"
-                        - Try using partial terms: "dev" instead of "developer"
-                        - Check your spelling and try using lowercase
+                        - Add * to match the start of a word: "dev*" finds "developer"
+                        - Check your spelling
                         """)
                 else:
                     # Show results with better formatting
@@ -1060,6 +1009,8 @@ def process_recruiters_mode():
                         })
 
                     # Create DataFrame and use native Streamlit download button
+                    import pandas as pd
+
                     df = pd.DataFrame(export_data)
                     provide_download_csv(df, "shortlisted_candidates.csv")
 
@@ -1127,41 +1078,38 @@ def process_recruiters_mode():
             st.markdown("---")
             st.subheader("Or Upload Resume PDF")
             
-            uploaded_file = st.file_uploader("Upload a PDF resume to extract candidate info", type="pdf")
+            uploaded_file = st.file_uploader("Upload a PDF resume to extract candidate info", type="pdf",
+                                             max_upload_size=max_upload_mb())
             
             if uploaded_file:
+                # The edit form below is only shown once extraction has succeeded
+                extracted = False
                 try:
                     with st.spinner("Extracting information from PDF..."):
-                        pdf_text = extract_resume_info_from_pdf(uploaded_file)
+                        # Reruns (e.g. Add candidate) reuse the parse started on upload
+                        pdf_text = speculative.result(extract_resume_info_from_pdf, uploaded_file)
                         
                         if not pdf_text:
                             st.error("Could not extract text from PDF. Please ensure it's a text-based PDF.")
                         else:
                             # Extract resume info
                             resume_info = extract_resume_info(pdf_text)
+                            parsed_resume = ParsedResume.from_resume_info(resume_info)
                             
                             # Extract experience with better handling
-                            experience_data = resume_info.get('experience', {'work_experiences': [], 'total_years': 0})
-                            experience_years = experience_data.get('total_years', 0)
+                            experience_data = resume_info.get('experience', {'work_experiences': []})
+                            experience_years = round(sum(entry_years(entry) for entry in parsed_resume.work), 1)
                             
-                            # Get education info
-                            education_entries = resume_info.get('education', [])
+                            # Get education info from the normalized entries (either parser)
                             education_formatted = []
-                            for entry in education_entries:
-                                degree = entry.get('degree', '')
-                                university = entry.get('university', '')
-                                field = entry.get('field', '')
-                                dates = entry.get('dates', '')
-                                
+                            for entry in parsed_resume.education:
                                 edu_parts = []
-                                if degree:
-                                    edu_parts.append(degree)
-                                if field:
-                                    edu_parts.append(f"in {field}")
-                                if university:
-                                    edu_parts.append(f"from {university}")
-                                if dates:
-                                    edu_parts.append(f"({dates})")
+                                if entry.degree:
+                                    edu_parts.append(entry.degree)
+                                if entry.institution:
+                                    edu_parts.append(f"from {entry.institution}" if entry.degree else entry.institution)
+                                if entry.dates:
+                                    edu_parts.append(f"({entry.dates})")
                                 
                                 if edu_parts:
                                     education_formatted.append(" ".join(edu_parts))
@@ -1171,8 +1119,8 @@ def process_recruiters_mode():
                                 education_formatted = extract_education_from_resume(pdf_text)
         
                             # Calculate resume score
-                            score_components = calculate_resume_score(resume_info)
-                            score = sum(score_components.values())
+                            score_components = score_resume(resume_info)
+                            score = total_score(score_components)
         
                             # Display extracted info
                             st.success("Successfully extracted information from PDF!")
@@ -1269,9 +1217,13 @@ def process_recruiters_mode():
                                 st.markdown("#### Score Breakdown")
                                 for category, points in score_components.items():
                                     st.markdown(f"- **{category}:** {points} points")
+
+                            extracted = True
                 
                 except Exception as e:
                     st.error(f"Error processing PDF: {str(e)}")
+
+            if uploaded_file and extracted:
                 # Add form to edit extracted info
                 st.markdown("---")
                 st.subheader("Edit and Add to Database")
@@ -1287,7 +1239,7 @@ def process_recruiters_mode():
                 with col2:
                     experience_years_input = st.number_input("Years of Experience", 
                                                           min_value=0, max_value=50, 
-                                                          value=experience_years)
+                                                          value=min(int(experience_years), 50))
                     
                     # Join education entries for editing
                     education_text = ", ".join(education_formatted) if education_formatted else ""
@@ -1313,7 +1265,10 @@ def process_recruiters_mode():
                             skills=skills_list,
                             experience_years=experience_years_input,
                             education=education_input,
-                            resume_score=score_input
+                            resume_score=score_input,
+                            parsed_resume=parsed_resume,
+                            doc=pdf_text,
+                            score_edited=score_input != score
                         )
                         st.success("Successfully added candidate to database!")
                     except Exception as e:
@@ -1329,6 +1284,10 @@ def process_recruiters_mode():
             if not all_candidates:
                 st.info("No candidates in the database yet. Add some candidates to see analytics.")
             else:
+                # Charting libraries are only imported once there is something to chart
+                import pandas as pd
+                import plotly.express as px
+
                 # Display overall statistics
                 st.subheader("📊 Overall Statistics")
                 
@@ -1479,17 +1438,10 @@ def process_recruiters_mode():
                 with analysis_tab3:
                     st.subheader("Skills Analysis")
                     
-                    # Extract and count skills across all candidates
-                    all_skills = {}
-                    for candidate in all_candidates:
-                        skills = candidate.get('skills', [])
-                        for skill in skills:
-                            if skill:
-                                all_skills[skill.lower()] = all_skills.get(skill.lower(), 0) + 1
+                    # Count candidates per skill ID across all candidates, most common first
+                    sorted_skills = get_skill_counts()
                     
-                    if all_skills:
-                        # Sort skills by frequency
-                        sorted_skills = sorted(all_skills.items(), key=lambda x: x[1], reverse=True)
+                    if sorted_skills:
                         
                         # Create a DataFrame for visualization
                         skills_df = pd.DataFrame(sorted_skills, columns=['Skill', 'Count'])
@@ -1516,7 +1468,7 @@ def process_recruiters_mode():
                             from wordcloud import WordCloud
                             
                             # Generate word cloud
-                            skill_freq = {skill: count for skill, count in all_skills.items()}
+                            skill_freq = dict(sorted_skills)
                             
                             # Word cloud settings
                             wc = WordCloud(
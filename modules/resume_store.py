@@ -1,29 +1,19 @@
 import streamlit as st
-import sqlite3
-import os
+from functools import partial
 
-# Function to create a database table if it doesn't exist
+from utils.blob_store import add_upload, connect, read_blob
+from utils.uploads import UploadTooLarge, max_upload_mb, receive_upload
+
+# Resumes go to the content-addressed blob store shared with the Admin module, so two
+# uploads with the same file name never overwrite each other and identical files are kept once
 def create_resume_table():
-    conn = sqlite3.connect('resume_database.db')
-    c = conn.cursor()
-    c.execute('''
-              CREATE TABLE IF NOT EXISTS resumes (
-                  id INTEGER PRIMARY KEY,
-                  file_name TEXT,
-                  file_path TEXT
-              )''')
-    conn.commit()
-    conn.close()
+    connect().close()
 
 # Function to store uploaded resumes in the database
 def store_resume(file):
-    conn = sqlite3.connect('resume_database.db')
-    c = conn.cursor()
-    c.execute("INSERT INTO resumes (file_name, file_path) VALUES (?, ?)", (file.name, f"resumes/{file.name}"))
-    conn.commit()
+    conn = connect()
+    add_upload(conn, file.name, receive_upload(file))
     conn.close()
-    with open(os.path.join("resumes", file.name), "wb") as f:
-        f.write(file.getbuffer())
 
 def process_admin_mode():
     create_resume_table()
@@ -34,28 +24,28 @@ def process_admin_mode():
     # (Add authentication code here)
 
     # Display uploaded resumes and allow admin to download them
-    conn = sqlite3.connect('resume_database.db')
-    c = conn.cursor()
-    c.execute("SELECT * FROM resumes")
-    resumes = c.fetchall()
+    conn = connect()
+    resumes = conn.execute("SELECT id, name, blob_hash FROM user_uploaded_pdfs").fetchall()
     conn.close()
 
     st.subheader("Uploaded Resumes:")
     for resume in resumes:
         st.write(resume[1])  # Display file names
-        download_button = st.button(f"Download {resume[1]}", key=f"download_button_{resume[0]}")
-        if download_button:
-            with open(resume[2], 'rb') as file:
-                file_contents = file.read()
-            st.download_button(label='Download Resume', data=file_contents, file_name=resume[1])
+        # Read from the blob store only when the button is clicked
+        st.download_button(label=f"Download {resume[1]}", data=partial(read_blob, resume[2]),
+                           file_name=resume[1], mime="application/pdf", key=f"download_button_{resume[0]}")
 
 def process_user_mode():
     st.title("Resume Parser using NLP")
-    uploaded_file = st.file_uploader("Upload a PDF resume", type="pdf")
+    uploaded_file = st.file_uploader("Upload a PDF resume", type="pdf", max_upload_size=max_upload_mb())
 
     if uploaded_file:
+        try:
+            store_resume(uploaded_file)
+        except UploadTooLarge as e:
+            st.error(str(e))
+            return
         st.write("File uploaded successfully!")
-        store_resume(uploaded_file)
 
 def main():
     st.title("Resume Store Application")
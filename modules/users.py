@@ -1,35 +1,37 @@
 import streamlit as st
-import plotly.express as px
-import plotly.graph_objects as go
 import re
 import sqlite3
 from contextlib import contextmanager
-from utils.settings_manager import SettingsManager
+from functools import cached_property
+from utils.assets import AssetError, load_spacy_model
+from utils.blob_store import add_upload, create_tables
 from datetime import datetime
 from dateutil.relativedelta import relativedelta
-from resume_parser import extract_resume_info_from_pdf, extract_contact_number_from_resume, extract_education_from_resume, \
-    extract_experience, suggest_skills_for_job, show_colored_skills, calculate_resume_score, extract_resume_info
-import spacy
-
-try:
-    nlp = spacy.load("en_core_web_sm")
-except OSError:
-    print("Downloading 'en_core_web_sm' model...")
-    spacy.cli.download("en_core_web_sm")
-    nlp = spacy.load("en_core_web_sm")
+from resume_parser import extract_education_from_resume, extract_experience, suggest_skills_for_job, \
+    show_colored_skills, extract_resume_info
+from frontend import display_pdf
+from utils.regex_guard import find_section, PROFESSIONAL_EXPERIENCE_HEADER
+from utils.contact_scanner import contact_values
+from utils.education import parse_education
+from utils.lexicon_artifact import load_lexicons
+from utils.scoring import score_resume
+from utils.skill_taxonomy import OTHER
+from utils.role_fit import display_role, get_role_fit_index
+from utils.speculative import parse_resume, parsed_resume
+from utils.uploads import UploadTooLarge, max_upload_mb, receive_upload
+
+def shared_nlp():
+    """The English spaCy model, loaded on first use and never downloaded, or None if unavailable"""
+    try:
+        return load_spacy_model("en_core_web_sm")
+    except AssetError as e:
+        print(str(e))
+        return None
 
 # Function to create a table for PDFs in SQLite database if it doesn't exist
 def create_table():
     conn = sqlite3.connect('data/user_pdfs.db')
-    cursor = conn.cursor()
-    cursor.execute('''
-        CREATE TABLE IF NOT EXISTS user_uploaded_pdfs (
-            id INTEGER PRIMARY KEY,
-            name TEXT NOT NULL,
-            data BLOB NOT NULL
-        )
-    ''')
-    conn.commit()
+    create_tables(conn)
     conn.close()
 
 @contextmanager
@@ -42,12 +44,10 @@ def get_db_connection():
         if conn:
             conn.close()
 
-# Function to insert PDF into the SQLite database
+# Function to insert PDF into the blob store; the database keeps only its hash
 def insert_pdf(name, data):
     with get_db_connection() as conn:
-        cursor = conn.cursor()
-        cursor.execute('INSERT INTO user_uploaded_pdfs (name, data) VALUES (?, ?)', (name, data))
-        conn.commit()
+        add_upload(conn, name, data)
 
 def extract_date_range(text):
     """Extract date ranges from text using improved regex patterns"""
@@ -98,9 +98,9 @@ def calculate_experience_duration(date_range):
 def extract_work_experience(text):
     """Enhanced work experience extraction focusing only on Professional Experience section"""
     try:
-        nlp = spacy.load("en_core_web_sm")
+        nlp = load_spacy_model("en_core_web_sm")
     except:
-        st.error("Please install spacy model: python -m spacy download en_core_web_sm")
+        st.error("spaCy model en_core_web_sm is not available, see python -m utils.assets")
         return None
 
     # Convert text to string if it's a spaCy Doc object
@@ -110,14 +110,10 @@ def extract_work_experience(text):
         text = str(text)
 
     # Extract Professional Experience section
-    experience_pattern = r'PROFESSIONAL EXPERIENCE.*?(?=\n\n[A-Z\s]+:|\Z)'
-    experience_match = re.search(experience_pattern, text, re.DOTALL | re.IGNORECASE)
+    experience_text = find_section(text, PROFESSIONAL_EXPERIENCE_HEADER)
     
-    if not experience_match:
+    if not experience_text:
         return None
-        
-    # Get only the professional experience text
-    experience_text = experience_match.group(0)
     
     # Process text with spaCy
     doc = nlp(experience_text)
@@ -166,82 +162,10 @@ def extract_work_experience(text):
     
     return experience_data
 
-def extract_achievements(text):
-    """Extract achievements, honors, and awards from resume text"""
-    try:
-        # Extract Honors and Awards section
-        honors_pattern = r'(?:HONORS|AWARDS|ACHIEVEMENTS|HONORS AND AWARDS|HONORS & AWARDS).*?(?=\n\n[A-Z\s]+:|\Z)'
-        honors_match = re.search(honors_pattern, text, re.DOTALL | re.IGNORECASE)
-        
-        if not honors_match:
-            return []
-        
-        honors_text = honors_match.group(0)
-        
-        # Split into individual achievements
-        achievements = []
-        for line in honors_text.split('\n'):
-            # Remove bullet points and whitespace
-            line = re.sub(r'^[•●⚫⭐▪■]\s*', '', line.strip())
-            if line and not line.lower().startswith(('honor', 'award')):
-                achievements.append(line)
-        
-        return achievements
-    except Exception as e:
-        print(f"Error extracting achievements: {str(e)}")
-        return []
-
-def calculate_score_components(resume_info, experience_info, education_info, pdf_text=None):
-    """Calculate score components using NLP/NER enhanced extraction"""
-    components = {
-        'Skills': 0,
-        'Experience': 0,
-        'Education': 0,
-        'Achievements': 0
-    }
-    
-    try:
-        nlp = spacy.load("en_core_web_sm")
-    except:
-        st.error("Please install spacy model: python -m spacy download en_core_web_sm")
-        return components
-
-    # Skills score (max 30)
-    if resume_info and isinstance(resume_info, dict) and 'skills' in resume_info:
-        skills = resume_info.get('skills', [])
-        if isinstance(skills, list):
-            components['Skills'] = min(len(skills) * 3, 30)
-
-    # Experience score (max 30)
-    if experience_info and isinstance(experience_info, dict):
-        years = experience_info.get('total_years', 0)
-        positions = len(experience_info.get('positions', []))
-        seniority = experience_info.get('seniority', 'entry')
-        
-        years_score = min(years * 3, 15)
-        position_score = min(positions * 2, 10)
-        seniority_bonus = {'senior': 5, 'mid': 3, 'entry': 1}
-        
-        components['Experience'] = (
-            years_score + 
-            position_score + 
-            seniority_bonus[seniority]
-        )
-
-    # Education score (max 25)
-    if education_info and isinstance(education_info, list):
-        components['Education'] = min(len(education_info) * 8, 25)
-
-    # Achievements score (max 15)
-    if pdf_text and isinstance(pdf_text, str):
-        achievements = extract_achievements(pdf_text)
-        if achievements:
-            components['Achievements'] = min(len(achievements) * 3, 15)
-
-    return components
-
 def display_score_analysis(score_components):
     """Enhanced score visualization with white text"""
+    import plotly.graph_objects as go
+
     total_score = sum(score_components.values())
     
     # Calculate percentages
@@ -300,15 +224,7 @@ def display_score_analysis(score_components):
 
 def display_enhanced_skills(skills):
     """Enhanced skills visualization with categories and ratings"""
-    # Skill categories with their respective keywords
-    skill_categories = {
-        "Programming": ["python", "java", "javascript", "c++", "ruby", "php"],
-        "Web Development": ["html", "css", "react", "angular", "node.js", "django"],
-        "Database": ["sql", "mysql", "postgresql", "mongodb", "oracle"],
-        "DevOps": ["docker", "kubernetes", "aws", "azure", "jenkins", "git"],
-        "Data Science": ["machine learning", "tensorflow", "pytorch", "numpy", "pandas"],
-        "Other": []
-    }
+    taxonomy = load_lexicons().taxonomy
 
     # Custom CSS for better visualization
     st.markdown("""
@@ -347,18 +263,14 @@ def display_enhanced_skills(skills):
         </style>
     """, unsafe_allow_html=True)
 
-    # Categorize skills
-    categorized_skills = {cat: [] for cat in skill_categories.keys()}
+    # Categorize skills by their taxonomy category, unknown skills under "Other"
+    categorized_skills = {cat: [] for cat in taxonomy.categories + [OTHER]}
     for skill in skills:
-        skill_lower = skill.lower()
-        categorized = False
-        for category, keywords in skill_categories.items():
-            if any(keyword in skill_lower for keyword in keywords):
-                categorized_skills[category].append(skill)
-                categorized = True
-                break
-        if not categorized:
-            categorized_skills["Other"].append(skill)
+        skill_id = taxonomy.id_of(skill)
+        if skill_id is None:
+            categorized_skills[OTHER].append(skill)
+        else:
+            categorized_skills[taxonomy.category(skill_id)].append(taxonomy.name(skill_id))
 
     # Category icons
     category_icons = {
@@ -367,6 +279,13 @@ def display_enhanced_skills(skills):
         "Database": "🗄️",
         "DevOps": "⚙️",
         "Data Science": "📊",
+        "Mobile": "📱",
+        "Security": "🔒",
+        "Networking": "🔌",
+        "Design": "🎨",
+        "Tools": "🧰",
+        "Business": "💼",
+        "Soft Skills": "🤝",
         "Other": "🔧"
     }
 
@@ -382,7 +301,7 @@ def display_enhanced_skills(skills):
                     <div class="skill-category">
                         <div class="category-header">
                             <span>
-                                <span class="category-icon">{category_icons[category]}</span>
+                                <span class="category-icon">{category_icons.get(category, category_icons[OTHER])}</span>
                                 {category}
                             </span>
                             <span style="color: #4CAF50">{len(skills_list)}</span>
@@ -393,6 +312,80 @@ def display_enhanced_skills(skills):
                     </div>
                 """, unsafe_allow_html=True)
 
+# Number of best-fit roles shown for a resume
+ROLE_FIT_TOP_K = 5
+
+class ResumeAnalysis:
+    """
+    Everything process_user_mode shows for one uploaded resume. Each artifact
+    is computed on first use and kept, so reruns caused by other widgets, such
+    as the target role selector, are served from memory.
+    """
+
+    def __init__(self, upload):
+        self.upload = upload
+        self.content_hash = upload.content_hash
+        self.file_id = None
+        self._skills_gaps = {}
+
+    @cached_property
+    def doc(self):
+        # Started in the background on upload, so a rerun waits on that parse instead of starting over
+        doc = parsed_resume(self.upload)
+        # Everything else is derived from the Doc, so the PDF (and any spool file) can go
+        self.upload = None
+        return doc
+
+    @cached_property
+    def resume_info(self):
+        return extract_resume_info(self.doc)
+
+    @cached_property
+    def education_info(self):
+        return extract_education_from_resume(self.doc)
+
+    @cached_property
+    def score_components(self):
+        return score_resume(self.resume_info)
+
+    @cached_property
+    def score_chart(self):
+        """(plotly figure, total score) of the score components"""
+        return display_score_analysis(self.score_components)
+
+    @cached_property
+    def role_fits(self):
+        """The ROLE_FIT_TOP_K roles of the catalogue that best fit the resume's skills"""
+        return get_role_fit_index().top_roles(self.resume_info.get('skills', []), k=ROLE_FIT_TOP_K)
+
+    def skills_gap(self, role):
+        """Return (suggested, matching, missing) skills for a target role"""
+        if role not in self._skills_gaps:
+            suggested_skills = suggest_skills_for_job(role)
+            # Compare by taxonomy ID so synonyms and spellings of a skill count as a match
+            taxonomy = load_lexicons().taxonomy
+            current_keys = {taxonomy.id_of(skill) or skill.lower() for skill in self.resume_info.get('skills', [])}
+            matching_skills = {skill for skill in suggested_skills
+                               if (taxonomy.id_of(skill) or skill.lower()) in current_keys}
+            self._skills_gaps[role] = (suggested_skills, matching_skills, set(suggested_skills) - matching_skills)
+        return self._skills_gaps[role]
+
+def get_resume_analysis(uploaded_file):
+    """Return the analysis of uploaded_file, reusing the session's one if the content is unchanged"""
+    analysis = st.session_state.get('resume_analysis')
+    # Reruns see the same upload again; its file ID saves hashing it every time
+    file_id = getattr(uploaded_file, 'file_id', None)
+    if analysis is not None and file_id is not None and analysis.file_id == file_id:
+        return analysis
+    upload = receive_upload(uploaded_file)
+    # Only the latest upload is kept, so the session holds at most one parsed resume
+    if analysis is None or analysis.content_hash != upload.content_hash:
+        parse_resume(upload)
+        analysis = ResumeAnalysis(upload)
+    analysis.file_id = file_id
+    st.session_state.resume_analysis = analysis
+    return analysis
+
 def process_user_mode():
     """Process user module functionality"""
     # Remove frontend dependency by using st directly
@@ -412,35 +405,36 @@ def process_user_mode():
         """)
 
     # File upload section
-    uploaded_file = st.file_uploader("Upload your resume", type="pdf")
+    uploaded_file = st.file_uploader("Upload your resume", type="pdf", max_upload_size=max_upload_mb())
 
     if uploaded_file:
         try:
             with st.spinner("Processing your resume..."):
-                # Extract PDF information
-                pdf_name = uploaded_file.name
-                pdf_data = uploaded_file.getvalue()
-                pdf_text = extract_resume_info_from_pdf(uploaded_file)
+                # Parsed once per upload; reruns reuse the session's analysis
+                try:
+                    analysis = get_resume_analysis(uploaded_file)
+                except UploadTooLarge as e:
+                    st.error(str(e))
+                    return
                 
-                if not pdf_text:
+                if not analysis.doc:
                     st.error("Could not extract text from the PDF. Please ensure it's a text-based PDF.")
                     return
 
-                # Extract all information at once
-                resume_info = extract_resume_info(pdf_text)
-                experience_info = extract_work_experience(pdf_text)
-                education_info = extract_education_from_resume(pdf_text)
-                
-                # Calculate scores
-                score_components = calculate_score_components(
-                    resume_info=resume_info if resume_info else {},
-                    experience_info=experience_info if experience_info else {},
-                    education_info=education_info if education_info else [],
-                    pdf_text=pdf_text
-                )
+                resume_info = analysis.resume_info
+                education_info = analysis.education_info
+                score_components = analysis.score_components
                 
                 # Display extracted information in organized sections
                 st.markdown("## Resume Analysis")
+                pages_reused = analysis.doc.user_data.get('pages_reused', 0)
+                if pages_reused:
+                    page_count = len(analysis.doc.user_data['page_hashes'])
+                    st.caption(f"{pages_reused} of {page_count} pages unchanged since an earlier version; "
+                               "only the rest were re-analyzed")
+                # A toggle rather than an expander, so no page is rendered unless it is looked at
+                if st.toggle("📄 Show resume preview"):
+                    display_pdf(uploaded_file)
                 
                 # Basic Information Section
                 col1, col2 = st.columns(2)
@@ -452,13 +446,15 @@ def process_user_mode():
                         st.write(f"**Last Name:** {resume_info['last_name']}")
                     if resume_info.get('email'):
                         st.write(f"**Email:** {resume_info['email']}")
-                    contact_number = extract_contact_number_from_resume(pdf_text)
-                    if contact_number:
-                        st.write(f"**Phone:** +{contact_number}")
+                    if resume_info.get('phone'):
+                        st.write(f"**Phone:** {resume_info['phone']}")
+                    if resume_info.get('linkedin'):
+                        st.write(f"**LinkedIn:** {resume_info['linkedin']}")
+                    if resume_info.get('github'):
+                        st.write(f"**GitHub:** {resume_info['github']}")
 
                 with col2:
                     st.subheader("🎓 Education")
-                    education_info = extract_education_from_resume(pdf_text)
                     if education_info:
                         for edu in education_info:
                             st.write(f"• {edu}")
@@ -476,25 +472,12 @@ def process_user_mode():
                 st.markdown("### 📊 Resume Score Analysis")
                 
                 if resume_info and isinstance(resume_info, dict):
-                    # Get experience info if not already extracted
-                    experience_info = extract_work_experience(pdf_text)
-                    # Get education info if not already extracted
-                    education_info = extract_education_from_resume(pdf_text)
-                    
-                    # Calculate score components
-                    score_components = calculate_score_components(
-                        resume_info,
-                        experience_info if experience_info else {},
-                        education_info if education_info else [],
-                        pdf_text
-                    )
-                    
                     # Create two columns with adjusted ratios
                     score_col1, score_col2 = st.columns([3, 2])
                     
                     # Pie chart in first column
                     with score_col1:
-                        fig, total_score = display_score_analysis(score_components)
+                        fig, total_score = analysis.score_chart
                         st.plotly_chart(fig, use_container_width=True)
                     
                     # Component breakdown in second column
@@ -535,39 +518,36 @@ def process_user_mode():
                             </div>
                         """, unsafe_allow_html=True)
                 
+                # Best-fit roles, ranked against every role in the catalogue
+                st.markdown("### 🧭 Roles That Fit Your Skills")
+                role_fits = analysis.role_fits
+                if role_fits:
+                    for role_fit in role_fits:
+                        with st.expander(f"{display_role(role_fit.role)} — {role_fit.fit:.0%} match"):
+                            st.markdown(f"**🎯 Skills You Have:** {', '.join(role_fit.matching) or 'None yet'}")
+                            st.markdown(f"**📚 Skills to Develop:** {', '.join(role_fit.missing) or 'None'}")
+                else:
+                    st.info("No role matches the skills found in your resume yet.")
+
                 # Suggested Skills Section
                 st.markdown("### 🎯 Suggested Skills for Career Growth")
                 
-                # Job role selector with improved styling
-                job_roles = [
-                    "Software Engineer",
-                    "Data Scientist",
-                    "Full Stack Developer",
-                    "DevOps Engineer",
-                    "Machine Learning Engineer",
-                    "Cloud Architect",
-                    "Business Analyst",
-                    "Data Analyst",
-                    "Frontend Developer",
-                    "Backend Developer"
-                ]
+                # Best-fit roles first, then the rest of the catalogue
+                best_roles = [role_fit.role for role_fit in role_fits]
+                job_roles = best_roles + [role for role in get_role_fit_index().roles if role not in best_roles]
                 
                 col1, col2 = st.columns([2, 1])
                 with col1:
                     selected_role = st.selectbox(
                         "Select your target job role:",
                         options=[""] + job_roles,
-                        format_func=lambda x: "Select a role" if x == "" else x
+                        format_func=lambda x: "Select a role" if x == "" else display_role(x)
                     )
                 
                 if selected_role:
-                    current_skills = set(resume_info.get('skills', []))
-                    suggested_skills = suggest_skills_for_job(selected_role)
+                    suggested_skills, matching_skills, missing_skills = analysis.skills_gap(selected_role)
                     
                     if suggested_skills:
-                        missing_skills = set(suggested_skills) - current_skills
-                        matching_skills = current_skills.intersection(suggested_skills)
-                        
                         # Skills Gap Analysis
                         st.markdown("#### Skills Gap Analysis")
                         stats_col1, stats_col2, stats_col3 = st.columns(3)
@@ -658,21 +638,10 @@ def get_component_color(score):
     else:
         return "#F44336"  # Red for poor
 
-# Example usage in other modules
-def process_pdf(file):
-    settings = SettingsManager()
-    max_size = settings.get_setting('parser', 'max_pdf_size')
-    enabled_features = settings.get_setting('parser', 'enabled_features')
-    deep_parsing = settings.get_setting('parser', 'deep_parsing')
-    
-    # Use settings in processing logic
-    if file.size > max_size * 1024 * 1024:  # Convert MB to bytes
-        raise ValueError(f"File size exceeds maximum allowed size of {max_size}MB")
-
 def extract_personal_info(text):
     """Extract personal information using NER and regex patterns"""
     try:
-        nlp = spacy.load("en_core_web_sm")
+        nlp = load_spacy_model("en_core_web_sm")
         doc = nlp(text)
         
         personal_info = {
@@ -683,23 +652,11 @@ def extract_personal_info(text):
             'linkedin': ''
         }
         
-        # Extract email using regex
-        email_pattern = r'\b[A-Za-z0-9._%+-]+@[A-Za-z0-9.-]+\.[A-Z|a-z]{2,}\b'
-        email_match = re.search(email_pattern, text)
-        if email_match:
-            personal_info['email'] = email_match.group(0)
-        
-        # Extract phone using regex
-        phone_pattern = r'\+\d{1,3}[-.\s]?\(?\d{3}\)?[-.\s]?\d{3}[-.\s]?\d{4}'
-        phone_match = re.search(phone_pattern, text)
-        if phone_match:
-            personal_info['phone'] = phone_match.group(0)
-        
-        # Extract LinkedIn URL
-        linkedin_pattern = r'(?:linkedin\.com/in/[A-Za-z0-9_-]+)|(?:www\.linkedin\.com/[A-ZaZ0-9_-]+)'
-        linkedin_match = re.search(linkedin_pattern, text.lower())
-        if linkedin_match:
-            personal_info['linkedin'] = linkedin_match.group(0)
+        # Extract email, phone and LinkedIn URL in one contact scan
+        contacts = contact_values(text)
+        personal_info['email'] = contacts['email']
+        personal_info['phone'] = contacts['phone']
+        personal_info['linkedin'] = contacts['linkedin']
         
         # Extract name and location using NER
         for ent in doc.ents:
@@ -714,66 +671,19 @@ def extract_personal_info(text):
         return None
 
 def extract_education_info(text):
-    """Extract education information using NER and pattern matching"""
+    """Extract education information using the institution gazetteer and degree patterns"""
     try:
-        nlp = spacy.load("en_core_web_sm")
-        doc = nlp(text)
-        
-        education_section = re.search(r'EDUCATION.*?(?=\n\n[A-Z\s]+:|\Z)', text, re.DOTALL | re.IGNORECASE)
-        if not education_section:
-            return []
-            
-        education_text = education_section.group(0)
-        education_entries = []
-        
-        # Split into individual entries
-        entries = re.split(r'\n\n(?=[A-Z])', education_text)
-        
-        for entry in entries:
-            if not entry.strip():
-                continue
-                
-            edu_entry = {
-                'degree': '',
-                'university': '',
-                'duration': '',
-                'gpa': ''
-            }
-            
-            # Extract degree
-            degree_patterns = [
-                r'(?:Master|Bachelor|PhD|M\.S\.|B\.S\.|B\.Tech|M\.Tech)[^,\n]*',
-                r'(?:of|in)\s+[^,\n]*(?:Engineering|Science|Technology|Business|Arts)[^,\n]*'
-            ]
-            
-            for pattern in degree_patterns:
-                degree_match = re.search(pattern, entry)
-                if degree_match:
-                    edu_entry['degree'] = degree_match.group(0).strip()
-                    break
-            
-            # Extract university using NER
-            doc = nlp(entry)
-            for ent in doc.ents:
-                if ent.label_ == "ORG":
-                    edu_entry['university'] = ent.text
-                    break
-            
-            # Extract duration
-            duration_pattern = r'(?:January|February|March|April|May|June|July|August|September|October|November|December|Jan|Feb|Mar|Apr|May|Jun|Jul|Aug|Sep|Oct|Nov|Dec)[.\s]+\d{4}\s*(?:–|-|to)\s*(?:Present|Current|(?:January|February|March|April|May|June|July|August|September|October|November|December|Jan|Feb|Mar|Apr|May|Jun|Jul|Aug|Sep|Oct|Nov|Dec)[.\s]+\d{4})'
-            duration_match = re.search(duration_pattern, entry)
-            if duration_match:
-                edu_entry['duration'] = duration_match.group(0)
-            
-            # Extract GPA
-            gpa_pattern = r'(?:GPA|Grade Point Average|CGPA)[:\s]+([0-9.]+)'
-            gpa_match = re.search(gpa_pattern, entry)
-            if gpa_match:
-                edu_entry['gpa'] = gpa_match.group(1)
-            
-            education_entries.append(edu_entry)
-        
-        return education_entries
+        # Convert text to string if it's a spaCy Doc object
+        if hasattr(text, 'text'):
+            text = text.text
+
+        # The shared model only confirms institutions the gazetteer cannot place
+        return [{
+            'degree': entry['degree'],
+            'university': entry['institution'],
+            'duration': entry['dates'],
+            'gpa': entry['gpa']
+        } for entry in parse_education(text, shared_nlp())]
     except Exception as e:
         print(f"Error extracting education information: {str(e)}")
         return []
@@ -5,32 +5,16 @@ PDF Processor Module with updated PyMuPDF compatibility
 import io
 import sys
 
+from utils.uploads import open_pdf
+
 def extract_text_from_pdf(pdf_bytes):
     """Extract text from PDF using PyMuPDF with proper import"""
     text = ""
     
-    # Try PyMuPDF first
+    # Try PyMuPDF first, on the bytes themselves rather than a BytesIO copy of them
     try:
-        # Standard import for PyMuPDF
-        import fitz
-        
-        with io.BytesIO(pdf_bytes) as pdf_stream:
-            # Different PyMuPDF versions have different APIs
-            try:
-                # Version 1.18.x approach
-                doc = fitz.open(stream=pdf_stream, filetype="pdf")
-            except (TypeError, AttributeError):
-                try:
-                    # Direct buffer approach for newer versions
-                    doc = fitz.open(stream=pdf_stream)
-                except (TypeError, AttributeError):
-                    # Last resort for very new versions
-                    doc = fitz.Document(stream=pdf_stream, filetype="pdf")
-            
-            text = ""
-            for page_num in range(len(doc)):
-                page = doc[page_num]
-                text += page.get_text()
+        with open_pdf(pdf_bytes) as doc:
+            text = "".join(page.get_text() for page in doc)
             return text
     except Exception as e:
         print(f"PyMuPDF error: {str(e)}", file=sys.stderr)
@@ -70,16 +54,7 @@ def extract_text_from_pdf(pdf_bytes):
 def get_pdf_metadata(pdf_bytes):
     """Extract metadata from PDF"""
     try:
-        import fitz  # PyMuPDF
-        with io.BytesIO(pdf_bytes) as pdf_stream:
-            try:
-                # Try different methods for compatibility
-                doc = fitz.open(stream=pdf_stream, filetype="pdf")
-            except (AttributeError, TypeError):
-                try:
-                    doc = fitz.Document(stream=pdf_stream, filetype="pdf")
-                except AttributeError:
-                    doc = fitz.open(stream=pdf_stream)
+        with open_pdf(pdf_bytes) as doc:
             return doc.metadata
     except Exception as e:
         print(f"PyMuPDF metadata error: {e}")
@@ -1,31 +1,63 @@
 import re
-import fitz as pymupdf_fitz
+from itertools import accumulate
 import streamlit as st
-import spacy
-import csv
-import nltk
-from datetime import datetime
-import dateparser
+from functools import lru_cache
+from utils.settings_manager import SettingsManager
+from utils.assets import load_spacy_model
+from utils.contact_scanner import contact_values
+from utils.dates import calculate_duration, parse_date
+from utils.doc_cache import cache_pipeline, get_or_parse_pages, load_pages, pipeline_id
+from utils.education import parse_education
+from utils.job_titles import find_title
+from utils.lexicon_artifact import load_lexicons
+from utils import llm_fallback
+from utils.regex_guard import EMPLOYMENT_DATES, TITLE_COMPANY_SEPARATOR
+from utils.scoring import score_resume, total_score
+from utils.sections import segment_sections, section_lines
+from utils.text_normalizer import normalize_text
+from utils.uploads import receive_upload
+
+# spaCy and PyMuPDF are imported on first use, not at import time;
+# main.py warms the models up in the background.
+
+def get_nlp():
+    """The spaCy model for English, loaded once on first use"""
+    return load_spacy_model('en_core_web_sm')
+
+def get_skills_nlp():
+    """The trained NER model for skills, loaded once on first use"""
+    return load_spacy_model('TrainedModel/skills')
+
+@lru_cache(maxsize=None)
+def get_lexicon_classifier():
+    """Seniority and position lexicons, compiled once on first use"""
+    from utils.lexicon_classifier import LexiconClassifier
+
+    return LexiconClassifier()
 
-# Additional libraries
-nltk.download('punkt')
-
-# Load the spaCy model for English
-nlp = spacy.load('en_core_web_sm')
+# ----------------------------------Extract Name----------------------------------
+# Confidence of each name extraction approach, most reliable first. A clean
+# title-case line ("Jane Doe") is above the default deep parsing threshold
+# (0.7); an all-caps or hyphenated line could as well be a heading, so it is not
+NAME_CONFIDENCE = {'ner': 0.9, 'line': 0.8, 'line_unsure': 0.6, 'pattern': 0.4}
+NAME_WORD = re.compile(r"[A-Z][a-z]+\.?")
 
-def load_keywords(file_path):
-    with open(file_path, 'r') as file:
-        reader = csv.reader(file)
-        return set(row[0] for row in reader)
 
-# ----------------------------------Extract Name----------------------------------
 def extract_name(doc):
+    first_name, last_name, _ = extract_name_with_confidence(doc)
+    return first_name, last_name
+
+
+def extract_name_with_confidence(doc):
+    """Returns (first_name, last_name, confidence), confidence depending on how the name was found"""
     # First approach: Look for name in the first few lines which is common in resumes
     first_lines = '\n'.join(doc.text.splitlines()[:10])
-    first_line_doc = nlp(first_lines)
     
-    # Try to find a person entity in the first few lines
-    for ent in first_line_doc.ents:
+    # Try to find a person entity in the first few lines, reusing the document's own
+    # entities so that cached Docs can be re-analyzed without running the model
+    for ent in doc.ents:
+        if ent.start_char >= len(first_lines):
+            break
         if ent.label_ == 'PERSON':
             names = ent.text.split()
             if len(names) >= 2:
@@ -35,7 +67,7 @@ def extract_name(doc):
                     # Convert to title case if it's in all caps
                     first_name = names[0].title() if names[0].isupper() else names[0]
                     last_name = ' '.join(names[1:]).title() if names[1].isupper() else ' '.join(names[1:])
-                    return first_name, last_name
+                    return first_name, last_name, NAME_CONFIDENCE['ner']
     
     # Second approach: Look for a line that could be a name (standalone proper nouns)
     for line in doc.text.splitlines()[:15]:  # Check first 15 lines
@@ -53,7 +85,8 @@ def extract_name(doc):
                 # Convert to title case if it's in all caps
                 first_name = names[0].title() if names[0].isupper() else names[0]
                 last_name = ' '.join(names[1:]).title() if any(name.isupper() for name in names[1:]) else ' '.join(names[1:])
-                return first_name, last_name
+                clean = len(names) <= 3 and all(NAME_WORD.fullmatch(name) for name in names)
+                return first_name, last_name, NAME_CONFIDENCE['line' if clean else 'line_unsure']
     
     # Third approach: Check if there's name after specific keywords
     name_patterns = [
@@ -71,137 +104,112 @@ def extract_name(doc):
                 # Convert to title case if it's in all caps
                 first_name = names[0].title() if names[0].isupper() else names[0]
                 last_name = ' '.join(names[1:]).title() if any(name.isupper() for name in names[1:]) else ' '.join(names[1:])
-                return first_name, last_name
+                return first_name, last_name, NAME_CONFIDENCE['pattern']
     
-    return "", ""
+    return "", "", 0.0
 # --------------------------------------------------------------------------------
 
 # ----------------------------------Extract Email---------------------------------
 def extract_email(doc):
-    matcher = spacy.matcher.Matcher(nlp.vocab)
-    email_pattern = [{'LIKE_EMAIL': True}]
-    matcher.add('EMAIL', [email_pattern])
-
-    matches = matcher(doc)
-    for match_id, start, end in matches:
-        if match_id == nlp.vocab.strings['EMAIL']:
-            return doc[start:end].text
-    return ""
+    return contact_values(doc.text)['email']
 # --------------------------------------------------------------------------------
 
 # ----------------------------------Extract Ph No---------------------------------
 def extract_contact_number_from_resume(doc):
-    contact_number = None
-    text = doc.text  # Extract text from SpaCy doc object
-    pattern = r"\b(?:\+?\d{1,3}[-.\s]?)?\(?\d{3}\)?[-.\s]?\d{3}[-.\s]?\d{4}\b"
-    match = re.search(pattern, text)
-    if match:
-        contact_number = match.group()
-    return contact_number
+    # Phone numbers come back normalized by tools.format_phone_number
+    return contact_values(doc.text)['phone'] or None
 # --------------------------------------------------------------------------------
 
 # --------------------------------Extract Education-------------------------------
 def extract_education_from_resume(doc):
-    text = doc.text
-    
-    # Common education section headers
-    education_headers = [
-        r"EDUCATION", r"Education", r"ACADEMIC BACKGROUND", r"Academic Background",
-        r"EDUCATIONAL QUALIFICATIONS", r"Educational Qualifications"
-    ]
-    
-    # Find education section
-    education_section = ""
-    education_found = False
-    
-    # Try to find the education section based on headers
-    lines = text.split('\n')
-    for i, line in enumerate(lines):
-        if any(re.search(pattern, line) for pattern in education_headers) or "education" in line.lower():
-            education_found = True
-            start_idx = i
-            
-            # Find the end of the education section (next major section)
-            for j in range(start_idx + 1, len(lines)):
-                if re.match(r"^[A-Z\s]{5,}$", lines[j].strip()) and len(lines[j].strip()) > 5:  # Likely a new section header
-                    end_idx = j
-                    break
-            else:
-                end_idx = min(start_idx + 20, len(lines))  # Limit to 20 lines if no clear end
-                
-            education_section = '\n'.join(lines[start_idx:end_idx])
-            break
-    
-    if not education_found:
-        # Look for degree keywords throughout the document
-        degree_keywords = [
-            r"Bachelor", r"Master", r"PhD", r"B\.S\.", r"M\.S\.", r"B\.A\.", r"M\.A\.",
-            r"B\.Tech", r"M\.Tech", r"BSc", r"MSc", r"BCA", r"MCA", r"Diploma",
-            r"Certificate", r"Post Graduate", r"Postgraduate"
-        ]
-        
-        degree_lines = []
-        for line in lines:
-            if any(re.search(f"\\b{keyword}\\b", line, re.IGNORECASE) for keyword in degree_keywords):
-                degree_lines.append(line)
-        
-        education_section = '\n'.join(degree_lines)
-    
-    # Look for educational institutions
-    universities = []
-    
-    # Common institution words
-    institution_words = ["university", "college", "institute", "school", "academy"]
-    
-    # Process the education section
-    education_doc = nlp(education_section) if education_section else doc
-    
-    # First try to find ORG entities
-    for entity in education_doc.ents:
-        if entity.label_ == "ORG" and any(word in entity.text.lower() for word in institution_words):
-            universities.append(entity.text)
-    
-    # If no entities found, use regex pattern matching
-    if not universities:
-        for line in education_section.split('\n') if education_section else text.split('\n'):
-            for word in institution_words:
-                if word in line.lower():
-                    # Try to extract the full institution name
-                    universities.append(line.strip())
-                    break
-    
-    # Remove duplicates and filter very short entries (likely false positives)
-    universities = [uni for uni in set(universities) if len(uni) > 5]
-    
-    return universities
+    """Return the institutions named in the education section of the resume"""
+    batch_size = SettingsManager().get_setting('parser', 'ner_batch_size') or 32
+    entries = parse_education(doc.text, get_nlp(), batch_size=batch_size)
+    # Remove duplicates, keeping document order
+    return list(dict.fromkeys(entry['institution'] for entry in entries if entry['institution']))
 # --------------------------------------------------------------------------------
 
 # ----------------------------------Extract Skills--------------------------------
 def csv_skills(doc):
-    skills_keywords = load_keywords('data/newSkills.csv')
-    skills = set()
-
-    for keyword in skills_keywords:
-        if keyword.lower() in doc.text.lower():
-            skills.add(keyword)
-
-    return skills
-
-nlp_skills = spacy.load('TrainedModel/skills')  # Load the trained NER model for skills
+    # Whole-token matches of every skill name and synonym in the taxonomy, as canonical names
+    return set(load_lexicons().match_skills(doc.text))
 
-def extract_skills_from_ner(doc):
-    non_skill_labels = {'DATE', 'TIME', 'PERCENT', 'MONEY', 'QUANTITY', 'ORDINAL', 'CARDINAL', 'EMAIL'}
-    
-    skills = set()
-    for ent in nlp_skills(doc.text).ents:
-        if ent.label_ == 'SKILL':
-            # Check if the entity text is not in the non-skill labels set
-            if ent.label_ not in non_skill_labels and not ent.text.isdigit():
-                # Filter out non-alphabetic characters
-                skill_text = ''.join(filter(str.isalpha, ent.text))
-                if skill_text:
-                    skills.add(skill_text)
-    return skills
+def split_into_chunks(text, max_chars):
+    """
+    Split text into paragraph-sized chunks of at most max_chars characters.
+    Consecutive paragraphs are packed together; an oversized paragraph is split
+    on line breaks, and an oversized line on the last space before the limit.
+    """
+    pieces = []
+    for paragraph in re.split(r'\n\s*\n', text):
+        if len(paragraph) <= max_chars:
+            pieces.append(paragraph)
+            continue
+        for line in paragraph.split('\n'):
+            while len(line) > max_chars:
+                cut = line.rfind(' ', 0, max_chars)
+                if cut <= 0:
+                    cut = max_chars
+                pieces.append(line[:cut])
+                line = line[cut:].lstrip()
+            pieces.append(line)
+
+    chunk = ""
+    for piece in pieces:
+        if not piece.strip():
+            continue
+        if chunk and len(chunk) + len(piece) + 2 > max_chars:
+            yield chunk
+            chunk = ""
+        chunk = f"{chunk}\n\n{piece}" if chunk else piece
+    if chunk:
+        yield chunk
+
+def page_skill_entities(texts, batch_size=None):
+    """
+    Run the skills NER model over paragraph-sized chunks of each text (the
+    pages of a resume) so long CVs stay under spaCy's max_length and memory
+    use stays flat. Returns the SKILL entity texts found in each text.
+    """
+    settings = SettingsManager()
+    if batch_size is None:
+        batch_size = settings.get_setting('parser', 'ner_batch_size')
+    chunk_chars = settings.get_setting('parser', 'ner_chunk_chars')
+
+    chunks, owners = [], []
+    for index, text in enumerate(texts):
+        for chunk in split_into_chunks(text, chunk_chars):
+            chunks.append(chunk)
+            owners.append(index)
+    entities = [[] for _ in texts]
+    for index, chunk_doc in zip(owners, get_skills_nlp().pipe(chunks, batch_size=batch_size)):
+        entities[index].extend(ent.text for ent in chunk_doc.ents if ent.label_ == 'SKILL')
+    return entities
+
+
+def extract_skills_from_ner(doc, batch_size=None):
+    """
+    Skills found by the skills NER model: the entities cached with the pages
+    of the Doc (see extract_resume_info_from_pdf), or a run of the model
+    over the whole text when it has none.
+    """
+    entities = doc.user_data.get('skill_entities')
+    if entities is None:
+        entities = page_skill_entities([doc.text], batch_size)[0]
+
+    # The same skill usually appears in several chunks; keep the first spelling seen
+    skills = {}
+    taxonomy = load_lexicons().taxonomy
+    for entity in entities:
+        if entity.isdigit():
+            continue
+        # Known skills and synonyms (Node.js, k8s) resolve to their canonical name,
+        # anything else has its non-alphabetic characters filtered out
+        skill_id = taxonomy.id_of(entity)
+        skill_text = taxonomy.name(skill_id) if skill_id is not None else ''.join(filter(str.isalpha, entity))
+        if skill_text:
+            skills.setdefault(skill_text.lower(), skill_text)
+    return set(skills.values())
 
 def is_valid_skill(skill_text):
     # Define criteria for valid skills (modify/add criteria as needed)
@@ -240,343 +248,122 @@ def extract_skills(doc):
             skill.strip().lower() not in {'name', 'email', 'phone', 'address', 'education', 'university'}  # Exclude common personal info headers
         )
     
-    filtered_skills_csv = {skill for skill in skills_csv if is_valid_skill(skill)}
-    filtered_skills_ner = {skill for skill in skills_ner if is_valid_skill(skill)}
+    # Taxonomy skills (Node.js, HTML5) are known to be skills; only unknown NER spans need filtering
+    taxonomy = load_lexicons().taxonomy
+    filtered_skills_ner = {skill for skill in skills_ner if taxonomy.id_of(skill) is not None or is_valid_skill(skill)}
     
-    # Combine and return only technical and professional skills
-    combined_skills = filtered_skills_csv.union(filtered_skills_ner)
-    return list(combined_skills)
+    # Combine and return only technical and professional skills, one spelling per skill
+    return taxonomy.canonical_list(sorted(skills_csv) + sorted(filtered_skills_ner))
 # --------------------------------------------------------------------------------
 
 # ----------------------------------Extract Major---------------------------------
 def extract_major(doc):
-    major_keywords = load_keywords('data/majors.csv')
-
-    for keyword in major_keywords:
-        if keyword.lower() in doc.text.lower():
-            return keyword
-
-    return ""
+    return load_lexicons().match_major(doc.text)
 # --------------------------------------------------------------------------------
 
 # --------------------------------Extract Experience------------------------------
 def extract_experience_level(doc):
-    """Extracts the level of experience based on the verbs used in the document."""
-    verbs = [token.text for token in doc if token.pos_ == 'VERB']
+    """
+    Scores seniority from the lemmas of the verbs in the document and ranks
+    every position in data/position.csv by its keywords.
+    """
+    scores = get_lexicon_classifier().classify(doc)
+    ranked_positions = scores['positions']
 
-    senior_keywords = ['lead', 'manage', 'direct', 'oversee', 'supervise', 'orchestrate', 'govern']
-    mid_senior_keywords = ['develop', 'design', 'analyze', 'implement', 'coordinate', 'execute', 'strategize']
-    mid_junior_keywords = ['assist', 'support', 'collaborate', 'participate', 'aid', 'facilitate', 'contribute']
-    
-    if any(keyword in verbs for keyword in senior_keywords):
-        level_of_experience = "Senior"
-    elif any(keyword in verbs for keyword in mid_senior_keywords):
-        level_of_experience = "Mid-Senior"
-    elif any(keyword in verbs for keyword in mid_junior_keywords):
-        level_of_experience = "Mid-Junior"
-    else:
-        level_of_experience = "Entry Level"
+    return {
+        'level_of_experience': scores['seniority'][0][0],
+        'suggested_position': ranked_positions[0][0] if ranked_positions else "Position Not Identified",
+        'seniority_scores': scores['seniority'],
+        'ranked_positions': ranked_positions
+    }
+
+# Lines looked at after a job title for its company and dates
+ENTRY_LOOKAHEAD = 4
+# Longer lines are descriptions, not title lines
+MAX_TITLE_WORDS = 12
+BULLETS = ('•', '-', '*', '▪', '◦', '●', '–')
+
+
+def _split_title_line(line, title_match):
+    """Split "Title at Company" / "Title, Company" / "Title | Company" into its two parts"""
+    company = TITLE_COMPANY_SEPARATOR.match(line, title_match.end())
+    if company:
+        return line[:title_match.end()].strip(), company.group(1).strip()
+    return line, ''
 
-    suggested_position = suggest_position(verbs)
 
+def _make_experience(entry):
+    start_date = entry['start_date']
+    end_date = entry['end_date'] or ('Present' if start_date else '')
+    start_date_obj = parse_date(start_date) if start_date else None
+    end_date_obj = parse_date(end_date) if end_date else None
     return {
-        'level_of_experience': level_of_experience,
-        'suggested_position': suggested_position
+        'position': entry['position'],
+        'company': entry['company'],
+        'start_date': start_date,
+        'end_date': end_date,
+        'duration': calculate_duration(start_date_obj, end_date_obj) if start_date_obj and end_date_obj else ""
     }
 
-def parse_date(date_str):
-    """
-    Parse dates in various formats and return a datetime object.
-    Returns None if parsing fails.
-    """
-    if not date_str or date_str.lower() in ['present', 'current', 'now', 'today']:
-        return 'Present'
-    
-    # Try to parse with dateparser which handles many formats
-    try:
-        parsed_date = dateparser.parse(date_str.strip())
-        if parsed_date:
-            return parsed_date
-    except:
-        pass
-    
-    return None
+
+def work_experience_confidence(experiences):
+    """Mean completeness of the entries: 0.2 for the title, 0.4 each for company and dates"""
+    if not experiences:
+        return 0.0
+    total = sum(0.2 + 0.4 * bool(entry['company']) + 0.4 * bool(entry['start_date']) for entry in experiences)
+    return round(total / len(experiences), 2)
+
 
 def extract_work_experience(doc):
     """
-    Enhanced extraction of work experience that better handles different resume formats
-    and specifically accounts for the format in Mahad's resume.
+    Extract work history as position, company and date span records.
+
+    Works in a single pass over the lines of the experience section (the
+    whole document when no section is found): a line containing a known
+    job title opens an entry, and the next few lines fill in its company
+    and employment dates until the following title.
     """
     text = doc.text
-    lines = text.split('\n')
-    
-    # Common work experience section headers (expanded to match more variations)
-    work_exp_headers = [
-        r"WORK EXPERIENCE", r"Work Experience", r"PROFESSIONAL EXPERIENCE", 
-        r"Professional Experience", r"EMPLOYMENT HISTORY", r"Employment History",
-        r"WORK HISTORY", r"Work History", r"EXPERIENCE", r"Experience",
-        r"WORK", r"Work", r"EMPLOYMENT", r"Employment"
-    ]
-    
-    # Find work experience section
-    work_exp_section = []
-    work_exp_found = False
-    start_idx = -1
-    end_idx = len(lines)
-    
-    # Try to find the work experience section based on headers
-    for i, line in enumerate(lines):
-        if any(re.search(pattern, line) for pattern in work_exp_headers):
-            work_exp_found = True
-            start_idx = i
-            break
-    
-    # If we found a work experience section
-    if work_exp_found and start_idx >= 0:
-        # Find where the next section begins (looking for all caps section headers)
-        for j in range(start_idx + 1, len(lines)):
-            if re.match(r"^[A-Z][A-Z\s]+$", lines[j].strip()) and len(lines[j].strip()) > 3:
-                if lines[j].strip() not in ["WORK EXPERIENCE", "EXPERIENCE", "EMPLOYMENT"]:
-                    end_idx = j
-                    break
-        
-        # Extract the work experience section
-        work_exp_section = lines[start_idx:end_idx]
-    
-    # If we couldn't find a clear section by header, try to identify job entries directly
-    if not work_exp_found or not work_exp_section:
-        # Look for job title patterns and date ranges
-        job_title_indicators = [
-            "Content Writer", "Project Manager", "Manager", "Director", "Engineer",
-            "Developer", "Analyst", "Consultant", "Specialist", "CSR", "Voice",
-            "Representative", "Coordinator", "Assistant"
-        ]
-        
-        for i, line in enumerate(lines):
-            for indicator in job_title_indicators:
-                if indicator in line:
-                    # Check if there's a date pattern in this line or surrounding lines
-                    context_start = max(0, i-3)
-                    context_end = min(len(lines), i+4)
-                    context = lines[context_start:context_end]
-                    
-                    if any(re.search(r"\d{2}/\d{4}", line) or 
-                           re.search(r"(?:Jan|Feb|Mar|Apr|May|Jun|Jul|Aug|Sep|Oct|Nov|Dec)", line) or
-                           "Present" in line for line in context):
-                        # Found a potential job entry
-                        work_exp_section.extend(context)
-                        break
-    
-    # Extract work experiences from the section or the entire document if no section found
+    lines = section_lines(segment_sections(text), 'experience') or text.splitlines()
+
     experiences = []
-    
-    # Use the entire document if no clear work experience section was found
-    if not work_exp_section:
-        work_exp_section = lines
-    
-    # Process lines to find position, company and dates
-    i = 0
-    while i < len(work_exp_section):
-        line = work_exp_section[i].strip()
-        
-        # Look for lines that could be job titles (based on common job title indicators)
-        job_title_match = False
-        potential_job_titles = [
-            "Content Writer", "Project Manager", "CSR-Voice", "Manager", "Director", 
-            "Engineer", "Developer", "Analyst", "Consultant", "Specialist"
-        ]
-        
-        for title in potential_job_titles:
-            if title in line:
-                job_title_match = True
-                position = line.strip()
-                
-                # Company would typically be in the next line
-                company = ""
-                if i + 1 < len(work_exp_section):
-                    company = work_exp_section[i + 1].strip()
-                
-                # Look for date range in the following lines
-                start_date = ""
-                end_date = ""
-                date_found = False
-                
-                # Check next few lines for date information
-                for j in range(i, min(i + 5, len(work_exp_section))):
-                    date_line = work_exp_section[j].strip()
-                    
-                    # Different date formats we might encounter
-                    date_patterns = [
-                        r"(\d{2}/\d{4})\s*[-–—]\s*(\d{2}/\d{4}|Present)",
-                        r"(\d{2}/\d{4})\s*to\s*(\d{2}/\d{4}|Present)",
-                        r"(\d{2}/\d{4})\s+(\d{2}/\d{4}|Present)",
-                        r"(\d{2}/\d{4})",
-                        r"((?:Jan|Feb|Mar|Apr|May|Jun|Jul|Aug|Sep|Oct|Nov|Dec)[a-z]* \d{4})\s*[-–—]\s*((?:Jan|Feb|Mar|Apr|May|Jun|Jul|Aug|Sep|Oct|Nov|Dec)[a-z]* \d{4}|Present)",
-                        r"(\d{4})\s*[-–—]\s*(\d{4}|Present)",
-                    ]
-                    
-                    for pattern in date_patterns:
-                        date_match = re.search(pattern, date_line)
-                        if date_match:
-                            date_found = True
-                            if len(date_match.groups()) >= 2:
-                                start_date = date_match.group(1)
-                                end_date = date_match.group(2)
-                            else:
-                                start_date = date_match.group(1)
-                                # If only one date found, check if "Present" is in the line
-                                if "Present" in date_line:
-                                    end_date = "Present"
-                                else:
-                                    end_date = "Present"  # Default assumption
-                            break
-                    
-                    if date_found:
-                        break
-                
-                # If we found a complete job entry
-                if position and (company or date_found):
-                    # Parse the dates for calculation
-                    start_date_obj = parse_date(start_date)
-                    end_date_obj = parse_date(end_date)
-                    
-                    # Create experience entry
-                    experiences.append({
-                        'position': position,
-                        'company': company,
-                        'start_date': start_date,
-                        'end_date': end_date,
-                        'duration': calculate_duration(start_date_obj, end_date_obj) if start_date_obj and end_date_obj else ""
-                    })
-                
-                # Move past this job entry
-                i += 3
-                job_title_match = True
-                break
-        
-        if not job_title_match:
-            i += 1
-    
-    # If we still haven't found experiences, try one more approach
-    # Looking for lines with specific format in Mahad's resume
-    if not experiences:
-        for i, line in enumerate(lines):
-            # Check for job roles like "Content Writer" followed by company on next line
-            if any(title in line for title in potential_job_titles):
-                position = line.strip()
-                company = ""
-                
-                # Get company from the next line
-                if i + 1 < len(lines) and len(lines[i + 1].strip()) > 0:
-                    company = lines[i + 1].strip()
-                
-                # Look for date pattern in the next line
-                date_line = ""
-                if i + 2 < len(lines):
-                    date_line = lines[i + 2].strip()
-                
-                start_date = ""
-                end_date = "Present"  # Default
-                
-                # Try to extract dates
-                date_match = re.search(r"(\d{2}/\d{4})\s*[-–—]\s*((?:\d{2}/\d{4})|(?:Present))", date_line)
-                if date_match:
-                    start_date = date_match.group(1)
-                    end_date = date_match.group(2)
-                else:
-                    # Try simpler pattern just looking for MM/YYYY
-                    date_match = re.search(r"(\d{2}/\d{4})", date_line)
-                    if date_match:
-                        start_date = date_match.group(1)
-                
-                # Create experience entry if we have position and either company or dates
-                if position and (company or start_date):
-                    # Parse dates
-                    start_date_obj = parse_date(start_date) if start_date else None
-                    end_date_obj = parse_date(end_date) if end_date else None
-                    
-                    experiences.append({
-                        'position': position,
-                        'company': company,
-                        'start_date': start_date,
-                        'end_date': end_date,
-                        'duration': calculate_duration(start_date_obj, end_date_obj) if start_date_obj and end_date_obj else ""
-                    })
-    
-    # Specific handling for Mahad's resume format
-    # If we still don't have experiences, let's try looking for consecutive lines with job info
-    if not experiences:
-        for i in range(len(lines) - 2):
-            line1 = lines[i].strip()
-            line2 = lines[i+1].strip() if i+1 < len(lines) else ""
-            line3 = lines[i+2].strip() if i+2 < len(lines) else ""
-            
-            # Check if first line looks like a position
-            if any(title in line1 for title in potential_job_titles):
-                position = line1
-                company = line2
-                
-                # Try to find date in third line or surrounding lines
-                date_line = line3
-                for j in range(max(0, i-1), min(len(lines), i+5)):
-                    potential_date_line = lines[j].strip()
-                    if re.search(r"\d{2}/\d{4}", potential_date_line) or "Present" in potential_date_line:
-                        date_line = potential_date_line
-                        break
-                
-                start_date = ""
-                end_date = "Present"  # Default assumption
-                
-                # Try different date patterns
-                date_patterns = [
-                    r"(\d{2}/\d{4})\s*[-–—]\s*(\d{2}/\d{4}|Present)",
-                    r"(\d{2}/\d{4})\s*to\s*(\d{2}/\d{4}|Present)",
-                    r"(\d{1,2}/\d{4})"  # Just single date
-                ]
-                
-                for pattern in date_patterns:
-                    date_match = re.search(pattern, date_line)
-                    if date_match:
-                        if len(date_match.groups()) >= 2:
-                            start_date = date_match.group(1)
-                            end_date = date_match.group(2)
-                        else:
-                            start_date = date_match.group(1)
-                        break
-                
-                if position and (company or start_date):
-                    # Parse dates for calculation
-                    start_date_obj = parse_date(start_date) if start_date else None
-                    end_date_obj = parse_date(end_date) if end_date else None
-                    
-                    experiences.append({
-                        'position': position,
-                        'company': company,
-                        'start_date': start_date,
-                        'end_date': end_date,
-                        'duration': calculate_duration(start_date_obj, end_date_obj) if start_date_obj and end_date_obj else ""
-                    })
-    
-    return experiences
+    entry = None
+    lookahead = 0
+
+    for raw_line in lines:
+        line = raw_line.strip()
+        if not line:
+            continue
+        is_bullet = line.startswith(BULLETS)
+        dates = EMPLOYMENT_DATES.search(line)
+        # Text of the line with its dates cut out
+        remainder = (line[:dates.start()] + line[dates.end():]).strip(' ,|-–—()') if dates else line
+        title = None
+        if not is_bullet and len(remainder.split()) <= MAX_TITLE_WORDS:
+            title = find_title(remainder)
+
+        if title:
+            if entry and (entry['company'] or entry['start_date']):
+                experiences.append(_make_experience(entry))
+            position, company = _split_title_line(remainder, title)
+            entry = {'position': position, 'company': company, 'start_date': '', 'end_date': ''}
+            if dates:
+                entry['start_date'], entry['end_date'] = dates.group('start'), dates.group('end') or ''
+            lookahead = ENTRY_LOOKAHEAD
+            continue
+
+        if entry is None or lookahead == 0:
+            continue
+        lookahead -= 1
+        if dates and not entry['start_date']:
+            entry['start_date'], entry['end_date'] = dates.group('start'), dates.group('end') or ''
+        if not entry['company'] and not is_bullet and remainder:
+            entry['company'] = remainder
+
+    if entry and (entry['company'] or entry['start_date']):
+        experiences.append(_make_experience(entry))
 
-def calculate_duration(start_date, end_date):
-    """Calculate duration between two dates in months and years"""
-    if isinstance(start_date, str) or isinstance(end_date, str):
-        return ""
-    
-    if end_date == 'Present':
-        end_date = datetime.now()
-    
-    delta_months = (end_date.year - start_date.year) * 12 + (end_date.month - start_date.month)
-    years = delta_months // 12
-    months = delta_months % 12
-    
-    if years > 0 and months > 0:
-        return f"{years} year{'s' if years > 1 else ''}, {months} month{'s' if months > 1 else ''}"
-    elif years > 0:
-        return f"{years} year{'s' if years > 1 else ''}"
-    else:
-        return f"{months} month{'s' if months > 1 else ''}"
+    return experiences
 
 def extract_experience(doc):
     """Combined function to extract both experience level and work history"""
@@ -586,41 +373,34 @@ def extract_experience(doc):
     return {
         'level_of_experience': experience_level['level_of_experience'],
         'suggested_position': experience_level['suggested_position'],
+        'seniority_scores': experience_level['seniority_scores'],
+        'ranked_positions': experience_level['ranked_positions'],
         'work_experiences': work_experiences
     }
 # --------------------------------------------------------------------------------
 
 
 # -----------------------------------Suggestions----------------------------------
-def load_positions_keywords(file_path):
-    positions_keywords = {}
-    with open(file_path, 'r') as file:
-        reader = csv.DictReader(file)
-        for row in reader:
-            position = row['position']
-            keywords = [keyword.lower()
-                        for keyword in row['keywords'].split(',')]
-            positions_keywords[position] = keywords
-    return positions_keywords
-
-
-def suggest_position(verbs):
-    positions_keywords = load_positions_keywords('data/position.csv')
-    verbs = [verb.lower() for verb in verbs]
-    for position, keywords in positions_keywords.items():
-        if any(keyword in verbs for keyword in keywords):
-            return position
-
-    return "Position Not Identified"
-
-
 def extract_resume_info_from_pdf(uploaded_file):
-    doc = pymupdf_fitz.open(stream=uploaded_file.read(), filetype="pdf")
-    text = ""
-    for page_num in range(doc.page_count):
-        page = doc[page_num]
-        text += page.get_text()
-    return nlp(text)
+    """Parse an Upload, or a file-like object that goes through receive_upload and its size limit"""
+    nlp = get_nlp()
+    with receive_upload(uploaded_file).open_pdf() as doc:
+        pages = [page.get_text() for page in doc]
+    # Normalize once here so no extractor has to clean the text again
+    normalized = normalize_text("".join(pages))
+    if SettingsManager().get_setting('parser', 'doc_cache'):
+        # Pages unchanged since an earlier version of the resume go through neither model again
+        page_starts = list(accumulate((len(page) for page in pages[:-1]), initial=0))
+        skills = (pipeline_id(get_skills_nlp()), page_skill_entities)
+        parsed, page_hashes, reused = get_or_parse_pages(normalized.split(page_starts), nlp, skills=skills)
+        parsed.user_data['page_hashes'] = page_hashes
+        parsed.user_data['pages_reused'] = reused
+        # What a stored candidate needs to pin its pages and have them re-analyzed later
+        parsed.user_data['doc_pipeline'] = cache_pipeline(nlp, skills[0])
+    else:
+        parsed = nlp(normalized.text)
+    parsed.user_data['normalized_text'] = normalized
+    return parsed
 
 
 def show_colored_skills(skills):
@@ -628,78 +408,117 @@ def show_colored_skills(skills):
 
 
 def calculate_resume_score(resume_info):
-    score = 0
-    if resume_info['first_name'] and resume_info['last_name']:
-        score += 25
-    if resume_info['email']:
-        score += 25
-    if resume_info['degree_major']:
-        score += 25
-    if resume_info['skills']:
-        score += 25
-    return score
-
-
-def extract_resume_info(doc):
-    first_name, last_name = extract_name(doc)
-    email = extract_email(doc)
+    """Total score out of 100, from the weights in data/scoring_weights.json"""
+    return total_score(score_resume(resume_info))
+
+
+def deep_parse_low_confidence(doc, resume_info):
+    """
+    Re-extract the fields whose confidence is below the deep parsing threshold
+    with Gemini, sending only the text they come from. Returns the fields
+    that were replaced.
+    """
+    if not llm_fallback.is_enabled():
+        return []
+    threshold = llm_fallback.confidence_threshold()
+    confidence = resume_info['confidence']
+    deep_parsed = []
+
+    if confidence['name'] < threshold:
+        result = llm_fallback.deep_parse('name', '\n'.join(doc.text.splitlines()[:10]))
+        if result and result.get('first_name'):
+            resume_info['first_name'] = str(result['first_name'])
+            resume_info['last_name'] = str(result.get('last_name') or '')
+            deep_parsed.append('name')
+
+    if confidence['work_experience'] < threshold:
+        section = '\n'.join(section_lines(segment_sections(doc.text), 'experience'))
+        # A resume with no experience section has no work history to find, so nothing is sent for it
+        result = llm_fallback.deep_parse('work_experience', section) if section.strip() else None
+        if result and result.get('work_experiences'):
+            resume_info['experience']['work_experiences'] = [
+                _make_experience({key: str(entry.get(key) or '') for key in ('position', 'company', 'start_date', 'end_date')})
+                for entry in result['work_experiences'] if isinstance(entry, dict)
+            ]
+            deep_parsed.append('work_experience')
+
+    return deep_parsed
+
+
+def extract_resume_info(doc, deep_parsing=True):
+    first_name, last_name, name_confidence = extract_name_with_confidence(doc)
+    # Email, phone and profile links come from a single contact scan
+    contacts = contact_values(doc.text)
     skills = extract_skills(doc)
     degree_major = extract_major(doc)
     experience = extract_experience(doc)
     education = extract_education_from_resume(doc)
 
-    return {
+    resume_info = {
         'first_name': first_name, 
         'last_name': last_name, 
-        'email': email, 
+        'email': contacts['email'], 
+        'phone': contacts['phone'],
+        'linkedin': contacts['linkedin'],
+        'github': contacts['github'],
+        'portfolio': contacts['portfolio'],
         'degree_major': degree_major, 
         'skills': skills, 
         'experience': experience,
         'education': education
     }
+    resume_info['confidence'] = {
+        'name': name_confidence,
+        'email': 1.0 if contacts['email'] else 0.0,
+        'phone': 1.0 if contacts['phone'] else 0.0,
+        'work_experience': work_experience_confidence(experience['work_experiences']),
+        'education': 0.8 if education else 0.0
+    }
+    resume_info['deep_parsed'] = deep_parse_low_confidence(doc, resume_info) if deep_parsing else []
+    return resume_info
+
+
+def reanalyze_resume(page_hashes):
+    """
+    Re-run the rule-based extractors over the cached pages of a resume (the
+    page_hashes of its parse), with neither model running and nothing sent
+    to Gemini. Returns the extract_resume_info dict, or None when a page is
+    no longer cached for the current models.
+    """
+    doc = load_pages(page_hashes, get_nlp(), pipeline_id(get_skills_nlp()))
+    if doc is None:
+        return None
+    return extract_resume_info(doc, deep_parsing=False)
+
+
+# Curated skill lists of a few roles, used instead of their suggestedSkills.csv rows
+SPECIALIZED_ROLE_SKILLS = {
+    "full stack developer": [
+        "JavaScript", "React.js", "Node.js", "Python", "Django",
+        "HTML5", "CSS3", "MongoDB", "PostgreSQL", "RESTful APIs",
+        "Git", "Docker", "AWS", "TypeScript", "GraphQL",
+        "Redux", "Express.js", "SQL", "Bootstrap", "Webpack"
+    ],
+    "cloud architect": [
+        "AWS", "Azure", "Google Cloud", "Kubernetes", "Docker",
+        "Terraform", "CloudFormation", "Microservices", "Jenkins",
+        "Python", "Linux", "CI/CD", "Security", "Networking",
+        "Load Balancing", "Scalability", "Cloud Security"
+    ],
+    "machine learning engineer": [
+        "Python", "TensorFlow", "PyTorch", "Scikit-learn", "Pandas",
+        "NumPy", "Deep Learning", "NLP", "Computer Vision", "SQL",
+        "Machine Learning Algorithms", "Data Preprocessing", "Neural Networks",
+        "Model Deployment", "MLOps", "Statistics"
+    ]
+}
 
 
 def suggest_skills_for_job(desired_job):
-    # Predefined skills mapping for key roles using existing NER/NLP datasets
-    specialized_skills = {
-        "full stack developer": [
-            "JavaScript", "React.js", "Node.js", "Python", "Django",
-            "HTML5", "CSS3", "MongoDB", "PostgreSQL", "RESTful APIs",
-            "Git", "Docker", "AWS", "TypeScript", "GraphQL",
-            "Redux", "Express.js", "SQL", "Bootstrap", "Webpack"
-        ],
-        "cloud architect": [
-            "AWS", "Azure", "Google Cloud", "Kubernetes", "Docker",
-            "Terraform", "CloudFormation", "Microservices", "Jenkins",
-            "Python", "Linux", "CI/CD", "Security", "Networking",
-            "Load Balancing", "Scalability", "Cloud Security"
-        ],
-        "machine learning engineer": [
-            "Python", "TensorFlow", "PyTorch", "Scikit-learn", "Pandas",
-            "NumPy", "Deep Learning", "NLP", "Computer Vision", "SQL",
-            "Machine Learning Algorithms", "Data Preprocessing", "Neural Networks",
-            "Model Deployment", "MLOps", "Statistics"
-        ]
-    }
-    
     # First check specialized roles
     desired_job_lower = desired_job.lower()
-    if desired_job_lower in specialized_skills:
-        return specialized_skills[desired_job_lower]
-        
-    # If not in specialized roles, check CSV file for other roles
-    job_skills_mapping = {}
-    try:
-        with open('data/suggestedSkills.csv', newline='') as csvfile:
-            reader = csv.reader(csvfile)
-            for row in reader:
-                job_title = row[0].lower()
-                skills = row[1:]
-                job_skills_mapping[job_title] = skills
+    if desired_job_lower in SPECIALIZED_ROLE_SKILLS:
+        return load_lexicons().taxonomy.canonical_list(SPECIALIZED_ROLE_SKILLS[desired_job_lower])
         
-        if desired_job_lower in job_skills_mapping:
-            return job_skills_mapping[desired_job_lower]
-    except Exception as e:
-        print(f"Error reading skills CSV: {str(e)}")
-    
-    return []
\ No newline at end of file
+    # If not in specialized roles, check the role -> skills map from suggestedSkills.csv
+    return list(load_lexicons().role_skills.get(desired_job_lower, []))
\ No newline at end of file
@@ -0,0 +1,27 @@
+"""
+Run the app with the background warmup started by the server process.
+
+`streamlit run main.py` only starts the warmup on the first script run,
+that is once the first user has opened the page. This starts it before
+Streamlit serves anything; main.py then finds it already running, since
+utils.warmup is imported once per process.
+
+Usage: python serve.py [streamlit run options]
+"""
+
+import sys
+
+from streamlit.web import cli as stcli
+
+from utils.assets import AssetError, require_assets
+from utils.warmup import start_warmup
+
+if __name__ == '__main__':
+    try:
+        require_assets()
+        start_warmup()
+    except AssetError as e:
+        # main.py shows the same error on the page
+        print(str(e), file=sys.stderr)
+    sys.argv = ['streamlit', 'run', 'main.py', *sys.argv[1:]]
+    sys.exit(stcli.main())
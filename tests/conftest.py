@@ -0,0 +1,9 @@
+import os
+import sys
+from pathlib import Path
+
+# The modules read their data files by paths relative to the project root
+project_root = Path(__file__).parent.parent
+if str(project_root) not in sys.path:
+    sys.path.insert(0, str(project_root))
+os.chdir(project_root)
@@ -0,0 +1,116 @@
+import sqlite3
+
+import pytest
+
+from utils import blob_store
+from utils.uploads import Upload
+
+
+@pytest.fixture
+def conn(tmp_path, monkeypatch):
+    monkeypatch.setattr(blob_store, 'BLOB_DIR', str(tmp_path / 'blobs'))
+    conn = blob_store.connect(str(tmp_path / 'user_pdfs.db'))
+    yield conn
+    conn.close()
+
+
+def refcount(conn, blob_hash):
+    row = conn.execute("SELECT refcount FROM blobs WHERE hash = ?", (blob_hash,)).fetchone()
+    return row[0] if row else 0
+
+
+def blob_hash_of(conn, upload_id):
+    return conn.execute("SELECT blob_hash FROM user_uploaded_pdfs WHERE id = ?", (upload_id,)).fetchone()[0]
+
+
+def test_same_content_is_stored_once(conn):
+    first = blob_store.add_upload(conn, 'a.pdf', b'%PDF-1.4 resume')
+    second = blob_store.add_upload(conn, 'b.pdf', b'%PDF-1.4 resume')
+    blob_hash = blob_hash_of(conn, first)
+    assert blob_hash_of(conn, second) == blob_hash
+    assert refcount(conn, blob_hash) == 2
+    assert blob_store.storage_used(conn) == len(b'%PDF-1.4 resume')
+    assert blob_store.read_blob(blob_hash) == b'%PDF-1.4 resume'
+
+
+def test_file_is_removed_with_the_last_reference(conn):
+    first = blob_store.add_upload(conn, 'a.pdf', b'%PDF-1.4 resume')
+    second = blob_store.add_upload(conn, 'b.pdf', b'%PDF-1.4 resume')
+    blob_hash = blob_hash_of(conn, first)
+
+    blob_store.delete_uploads(conn, [first])
+    assert refcount(conn, blob_hash) == 1
+    assert blob_store.blob_path(blob_hash).exists()
+
+    blob_store.delete_uploads(conn, [second])
+    assert refcount(conn, blob_hash) == 0
+    assert not blob_store.blob_path(blob_hash).exists()
+    assert blob_store.storage_used(conn) == 0
+
+
+def test_upload_again_after_release_keeps_the_file(conn):
+    upload_id = blob_store.add_upload(conn, 'a.pdf', b'%PDF-1.4 resume')
+    blob_hash = blob_hash_of(conn, upload_id)
+    with conn:
+        assert blob_store.release_blob(conn, blob_hash)
+        conn.execute("DELETE FROM user_uploaded_pdfs WHERE id = ?", (upload_id,))
+    blob_store.add_upload(conn, 'a.pdf', b'%PDF-1.4 resume')
+    blob_store.remove_unreferenced(conn, [blob_hash])
+    assert blob_store.read_blob(blob_hash) == b'%PDF-1.4 resume'
+
+
+def test_rolled_back_upload_leaves_no_file(conn):
+    blob_hash = Upload('a.pdf', b'%PDF-1.4 resume').content_hash
+    # name is NOT NULL, so the upload row fails after the blob was written
+    with pytest.raises(Exception):
+        blob_store.add_upload(conn, None, b'%PDF-1.4 resume')
+    assert refcount(conn, blob_hash) == 0
+    assert not blob_store.blob_path(blob_hash).exists()
+
+
+def test_existing_file_is_rewritten(conn):
+    upload_id = blob_store.add_upload(conn, 'a.pdf', b'%PDF-1.4 resume')
+    path = blob_store.blob_path(blob_hash_of(conn, upload_id))
+    path.write_bytes(b'partial')
+    blob_store.add_upload(conn, 'b.pdf', b'%PDF-1.4 resume')
+    assert path.read_bytes() == b'%PDF-1.4 resume'
+    assert not list(path.parent.glob('*.tmp'))
+
+
+def old_uploads_table(db_path, rows):
+    """A user_uploaded_pdfs table from before the blob store, holding the PDF bytes"""
+    with sqlite3.connect(db_path) as conn:
+        conn.execute("CREATE TABLE user_uploaded_pdfs (id INTEGER PRIMARY KEY, name TEXT, data BLOB)")
+        conn.executemany("INSERT INTO user_uploaded_pdfs (id, name, data) VALUES (?, ?, ?)", rows)
+    conn.close()
+
+
+def test_old_uploads_are_moved_into_the_store(tmp_path, monkeypatch):
+    monkeypatch.setattr(blob_store, 'BLOB_DIR', str(tmp_path / 'blobs'))
+    db_path = str(tmp_path / 'old.db')
+    old_uploads_table(db_path, [(3, 'a.pdf', b'%PDF-1.4 a'), (7, 'b.pdf', b'%PDF-1.4 b')])
+    conn = blob_store.connect(db_path)
+    assert conn.execute("SELECT id, name FROM user_uploaded_pdfs ORDER BY id").fetchall() == [(3, 'a.pdf'),
+                                                                                              (7, 'b.pdf')]
+    assert blob_store.read_blob(blob_hash_of(conn, 7)) == b'%PDF-1.4 b'
+    assert not conn.execute("SELECT 1 FROM sqlite_master WHERE name = 'user_uploaded_pdfs_old'").fetchone()
+    conn.close()
+
+
+def test_interrupted_migration_is_finished(tmp_path, monkeypatch):
+    monkeypatch.setattr(blob_store, 'BLOB_DIR', str(tmp_path / 'blobs'))
+    db_path = str(tmp_path / 'old.db')
+    old_uploads_table(db_path, [(1, 'a.pdf', b'%PDF-1.4 a')])
+    with sqlite3.connect(db_path) as conn:
+        conn.execute("ALTER TABLE user_uploaded_pdfs RENAME TO user_uploaded_pdfs_old")
+        # A later start created the new table, and a PDF was uploaded into it under the same ID
+        conn.execute(f"CREATE TABLE user_uploaded_pdfs {blob_store._UPLOADS_COLUMNS}")
+        conn.execute("INSERT INTO user_uploaded_pdfs (id, name, blob_hash) VALUES (1, 'new.pdf', 'abc')")
+    conn.close()
+
+    conn = blob_store.connect(db_path)
+    rows = conn.execute("SELECT name, blob_hash FROM user_uploaded_pdfs ORDER BY id").fetchall()
+    assert [name for name, _ in rows] == ['new.pdf', 'a.pdf']
+    assert blob_store.read_blob(rows[1][1]) == b'%PDF-1.4 a'
+    assert not conn.execute("SELECT 1 FROM sqlite_master WHERE name = 'user_uploaded_pdfs_old'").fetchone()
+    conn.close()
@@ -0,0 +1,74 @@
+import sqlite3
+
+import pytest
+
+from utils import candidate_search
+
+
+class Taxonomy:
+    def canonical(self, term):
+        return {'js': 'JavaScript'}.get(term.lower(), term)
+
+
+@pytest.fixture
+def cursor():
+    conn = sqlite3.connect(':memory:')
+    conn.execute('''
+        CREATE TABLE candidates (
+            id INTEGER PRIMARY KEY AUTOINCREMENT, first_name TEXT, last_name TEXT, email TEXT,
+            skills TEXT, education TEXT, resume_score INTEGER DEFAULT 0
+        )
+    ''')
+    cursor = conn.cursor()
+    candidate_search.create_search_index(cursor)
+    yield cursor
+    conn.close()
+
+
+def add(cursor, first_name, skills, score=0):
+    cursor.execute('INSERT INTO candidates (first_name, last_name, email, skills, education, resume_score) '
+                   'VALUES (?, ?, ?, ?, ?, ?)', (first_name, 'Doe', f'{first_name.lower()}@example.com', skills,
+                                                 'BSc', score))
+    return cursor.lastrowid
+
+
+def names(cursor, query, category='All'):
+    return [row[1] for row in candidate_search.search(cursor, query, category, Taxonomy())]
+
+
+def test_insert_is_indexed(cursor):
+    add(cursor, 'Jane', 'Python,JavaScript')
+    add(cursor, 'John', 'Java')
+    assert names(cursor, 'java', 'Skills') == ['John']
+    assert names(cursor, 'js', 'Skills') == ['Jane']
+    assert names(cursor, 'c++', 'Skills') == []
+
+
+def test_update_and_delete_keep_index_in_sync(cursor):
+    jane = add(cursor, 'Jane', 'Python')
+    cursor.execute("UPDATE candidates SET skills = 'Rust' WHERE id = ?", (jane,))
+    assert names(cursor, 'python', 'Skills') == []
+    assert names(cursor, 'rust', 'Skills') == ['Jane']
+    cursor.execute("DELETE FROM candidates WHERE id = ?", (jane,))
+    assert names(cursor, 'rust', 'Skills') == []
+    cursor.execute("INSERT INTO candidates_fts (candidates_fts) VALUES ('integrity-check')")
+
+
+def test_existing_rows_are_indexed_when_the_index_is_created():
+    conn = sqlite3.connect(':memory:')
+    conn.execute('CREATE TABLE candidates (id INTEGER PRIMARY KEY, first_name TEXT, last_name TEXT, email TEXT, '
+                 'skills TEXT, education TEXT)')
+    conn.execute("INSERT INTO candidates VALUES (1, 'Jane', 'Doe', 'jane@example.com', 'C#', 'BSc')")
+    cursor = conn.cursor()
+    candidate_search.create_search_index(cursor)
+    assert names(cursor, 'c#', 'Skills') == ['Jane']
+    assert names(cursor, 'ja', 'Name') == ['Jane']
+
+
+def test_filters_and_ranking(cursor):
+    add(cursor, 'Python', 'Go', score=90)
+    add(cursor, 'Jane', 'Python', score=40)
+    # A name match outranks a skills match
+    assert names(cursor, 'python') == ['Python', 'Jane']
+    rows = candidate_search.search(cursor, 'python', 'All', Taxonomy(), 'c.resume_score >= ?', (50,))
+    assert [row[1] for row in rows] == ['Python']
@@ -0,0 +1,32 @@
+from utils.contact_scanner import contact_values, scan_contacts
+
+HEADER = "Jane Doe\njane.doe@example.com | (555) 123-4567\nlinkedin.com/in/janedoe | https://github.com/janedoe\n"
+
+
+def test_header_contacts():
+    values = contact_values(HEADER)
+    assert values['email'] == 'jane.doe@example.com'
+    assert values['linkedin'] == 'linkedin.com/in/janedoe'
+    assert values['github'] == 'https://github.com/janedoe'
+    assert values['portfolio'] == ''
+
+
+def test_body_links_are_not_profiles():
+    body = '\n'.join(f"Line {i}" for i in range(10))
+    text = ("Jane Doe\n" + body + "\nBuilt https://acme.com/product and contributed to "
+            "https://github.com/acme/tool\nReach me at jane@example.com")
+    values = contact_values(text)
+    assert values['portfolio'] == ''
+    assert values['github'] == ''
+    assert values['email'] == 'jane@example.com'
+
+
+def test_repo_url_is_not_a_github_profile():
+    values = contact_values("Jane Doe\nhttps://github.com/acme/tool\n")
+    assert values['github'] == ''
+    assert values['portfolio'] == 'https://github.com/acme/tool'
+
+
+def test_offsets():
+    found = scan_contacts(HEADER)['email']
+    assert HEADER[found['start']:found['end']] == 'jane.doe@example.com'
@@ -0,0 +1,75 @@
+import sqlite3
+
+import spacy
+
+from utils import doc_cache
+
+nlp = spacy.blank('en')
+
+
+def test_unchanged_pages_are_reused(tmp_path):
+    db_path = str(tmp_path / 'doc_cache.db')
+    pages = ["Jane Doe\nPython developer\n", "Experience\nAcme 2020 - Present\n"]
+    doc, page_hashes, reused = doc_cache.get_or_parse_pages(pages, nlp, db_path)
+    assert doc.text == ''.join(pages) and reused == 0
+    doc, _, reused = doc_cache.get_or_parse_pages([pages[0], "Experience\nAcme 2021 - Present\n"], nlp, db_path)
+    assert reused == 1
+    assert doc.text == pages[0] + "Experience\nAcme 2021 - Present\n"
+
+
+def test_least_recently_used_pages_are_evicted(tmp_path):
+    db_path = str(tmp_path / 'doc_cache.db')
+    doc_cache.store_docs([nlp("first page"), nlp("second page")], nlp, db_path)
+    with sqlite3.connect(db_path) as conn:
+        conn.execute("UPDATE doc_cache SET used_at = '2000-01-01 00:00:00' WHERE text_hash = ?",
+                     (doc_cache.text_hash("first page"),))
+        page_size = conn.execute("SELECT MAX(length(doc_bin)) FROM doc_cache").fetchone()[0]
+    doc_cache.store_docs([nlp("third page")], nlp, db_path, max_bytes=2 * page_size + 8)
+    with sqlite3.connect(db_path) as conn:
+        kept = {row[0] for row in conn.execute("SELECT text_hash FROM doc_cache")}
+    assert kept == {doc_cache.text_hash("second page"), doc_cache.text_hash("third page")}
+
+
+def test_skill_entities_only_found_on_changed_pages(tmp_path):
+    db_path = str(tmp_path / 'doc_cache.db')
+    seen = []
+
+    def find_skills(texts):
+        seen.extend(texts)
+        return [[word for word in text.split() if word in ('Python', 'SQL', 'Rust')] for text in texts]
+
+    skills = ('skills-1', find_skills)
+    pages = ["Jane Doe\nPython\n", "Experience\nSQL at Acme\n"]
+    doc, _, _ = doc_cache.get_or_parse_pages(pages, nlp, db_path, skills)
+    assert doc.user_data['skill_entities'] == ['Python', 'SQL']
+
+    seen.clear()
+    doc, _, reused = doc_cache.get_or_parse_pages([pages[0], "Experience\nRust at Acme\n"], nlp, db_path, skills)
+    assert reused == 1
+    assert seen == ["Experience\nRust at Acme\n"]
+    assert doc.user_data['skill_entities'] == ['Python', 'Rust']
+
+    # Another skills model does not reuse the entities
+    seen.clear()
+    doc_cache.get_or_parse_pages(pages, nlp, db_path, ('skills-2', find_skills))
+    assert seen == pages
+
+
+def test_pinned_pages_are_kept_and_reloaded(tmp_path):
+    db_path = str(tmp_path / 'doc_cache.db')
+    skills = ('skills-1', lambda texts: [[] for _ in texts])
+    pages = ["Jane Doe\nPython developer\n", "Experience\nAcme 2020 - Present\n"]
+    doc, page_hashes, _ = doc_cache.get_or_parse_pages(pages, nlp, db_path, skills)
+    doc_cache.pin_pages('candidate:1', page_hashes, doc_cache.cache_pipeline(nlp, 'skills-1'), db_path)
+
+    # Fill the cache far past its size with unpinned pages
+    doc_cache.store_docs([nlp(f"page {i}") for i in range(20)], nlp, db_path, max_bytes=1)
+    reloaded = doc_cache.load_pages(page_hashes, nlp, 'skills-1', db_path)
+    assert reloaded.text == doc.text
+    assert reloaded.user_data['skill_entities'] == []
+    # Not under another skills model
+    assert doc_cache.load_pages(page_hashes, nlp, 'skills-2', db_path) is None
+
+    doc_cache.unpin_pages('candidate:1', db_path)
+    doc_cache.store_docs([nlp("another page")], nlp, db_path, max_bytes=1)
+    assert doc_cache.load_pages(page_hashes, nlp, 'skills-1', db_path) is None
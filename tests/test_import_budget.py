@@ -0,0 +1,29 @@
+"""Runs the import-time check of benchmarks/bench_imports.py for every budgeted module."""
+
+import pytest
+
+from benchmarks.bench_imports import BUDGETS_MS, measure, project_root
+
+
+def _missing_dependency(error):
+    """Name of the third-party package an import failed on, or None"""
+    message = str(error)
+    if not message.startswith('ModuleNotFoundError'):
+        return None
+    name = message.split("'")[1].split('.')[0]
+    project_module = (project_root / name).is_dir() or (project_root / f"{name}.py").is_file()
+    return None if project_module else name
+
+
+@pytest.mark.parametrize('module', BUDGETS_MS)
+def test_import_within_budget(module):
+    try:
+        total, children, eager = min(measure(module) for _ in range(3))
+    except RuntimeError as e:
+        missing = _missing_dependency(e)
+        if missing:
+            pytest.skip(f"{missing} is not installed")
+        raise
+    assert not eager, f"{module} imports {', '.join(eager)} eagerly"
+    heaviest = ', '.join(f"{name} {cumulative / 1000:.0f} ms" for cumulative, name in children)
+    assert total / 1000 <= BUDGETS_MS[module], f"{module} took {total / 1000:.0f} ms to import ({heaviest})"
@@ -0,0 +1,26 @@
+import os
+
+from utils import lexicon_artifact
+
+
+def test_touched_sources_keep_the_artifact_fresh(tmp_path):
+    path = str(tmp_path / 'lexicons.bin')
+    lexicon_artifact.build_artifact(path)
+    payload = lexicon_artifact.read_artifact(path)
+    source = lexicon_artifact.SOURCES['majors']
+    stat = os.stat(source)
+    try:
+        os.utime(source, ns=(stat.st_atime_ns, stat.st_mtime_ns + 10**9))
+        assert payload['sources'] == lexicon_artifact.source_checksums()
+    finally:
+        os.utime(source, ns=(stat.st_atime_ns, stat.st_mtime_ns))
+    assert os.listdir(tmp_path) == ['lexicons.bin']
+
+
+def test_corrupt_artifact_is_rejected(tmp_path):
+    path = tmp_path / 'lexicons.bin'
+    lexicon_artifact.build_artifact(str(path))
+    data = bytearray(path.read_bytes())
+    data[-1] ^= 0xFF
+    path.write_bytes(bytes(data))
+    assert lexicon_artifact.read_artifact(str(path)) is None
@@ -0,0 +1,98 @@
+import numpy as np
+import pytest
+import spacy
+from spacy.strings import hash_string
+from spacy.tokens import Doc
+
+from utils.lexicon_artifact import load_lexicons
+from utils.lexicon_classifier import ENTRY_LEVEL, SENIORITY_KEYWORDS, LexiconClassifier, LexiconTable
+
+# Resumes as word/lemma/POS tokens, so no tagger is needed
+RESUMES = [
+    "Led/lead/VERB a/a/DET team/team/NOUN and/and/CCONJ managed/manage/VERB budgets/budget/NOUN ,/,/PUNCT "
+    "developed/develop/VERB financial/financial/ADJ strategy/strategy/NOUN and/and/CCONJ "
+    "forecasting/forecasting/NOUN models/model/NOUN",
+    "Designed/design/VERB and/and/CCONJ implemented/implement/VERB APIs/api/NOUN in/in/ADP Python/Python/PROPN ,/,/PUNCT "
+    "debugged/debug/VERB services/service/NOUN and/and/CCONJ assisted/assist/VERB testers/tester/NOUN",
+    "Ran/run/VERB social/social/ADJ media/media/NOUN campaigns/campaign/NOUN ,/,/PUNCT supported/support/VERB "
+    "employee/employee/NOUN relations/relation/NOUN and/and/CCONJ wrote/write/VERB content/content/NOUN",
+    "Enjoys/enjoy/VERB hiking/hiking/NOUN",
+]
+POS_NAMES = {'VERB', 'NOUN', 'PROPN', 'ADJ'}
+# A blank pipeline's vocabulary sets the lowercase forms of the words
+VOCAB = spacy.blank('en').vocab
+
+
+def make_doc(spec):
+    words, lemmas, pos = zip(*(token.split('/') for token in spec.split()))
+    return Doc(VOCAB, words=list(words), lemmas=list(lemmas), pos=list(pos))
+
+
+def loop_scores(doc, class_keywords, pos_tags):
+    """Token-by-token reference of LexiconTable.score: keyword hits per class over its keyword count"""
+    keywords = {name: {' '.join(keyword.split()) for keyword in words if keyword.strip()}
+                for name, words in class_keywords.items()}
+    known = set().union(*keywords.values())
+    hits = []
+    for token in doc:
+        if token.pos_ in pos_tags:
+            key = token.lemma_ if token.lemma_ in known else token.lower_ if token.lower_ in known else None
+            if key is not None:
+                hits.append(key)
+    lowers = [token.lower_ for token in doc]
+    for phrase in (keyword for keyword in known if ' ' in keyword):
+        length = len(phrase.split())
+        hits += [phrase for start in range(len(lowers) - length + 1)
+                 if ' '.join(lowers[start:start + length]) == phrase]
+    scores = {name: sum(hit in words for hit in hits) / max(len(words), 1) for name, words in keywords.items()}
+    total = sum(scores.values())
+    if total <= 0:
+        return []
+    ranked = sorted(scores, key=lambda name: -scores[name])  # sorted is stable, like argsort(kind='stable')
+    return [(name, round(scores[name] / total, 3)) for name in ranked if scores[name] > 0]
+
+
+@pytest.fixture(scope='module')
+def classifier():
+    return LexiconClassifier()
+
+
+@pytest.mark.parametrize('spec', RESUMES)
+def test_matches_loop_reference(classifier, spec):
+    doc = make_doc(spec)
+    result = classifier.classify(doc)
+    seniority = loop_scores(doc, SENIORITY_KEYWORDS, {'VERB'}) or [(ENTRY_LEVEL, 1.0)]
+    assert result['seniority'] == seniority
+    assert result['positions'] == loop_scores(doc, load_lexicons().positions, POS_NAMES)
+
+
+def test_multi_word_keywords_match_consecutive_tokens(classifier):
+    positions = dict(classifier.classify(make_doc(RESUMES[2]))['positions'])
+    assert 'Digital Marketing Specialist' in positions
+    assert 'Human Resources Manager' in positions
+    # The same words apart are not the phrase
+    apart = make_doc("social/social/ADJ campaigns/campaign/NOUN and/and/CCONJ media/media/NOUN")
+    table = LexiconTable({'Marketing': ['social media']})
+    assert table.phrase_lengths == [2]
+    assert table.score(np.array([], dtype=np.uint64), np.array([], dtype=np.uint64),
+                       apart.to_array('LOWER')).tolist() == [0.0]
+
+
+def test_seniority_ties_go_to_the_more_senior_tier(classifier):
+    doc = make_doc("Developed/develop/VERB tools/tool/NOUN and/and/CCONJ led/lead/VERB reviews/review/NOUN")
+    assert classifier.classify(doc)['seniority'] == [('Senior', 0.5), ('Mid-Senior', 0.5)]
+
+
+def test_no_keyword_is_entry_level(classifier):
+    assert classifier.classify(make_doc(RESUMES[3]))['seniority'] == [(ENTRY_LEVEL, 1.0)]
+
+
+def test_lookup_only_counts_exact_hashes():
+    table = LexiconTable({'A': ['alpha', 'shared'], 'B': ['beta', 'shared']})
+    hashes = np.sort(table.hashes)
+    # Between two entries, below the first and above the last: searchsorted lands on a row, but not a hit
+    misses = np.array([hashes[0] - 1, hashes[0] + 1, hashes[-1] + 1], dtype=np.uint64)
+    assert not table.lookup(misses)[1].any()
+    # A keyword in two classes counts for both
+    shared = np.array([hash_string('shared')], dtype=np.uint64)
+    assert table.score(shared, shared).tolist() == [0.5, 0.5]
@@ -0,0 +1,49 @@
+import threading
+
+import pytest
+
+from utils import llm_fallback
+from utils.settings_manager import SettingsManager
+
+
+@pytest.fixture
+def enabled(monkeypatch):
+    settings = {'deep_parsing': True, 'llm_deep_parsing': True}
+    monkeypatch.setattr(SettingsManager, 'get_setting',
+                        lambda self, section, key: settings.get(key))
+    monkeypatch.setattr(llm_fallback, '_has_client', lambda: True)
+    monkeypatch.setattr(llm_fallback, '_api_key', lambda: 'key')
+    return settings
+
+
+def test_off_by_default():
+    assert SettingsManager().get_setting('parser', 'llm_deep_parsing') is False
+    assert not llm_fallback.is_enabled()
+
+
+def test_never_sent_from_speculative_threads(enabled):
+    assert llm_fallback.is_enabled()
+    results = []
+    thread = threading.Thread(target=lambda: results.append(llm_fallback.is_enabled()),
+                              name=f'{llm_fallback.BACKGROUND_THREAD_PREFIX}_0')
+    thread.start()
+    thread.join()
+    assert results == [False]
+
+
+def test_failed_request_is_not_retried(enabled, monkeypatch, tmp_path):
+    calls = []
+
+    def failing(field, text):
+        calls.append(field)
+        raise TimeoutError('deadline exceeded')
+
+    monkeypatch.setattr(llm_fallback, '_ask_gemini', failing)
+    db_path = str(tmp_path / 'llm_cache.db')
+    assert llm_fallback.deep_parse('name', 'Jane Doe', db_path) is None
+    assert llm_fallback.deep_parse('name', 'Jane Doe', db_path) is None
+    assert calls == ['name']
+
+    monkeypatch.setattr(llm_fallback, '_ask_gemini', lambda field, text: {'first_name': 'Jane'})
+    monkeypatch.setattr(llm_fallback, 'FAILURE_BACKOFF', llm_fallback.timedelta(0))
+    assert llm_fallback.deep_parse('name', 'Jane Doe', db_path) == {'first_name': 'Jane'}
@@ -0,0 +1,19 @@
+import spacy
+
+from resume_parser import NAME_CONFIDENCE, extract_name_with_confidence
+from utils.settings_manager import SettingsManager
+
+nlp = spacy.blank('en')
+
+
+def test_clean_name_line_skips_deep_parsing():
+    first, last, confidence = extract_name_with_confidence(nlp("Jane Doe\nSoftware Engineer\n"))
+    assert (first, last) == ('Jane', 'Doe')
+    assert confidence == NAME_CONFIDENCE['line']
+    assert confidence >= SettingsManager().get_setting('parser', 'deep_parsing_threshold')
+
+
+def test_all_caps_line_is_unsure():
+    first, last, confidence = extract_name_with_confidence(nlp("SENIOR DATA ANALYST\n"))
+    assert confidence == NAME_CONFIDENCE['line_unsure']
+    assert confidence < SettingsManager().get_setting('parser', 'deep_parsing_threshold')
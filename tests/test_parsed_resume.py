@@ -0,0 +1,43 @@
+import pickle
+
+from utils.parsed_resume import SCHEMA_VERSION, ParsedResume
+
+RESUME_INFO = {
+    'first_name': 'Jane', 'last_name': 'Doe', 'email': 'jane@example.com', 'phone': '555-123-4567',
+    'degree_major': 'Computer Science',
+    'skills': ['Python', 'python', 'Quantum Basket Weaving', 'SQL'],
+    'education': [{'degree': 'BSc', 'institution': 'MIT', 'dates': '2014 - 2018'}, 'Stanford University'],
+    'experience': {'level_of_experience': 'Mid-Senior', 'suggested_position': 'Data Scientist',
+                   'work_experiences': [{'position': 'Engineer', 'company': 'Acme', 'start_date': 'Jan 2019',
+                                         'end_date': 'Present', 'duration': '5 years'}]},
+}
+
+
+def test_from_resume_info():
+    parsed = ParsedResume.from_resume_info(RESUME_INFO)
+    assert parsed.contact.email == 'jane@example.com'
+    assert parsed.skills == ['Python', 'Quantum Basket Weaving', 'SQL']
+    assert [entry.institution for entry in parsed.education] == ['MIT', 'Stanford University']
+    assert parsed.work[0].company == 'Acme'
+    assert parsed.level_of_experience == 'Mid-Senior'
+
+
+def test_bytes_json_and_pickle_round_trips():
+    parsed = ParsedResume.from_resume_info(RESUME_INFO)
+    assert ParsedResume.from_bytes(parsed.to_bytes()) == parsed
+    assert ParsedResume.from_json(parsed.to_json()) == parsed
+    assert pickle.loads(pickle.dumps(parsed)) == parsed
+    assert parsed.to_dict()['schema_version'] == SCHEMA_VERSION
+
+
+def test_records_have_no_instance_dict():
+    parsed = ParsedResume.from_resume_info(RESUME_INFO)
+    assert not hasattr(parsed, '__dict__')
+    assert not hasattr(parsed.contact, '__dict__')
+
+
+def test_skills_outside_the_taxonomy_stay_names():
+    parsed = ParsedResume.from_resume_info(RESUME_INFO)
+    assert 'Quantum Basket Weaving' in parsed.skill_keys
+    assert all(isinstance(key, int) for key in parsed.skill_keys if key != 'Quantum Basket Weaving')
+    assert ParsedResume.from_bytes(parsed.to_bytes()).skill_keys == parsed.skill_keys
@@ -0,0 +1,25 @@
+"""Runs the backtracking check of benchmarks/bench_regex.py for every guarded pattern."""
+
+import pytest
+
+from benchmarks.bench_regex import registered_patterns, worst_case
+from utils.regex_guard import JOB_TITLE
+
+PATTERNS = registered_patterns()
+
+
+@pytest.mark.parametrize('name', sorted(PATTERNS))
+def test_pattern_within_budget(name):
+    pattern = PATTERNS[name]
+    worst_time, worst_input = worst_case(pattern)
+    assert worst_time <= pattern.timeout, \
+        f"{name} took {worst_time * 1000:.0f} ms on {worst_input} (budget {pattern.timeout * 1000:.0f} ms)"
+
+
+@pytest.mark.parametrize('text, title', [
+    ('Senior Software Engineer at Google\n2019 - Present', 'Senior Software Engineer'),
+    ('Acme Corp\nProduct Manager 2018', 'Product Manager'),
+    ('Chief Architect', 'Chief Architect'),
+])
+def test_job_title(text, title):
+    assert JOB_TITLE.search(text).group(1) == title
@@ -0,0 +1,42 @@
+import sqlite3
+
+import pytest
+
+from utils import rescoring
+from utils.parsed_resume import Contact, ParsedResume
+
+
+@pytest.fixture
+def db_path(tmp_path, monkeypatch):
+    monkeypatch.setattr(rescoring.time, 'sleep', lambda seconds: None)
+    path = str(tmp_path / 'user_pdfs.db')
+    parsed = ParsedResume(first_name='Jane', contact=Contact(email='jane@example.com')).to_bytes()
+    with sqlite3.connect(path) as conn:
+        conn.execute('''
+            CREATE TABLE candidates (
+                id INTEGER PRIMARY KEY AUTOINCREMENT, first_name TEXT, last_name TEXT, email TEXT, phone TEXT,
+                skills TEXT, experience_years INTEGER DEFAULT 0, education TEXT, resume_score INTEGER DEFAULT 0,
+                parsed_resume BLOB, page_hashes TEXT, score_edited INTEGER DEFAULT 0
+            )
+        ''')
+        conn.executemany('INSERT INTO candidates (first_name, resume_score, parsed_resume, score_edited) '
+                         'VALUES (?, ?, ?, ?)',
+                         [('Parsed', 1, parsed, 0), ('Edited', 1, parsed, 1), ('By hand', 1, None, 0)])
+    conn.close()
+    return path
+
+
+def scores(db_path):
+    with sqlite3.connect(db_path) as conn:
+        rows = dict(conn.execute('SELECT first_name, resume_score FROM candidates'))
+    conn.close()
+    return rows
+
+
+def test_rescoring_keeps_scores_entered_by_hand(db_path):
+    job = rescoring.RescoreJob(db_path)
+    job.rescore()
+    after = scores(db_path)
+    assert after['Parsed'] != 1
+    assert after['Edited'] == 1 and after['By hand'] == 1
+    assert (job.total, job.processed, job.updated, job.skipped, job.kept) == (2, 2, 1, 1, 1)
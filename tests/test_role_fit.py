@@ -0,0 +1,33 @@
+from utils.role_fit import RoleFitIndex, display_role
+
+
+class Taxonomy:
+    def id_of(self, skill):
+        return None
+
+
+ROLES = {'data scientist': ['Python', 'SQL', 'Statistics'], 'ai engineer': ['Python', 'PyTorch'],
+         'chef': ['Cooking', 'Baking']}
+
+
+def test_top_roles_leaves_out_unmatched_roles():
+    index = RoleFitIndex(ROLES, Taxonomy())
+    fits = index.top_roles(['python', 'pytorch'], k=5)
+    assert [fit.role for fit in fits] == ['ai engineer', 'data scientist']
+    assert fits[0].fit == 1.0 and fits[0].missing == []
+    assert fits[1].matching == ['Python'] and fits[1].missing == ['SQL', 'Statistics']
+
+
+def test_top_roles_without_matches():
+    assert RoleFitIndex(ROLES, Taxonomy()).top_roles(['knitting']) == []
+
+
+def test_top_roles_partitions_matched_roles():
+    fits = RoleFitIndex(ROLES, Taxonomy()).top_roles(['python', 'sql', 'pytorch'], k=1)
+    assert [fit.role for fit in fits] == ['ai engineer']
+
+
+def test_display_role_keeps_acronyms():
+    assert display_role('ar/vr ux designer') == 'AR/VR UX Designer'
+    assert display_role('ai engineer') == 'AI Engineer'
+    assert display_role('e-commerce manager') == 'E-Commerce Manager'
@@ -0,0 +1,40 @@
+from datetime import datetime
+
+from dateutil.relativedelta import relativedelta
+
+from utils.dates import calculate_duration, parse_date
+from utils.parsed_resume import ParsedResume, WorkEntry
+from utils.scoring import FEATURES, get_scoring_engine, resume_features, total_score
+
+
+def test_calculate_duration_of_ongoing_job():
+    start = datetime.now() - relativedelta(years=10)
+    assert calculate_duration(start, parse_date('Present')) == "10 years"
+
+
+def test_calculate_duration_without_start():
+    assert calculate_duration(None, parse_date('Present')) == ""
+
+
+def test_ongoing_job_counts_towards_experience():
+    start = (datetime.now() - relativedelta(years=10)).strftime('%B %Y')
+    entry = WorkEntry(position='Engineer', start_date=start, end_date='Present',
+                      duration=calculate_duration(parse_date(start), parse_date('Present')))
+    features = resume_features(ParsedResume(work=[entry]))
+    assert 9.9 < features[FEATURES.index('experience_years')] <= 10
+
+
+def test_stored_ongoing_job_without_duration_is_dated():
+    # Records parsed before the fix have no duration for their current job
+    start = (datetime.now() - relativedelta(years=10)).strftime('%B %Y')
+    entry = WorkEntry(position='Engineer', start_date=start, end_date='Present')
+    features = resume_features(ParsedResume(work=[entry]))
+    assert features[FEATURES.index('experience_years')] >= 9.9
+
+
+def test_totals_match_component_sums():
+    engine = get_scoring_engine()
+    rows = [resume_features(ParsedResume()), (1, 1, 1, 40, 12, 6, 4, 3, 1)]
+    totals = engine.totals(rows)
+    assert totals.tolist() == [total_score(engine.score(row)) for row in rows]
+    assert totals[1] == 100
@@ -0,0 +1,30 @@
+from utils.text_normalizer import BULLET, normalize_text
+
+
+def test_ligatures_and_bullets():
+    normalized = normalize_text("● Oﬃce work")
+    assert normalized.text == f"{BULLET} Office work"
+
+
+def test_offsets_map_back_to_raw_text():
+    raw = "eﬃcient soft-\nware\r\nte\u200bam"
+    normalized = normalize_text(raw)
+    assert normalized.text == "efficient software\nteam"
+    assert len(normalized.offsets) == len(normalized.text) + 1
+    for word in ('efficient', 'software', 'team'):
+        start = normalized.text.index(word)
+        raw_start, raw_end = normalized.raw_span(start, start + len(word))
+        assert normalize_text(raw[raw_start:raw_end]).text == word
+    assert normalized.raw_offset(len(normalized.text)) == len(raw)
+
+
+def test_unchanged_text_has_identity_offsets():
+    normalized = normalize_text("plain text")
+    assert normalized.text == "plain text"
+    assert normalized.offsets.tolist() == list(range(11))
+
+
+def test_split_at_raw_page_starts():
+    pages = ["first ﬁle\r\n", "second page"]
+    normalized = normalize_text(''.join(pages))
+    assert normalized.split([0, len(pages[0])]) == ["first file\n", "second page"]
@@ -0,0 +1,181 @@
+"""
+Offline asset manager.
+
+Models and data files the parser needs are listed in data/assets.json with
+their SHA-256 checksums. They are verified once per process at startup,
+and a missing or modified asset stops the app with a message saying what
+to install or restore. Nothing here touches the network: models are
+installed (or vendored under models/) at build time, never on request.
+
+Verify with:           python -m utils.assets
+Refresh checksums:     python -m utils.assets --update
+"""
+
+import hashlib
+import json
+import os
+import sys
+import threading
+from pathlib import Path
+
+MANIFEST_FILE = 'data/assets.json'
+# Bump whenever the manifest layout changes
+MANIFEST_VERSION = 1
+
+
+class AssetError(RuntimeError):
+    """A required model or data file is missing, modified or the wrong version"""
+
+
+def load_manifest(file_path=MANIFEST_FILE):
+    try:
+        with open(file_path, 'r', encoding='utf-8') as file:
+            manifest = json.load(file)
+    except (OSError, ValueError) as e:
+        raise AssetError(f"Asset manifest {file_path} could not be read: {e}")
+    if manifest.get('version') != MANIFEST_VERSION:
+        raise AssetError(f"Asset manifest {file_path} has version {manifest.get('version')}, "
+                         f"expected {MANIFEST_VERSION}")
+    return manifest['assets']
+
+
+def checksum(path):
+    """SHA-256 of a file, or of every file of a directory with its relative path"""
+    path = Path(path)
+    digest = hashlib.sha256()
+    if path.is_file():
+        files = [path]
+    else:
+        files = sorted(p for p in path.rglob('*') if p.is_file() and '__pycache__' not in p.parts)
+    for file_path in files:
+        if path.is_dir():
+            digest.update(file_path.relative_to(path).as_posix().encode('utf-8') + b'\0')
+        with open(file_path, 'rb') as file:
+            for block in iter(lambda: file.read(1 << 20), b''):
+                digest.update(block)
+    return digest.hexdigest()
+
+
+def _installed_model_dir(package):
+    """Data directory of a spaCy model installed as a package, or None (no spaCy import needed)"""
+    from importlib.util import find_spec
+
+    spec = find_spec(package)
+    if spec is None or not spec.submodule_search_locations:
+        return None
+    package_dir = Path(next(iter(spec.submodule_search_locations)))
+    # Model packages keep config.cfg in a "<name>-<version>" subdirectory
+    for config in sorted(package_dir.glob('*/config.cfg')):
+        return config.parent
+    return package_dir if (package_dir / 'config.cfg').is_file() else None
+
+
+def resolve(asset):
+    """Return the path an asset is read from: the vendored path, else the installed package"""
+    if os.path.exists(asset['path']):
+        return Path(asset['path'])
+    if asset.get('package'):
+        return _installed_model_dir(asset['package'])
+    return None
+
+
+def _check_version(name, asset, path):
+    if not asset.get('version'):
+        return None
+    from packaging.specifiers import SpecifierSet
+
+    with open(path / 'meta.json', 'r', encoding='utf-8') as file:
+        version = json.load(file).get('version', '')
+    if version not in SpecifierSet(asset['version']):
+        return f"{name}: version {version} found at {path}, {asset['version']} required"
+    return None
+
+
+def verify_assets(manifest=None):
+    """Return a list of problems, one line per missing, modified or wrong-version asset"""
+    manifest = load_manifest() if manifest is None else manifest
+    problems = []
+    for name, asset in manifest.items():
+        path = resolve(asset)
+        if path is None:
+            hint = f" ({asset['install']})" if asset.get('install') else ''
+            problems.append(f"{name}: not found at {asset['path']}{hint}")
+            continue
+        if asset['kind'] == 'spacy_model':
+            problem = _check_version(name, asset, path)
+            if problem:
+                problems.append(problem)
+                continue
+        # Installed packages are checked by version; only vendored copies have a pinned checksum
+        if asset.get('sha256') and path == Path(asset['path']) and checksum(path) != asset['sha256']:
+            problems.append(f"{name}: checksum mismatch for {path}, restore it or run "
+                            f"python -m utils.assets --update")
+    return problems
+
+
+_verified = False
+
+
+def require_assets():
+    """Verify every asset once per process, raising AssetError listing all problems"""
+    global _verified
+    if not _verified:
+        problems = verify_assets()
+        if problems:
+            raise AssetError("Required assets are missing or invalid:\n" + "\n".join(f"- {p}" for p in problems))
+        _verified = True
+
+
+_models = {}
+_models_lock = threading.Lock()
+
+
+def load_spacy_model(name):
+    """Load a spaCy model listed in the manifest, shared by every caller in the process"""
+    model = _models.get(name)
+    if model is None:
+        # A page that needs a model the warmup is loading waits for that copy instead of loading its own
+        with _models_lock:
+            model = _models.get(name)
+            if model is None:
+                model = _models[name] = _load_spacy_model(name)
+    return model
+
+
+def _load_spacy_model(name):
+    asset = load_manifest().get(name)
+    if asset is None or asset['kind'] != 'spacy_model':
+        raise AssetError(f"'{name}' is not a spaCy model in {MANIFEST_FILE}")
+    path = resolve(asset)
+    if path is None:
+        hint = f" Install it at build time with: {asset['install']}" if asset.get('install') else ''
+        raise AssetError(f"spaCy model '{name}' not found at {asset['path']}.{hint}")
+    import spacy
+
+    return spacy.load(path)
+
+
+def update_manifest(file_path=MANIFEST_FILE):
+    """Recompute the checksums of every vendored asset present on disk"""
+    with open(file_path, 'r', encoding='utf-8') as file:
+        manifest = json.load(file)
+    for name, asset in manifest['assets'].items():
+        if os.path.exists(asset['path']):
+            asset['sha256'] = checksum(asset['path'])
+            print(f"{name}: {asset['sha256']}")
+        else:
+            print(f"{name}: not vendored at {asset['path']}, checksum left unchanged")
+    with open(file_path, 'w', encoding='utf-8') as file:
+        json.dump(manifest, file, indent=2)
+        file.write('\n')
+
+
+if __name__ == '__main__':
+    # Run from the project root so the manifest paths resolve
+    os.chdir(Path(__file__).resolve().parent.parent)
+    if '--update' in sys.argv[1:]:
+        update_manifest()
+    else:
+        problems = verify_assets()
+        print("\n".join(problems) if problems else "All assets verified")
+        sys.exit(1 if problems else 0)
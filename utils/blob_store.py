@@ -0,0 +1,200 @@
+"""
+Content-addressed store for uploaded resumes.
+
+Each PDF is written once, under its SHA-256, to a file sharded by the first
+two bytes of the hash (data/blobs/ab/cd/abcd....pdf). The blobs table of
+data/user_pdfs.db keeps its size, page count and a reference count, and
+user_uploaded_pdfs rows keep only the hash. Uploading the same resume again
+adds a reference instead of a second copy, the database stays small enough
+to list quickly, and downloads read the file instead of a BLOB column.
+"""
+
+import os
+import shutil
+import sqlite3
+from pathlib import Path
+
+from utils.uploads import Upload
+
+DB_PATH = 'data/user_pdfs.db'
+BLOB_DIR = 'data/blobs'
+
+_UPLOADS_COLUMNS = '''(
+    id INTEGER PRIMARY KEY,
+    name TEXT NOT NULL,
+    blob_hash TEXT NOT NULL REFERENCES blobs (hash),
+    archived INTEGER DEFAULT 0
+)'''
+
+
+def blob_path(blob_hash):
+    return Path(BLOB_DIR) / blob_hash[:2] / blob_hash[2:4] / f"{blob_hash}.pdf"
+
+
+def _page_count(upload):
+    try:
+        with upload.open_pdf() as doc:
+            return doc.page_count
+    except Exception:
+        return 0
+
+
+def _write_blob(upload):
+    path = blob_path(upload.content_hash)
+    path.parent.mkdir(parents=True, exist_ok=True)
+    # Always written, under a temporary name first so a reader never sees a partial
+    # file: skipping it when the file exists would race with remove_unreferenced
+    tmp_path = path.with_suffix(f".{os.getpid()}.tmp")
+    if upload.path is not None:
+        shutil.copyfile(upload.path, tmp_path)
+    else:
+        with open(tmp_path, 'wb') as file:
+            file.write(upload.data)
+    os.replace(tmp_path, path)
+
+
+def create_tables(conn):
+    """Create the blobs and uploads tables, moving the PDFs of an older uploads table into the store"""
+    conn.execute('''
+        CREATE TABLE IF NOT EXISTS blobs (
+            hash TEXT PRIMARY KEY,
+            size INTEGER NOT NULL,
+            page_count INTEGER NOT NULL,
+            refcount INTEGER NOT NULL
+        )
+    ''')
+    if 'data' in _columns(conn, 'user_uploaded_pdfs'):
+        _migrate_uploads(conn)
+    elif _columns(conn, 'user_uploaded_pdfs_old'):
+        # Left behind by a migration that was interrupted before it ran in one transaction
+        _migrate_uploads(conn, renamed=True)
+    conn.execute(f"CREATE TABLE IF NOT EXISTS user_uploaded_pdfs {_UPLOADS_COLUMNS}")
+    conn.commit()
+
+
+def _columns(conn, table):
+    return [row[1] for row in conn.execute(f"PRAGMA table_info({table})")]
+
+
+def _migrate_uploads(conn, renamed=False):
+    """
+    Rebuild a user_uploaded_pdfs table that held the PDF bytes, keeping its
+    IDs, in one transaction. With renamed, the old rows are those of a
+    user_uploaded_pdfs_old table an interrupted migration left behind; they
+    join any uploaded since, under new IDs where theirs are taken.
+    """
+    blob_hashes = []
+    conn.execute("BEGIN IMMEDIATE")
+    try:
+        with conn:
+            if not renamed:
+                conn.execute("ALTER TABLE user_uploaded_pdfs RENAME TO user_uploaded_pdfs_old")
+            conn.execute(f"CREATE TABLE IF NOT EXISTS user_uploaded_pdfs {_UPLOADS_COLUMNS}")
+            archived = 'archived' if 'archived' in _columns(conn, 'user_uploaded_pdfs_old') else '0'
+            rows = conn.execute(f"SELECT id, name, data, {archived} FROM user_uploaded_pdfs_old").fetchall()
+            for pdf_id, name, data, is_archived in rows:
+                blob_hashes.append(put_blob(conn, data))
+                taken = conn.execute("SELECT 1 FROM user_uploaded_pdfs WHERE id = ?", (pdf_id,)).fetchone()
+                conn.execute("INSERT INTO user_uploaded_pdfs (id, name, blob_hash, archived) VALUES (?, ?, ?, ?)",
+                             (None if taken else pdf_id, name, blob_hashes[-1], is_archived or 0))
+            conn.execute("DROP TABLE user_uploaded_pdfs_old")
+    except Exception:
+        # The files were written for rows that were rolled back
+        remove_unreferenced(conn, blob_hashes)
+        raise
+    # Give the space of the old BLOBs back to the file system
+    conn.execute("VACUUM")
+
+
+def put_blob(conn, upload):
+    """
+    Store an Upload (or PDF bytes), or add a reference to the copy already
+    stored, and return its hash. The Upload's hash is reused and a spooled
+    upload is copied from its file. Runs in the caller's transaction, and
+    writes the file after the row, so the write lock is held until the row
+    is committed; a caller whose transaction rolls back passes the hash to
+    remove_unreferenced.
+    """
+    if not isinstance(upload, Upload):
+        upload = Upload('blob.pdf', upload)
+    blob_hash = upload.content_hash
+    updated = conn.execute("UPDATE blobs SET refcount = refcount + 1 WHERE hash = ?", (blob_hash,)).rowcount
+    if not updated:
+        conn.execute("INSERT INTO blobs (hash, size, page_count, refcount) VALUES (?, ?, ?, 1)",
+                     (blob_hash, upload.size, _page_count(upload)))
+    _write_blob(upload)
+    return blob_hash
+
+
+def release_blob(conn, blob_hash):
+    """
+    Drop one reference to a blob in the caller's transaction. Returns True when
+    it was the last one; the caller then calls remove_unreferenced after committing.
+    """
+    conn.execute("UPDATE blobs SET refcount = refcount - 1 WHERE hash = ?", (blob_hash,))
+    return conn.execute("DELETE FROM blobs WHERE hash = ? AND refcount <= 0", (blob_hash,)).rowcount > 0
+
+
+def remove_unreferenced(conn, blob_hashes):
+    """
+    Delete the files of blobs that have no row, once their last reference was
+    released and committed or the transaction adding them rolled back. Holds
+    the write lock, so no put_blob is between writing a file and committing its row.
+    """
+    if not blob_hashes:
+        return
+    conn.execute("BEGIN IMMEDIATE")
+    with conn:
+        for blob_hash in blob_hashes:
+            # Skip blobs uploaded again since they were released
+            if conn.execute("SELECT 1 FROM blobs WHERE hash = ?", (blob_hash,)).fetchone() is None:
+                blob_path(blob_hash).unlink(missing_ok=True)
+
+
+def read_blob(blob_hash):
+    with open(blob_path(blob_hash), 'rb') as file:
+        return file.read()
+
+
+# ----------------------------------Uploads---------------------------------------
+def connect(db_path=DB_PATH):
+    conn = sqlite3.connect(db_path)
+    create_tables(conn)
+    return conn
+
+
+def add_upload(conn, name, upload):
+    """Record an uploaded PDF (an Upload or bytes), storing it once however many times it is uploaded"""
+    if not isinstance(upload, Upload):
+        upload = Upload(name, upload)
+    try:
+        with conn:
+            blob_hash = put_blob(conn, upload)
+            return conn.execute("INSERT INTO user_uploaded_pdfs (name, blob_hash) VALUES (?, ?)",
+                                (name, blob_hash)).lastrowid
+    except Exception:
+        # The file may have been written for a row that was rolled back
+        try:
+            remove_unreferenced(conn, [upload.content_hash])
+        except sqlite3.Error as e:
+            print(f"Error removing blob of a failed upload: {str(e)}")
+        raise
+
+
+def delete_uploads(conn, upload_ids):
+    """Delete uploads and the files no other upload refers to"""
+    released = []
+    with conn:
+        for upload_id in upload_ids:
+            row = conn.execute("SELECT blob_hash FROM user_uploaded_pdfs WHERE id = ?", (upload_id,)).fetchone()
+            if row is None:
+                continue
+            conn.execute("DELETE FROM user_uploaded_pdfs WHERE id = ?", (upload_id,))
+            if release_blob(conn, row[0]):
+                released.append(row[0])
+    remove_unreferenced(conn, released)
+
+
+def storage_used(conn):
+    """Bytes on disk of every stored PDF, counting shared ones once"""
+    return conn.execute("SELECT COALESCE(SUM(size), 0) FROM blobs").fetchone()[0]
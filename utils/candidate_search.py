@@ -0,0 +1,108 @@
+"""
+Full-text search over the candidates table.
+
+candidates_fts is an FTS5 index over the name, email, skills and education
+columns of candidates. It is an external-content table, so it stores only
+the index, and triggers keep it in step with every insert, delete and
+change to those columns. Searches are token matches ranked by bm25(),
+instead of LIKE '%term%' scans of the whole table: "java" no longer
+matches "javascript", names and emails match as prefixes of what was
+typed, and a trailing * makes any term a prefix.
+"""
+
+# Indexed columns, in the order of the bm25() weights
+FTS_COLUMNS = ('first_name', 'last_name', 'email', 'skills', 'education')
+# A match in a name counts for most, one in the education text for least
+BM25_WEIGHTS = (10.0, 10.0, 5.0, 3.0, 1.0)
+RANK = f"bm25(candidates_fts, {', '.join(str(weight) for weight in BM25_WEIGHTS)})"
+
+_NEW = ', '.join(f'new.{column}' for column in FTS_COLUMNS)
+_OLD = ', '.join(f'old.{column}' for column in FTS_COLUMNS)
+_COLUMNS = ', '.join(FTS_COLUMNS)
+
+_TRIGGERS = (
+    f'''CREATE TRIGGER IF NOT EXISTS candidates_fts_insert AFTER INSERT ON candidates BEGIN
+        INSERT INTO candidates_fts (rowid, {_COLUMNS}) VALUES (new.id, {_NEW});
+    END''',
+    f'''CREATE TRIGGER IF NOT EXISTS candidates_fts_delete AFTER DELETE ON candidates BEGIN
+        INSERT INTO candidates_fts (candidates_fts, rowid, {_COLUMNS}) VALUES ('delete', old.id, {_OLD});
+    END''',
+    # Only changes to indexed columns fire it, so re-scoring and shortlisting leave the index alone
+    f'''CREATE TRIGGER IF NOT EXISTS candidates_fts_update AFTER UPDATE OF {_COLUMNS} ON candidates BEGIN
+        INSERT INTO candidates_fts (candidates_fts, rowid, {_COLUMNS}) VALUES ('delete', old.id, {_OLD});
+        INSERT INTO candidates_fts (rowid, {_COLUMNS}) VALUES (new.id, {_NEW});
+    END''',
+)
+
+
+def create_search_index(cursor):
+    """Create the index and its triggers, indexing the existing candidates when the index is new"""
+    exists = cursor.execute(
+        "SELECT 1 FROM sqlite_master WHERE type = 'table' AND name = 'candidates_fts'").fetchone()
+    # '+' and '#' are part of tokens, so C++ and C# are not just "c"
+    cursor.execute(f'''
+        CREATE VIRTUAL TABLE IF NOT EXISTS candidates_fts USING fts5(
+            {_COLUMNS},
+            content='candidates', content_rowid='id',
+            tokenize="unicode61 tokenchars '+#'"
+        )
+    ''')
+    for trigger in _TRIGGERS:
+        cursor.execute(trigger)
+    if not exists:
+        cursor.execute("INSERT INTO candidates_fts (candidates_fts) VALUES ('rebuild')")
+
+
+def phrase(text, prefix=False):
+    """An FTS5 phrase for text, matching its tokens in order; with prefix, the last one may be a prefix"""
+    return '"' + text.replace('"', '""') + '"' + ('*' if prefix else '')
+
+
+def _term_query(term, category, taxonomy):
+    prefix = term.endswith('*')
+    term = term.rstrip('*').strip()
+    if not term:
+        return None
+    skill_phrases = [phrase(term, prefix)]
+    # Skills are stored under their canonical names, so "js" has to find "JavaScript"
+    canonical = taxonomy.canonical(term)
+    if canonical.lower() != term.lower():
+        skill_phrases.append(phrase(canonical))
+    skills = f"skills : ({' OR '.join(skill_phrases)})"
+
+    if category == 'Skills':
+        return skills
+    if category == 'Name':
+        return f"{{first_name last_name}} : {phrase(term, True)}"
+    if category == 'Email':
+        return f"email : {phrase(term, True)}"
+    return (f"{{first_name last_name email}} : {phrase(term, True)} OR {skills}"
+            f" OR education : {phrase(term, prefix)}")
+
+
+def match_expression(query, category, taxonomy):
+    """
+    FTS5 MATCH expression for a comma-separated search, any term matching,
+    or None when there is nothing to search for.
+    """
+    terms = [_term_query(term.strip(), category, taxonomy) for term in query.split(',')]
+    terms = [f"({term})" for term in terms if term]
+    return ' OR '.join(terms) or None
+
+
+def search(cursor, query, category, taxonomy, filters='', params=()):
+    """
+    Run a search and return the matching candidates rows, most relevant
+    first. filters is extra SQL on the candidates table (aliased c), ANDed
+    with the match.
+    """
+    expression = match_expression(query, category, taxonomy)
+    if expression is None:
+        return []
+    cursor.execute(f'''
+        SELECT c.* FROM candidates_fts
+        JOIN candidates c ON c.id = candidates_fts.rowid
+        WHERE candidates_fts MATCH ? {f'AND {filters}' if filters else ''}
+        ORDER BY {RANK}
+    ''', (expression, *params))
+    return cursor.fetchall()
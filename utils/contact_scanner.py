@@ -0,0 +1,82 @@
+"""
+Single-pass contact scanner.
+
+Finds email addresses, phone numbers and LinkedIn, GitHub and portfolio
+URLs with one precompiled pattern. The header lines at the top of the
+resume are scanned first. Profile URLs are only taken from there: further
+down, links are to employers' products and other people's repositories,
+not the candidate's. The rest of the text is only scanned, picking up
+where the header ended, when the email or phone is still missing.
+"""
+
+import re
+
+from tools import format_phone_number
+from utils.regex_guard import guarded
+
+# Contact details almost always sit in the first few lines of a resume
+HEADER_LINES = 8
+
+CONTACT_FIELDS = ('email', 'phone', 'linkedin', 'github', 'portfolio')
+# The fields also looked for below the header
+BODY_FIELDS = ('email', 'phone')
+
+# Alternatives are ordered so that profile URLs win over the generic URL and
+# email branches, and every repetition is bounded (see utils.regex_guard)
+CONTACT_PATTERN = guarded('contact', r"""
+    (?P<linkedin>(?:https?://)?(?:[a-z]{2,3}\.)?linkedin\.com/(?:in|pub)/[A-Za-z0-9_%-]{1,100}/?)
+  | (?P<github>(?:https?://)?(?:www\.)?github\.com/[A-Za-z0-9-]{1,39}/?(?![\w/-]))
+  | (?P<email>\b[A-Za-z0-9._%+-]{1,64}@[A-Za-z0-9.-]{1,255}\.[A-Za-z]{2,24}\b)
+  | (?P<portfolio>(?:https?://|\bwww\.)[^\s<>"'(),]{3,200})
+  | (?P<phone>(?<![\w+])(?:\+\d{1,3}\s\d{1,4}\s\d{6,10}
+                          |(?:\+?\d{1,3}[-.\s]?)?\(?\d{3}\)?[-.\s]?\d{3}[-.\s]?\d{4})\b)
+""", re.IGNORECASE | re.VERBOSE)
+
+
+def _header_end(text, header_lines):
+    """Offset of the end of the first header_lines non-blank lines"""
+    end = 0
+    for line in text.splitlines(keepends=True):
+        end += len(line)
+        if line.strip():
+            header_lines -= 1
+            if header_lines == 0:
+                break
+    return end
+
+
+def scan_contacts(text, header_lines=HEADER_LINES):
+    """
+    Return the first email, phone, LinkedIn, GitHub and portfolio URL in text.
+
+    Each field is either None or a dict with the matched 'value' and its
+    'start'/'end' character offsets in text. Phones also carry the 'raw'
+    match; their 'value' is normalized with tools.format_phone_number.
+    """
+    contacts = dict.fromkeys(CONTACT_FIELDS)
+    if not text:
+        return contacts
+
+    header_end = _header_end(text, header_lines)
+    for pos, endpos, fields in ((0, header_end, CONTACT_FIELDS), (header_end, len(text), BODY_FIELDS)):
+        if all(contacts[field] for field in fields):
+            continue
+        for match in CONTACT_PATTERN.finditer(text, pos, endpos):
+            field = match.lastgroup
+            if field not in fields or contacts[field] is not None:
+                continue
+            raw = match.group(field)
+            contacts[field] = {
+                'value': format_phone_number(raw) if field == 'phone' else raw.rstrip('/.'),
+                'start': match.start(),
+                'end': match.end()
+            }
+            if field == 'phone':
+                contacts[field]['raw'] = raw
+    return contacts
+
+
+def contact_values(text, header_lines=HEADER_LINES):
+    """Return scan_contacts results as plain strings, '' for missing fields"""
+    return {field: found['value'] if found else ''
+            for field, found in scan_contacts(text, header_lines).items()}
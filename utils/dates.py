@@ -0,0 +1,53 @@
+"""
+Dates of work experience entries.
+
+parse_date reads the free-form dates found in resumes, and
+calculate_duration turns a start and end date into the "2 years, 3 months"
+duration stored on a WorkEntry. They are used by both the parser and the
+scoring engine, so they live here rather than in resume_parser.
+"""
+
+from datetime import datetime
+
+# dateparser is imported on first use, not at import time
+
+
+def parse_date(date_str):
+    """
+    Parse dates in various formats and return a datetime object, or
+    'Present' for ongoing jobs. Returns None if parsing fails.
+    """
+    if not date_str or date_str.lower() in ['present', 'current', 'now', 'today']:
+        return 'Present'
+
+    # Try to parse with dateparser which handles many formats
+    try:
+        import dateparser
+
+        parsed_date = dateparser.parse(date_str.strip())
+        if parsed_date:
+            return parsed_date
+    except:
+        pass
+
+    return None
+
+
+def calculate_duration(start_date, end_date):
+    """Calculate duration between two dates in months and years"""
+    # parse_date returns 'Present' for ongoing jobs, so it is resolved before the type check
+    if end_date == 'Present':
+        end_date = datetime.now()
+    if not isinstance(start_date, datetime) or not isinstance(end_date, datetime):
+        return ""
+
+    delta_months = max((end_date.year - start_date.year) * 12 + (end_date.month - start_date.month), 0)
+    years = delta_months // 12
+    months = delta_months % 12
+
+    if years > 0 and months > 0:
+        return f"{years} year{'s' if years > 1 else ''}, {months} month{'s' if months > 1 else ''}"
+    elif years > 0:
+        return f"{years} year{'s' if years > 1 else ''}"
+    else:
+        return f"{months} month{'s' if months > 1 else ''}"
@@ -0,0 +1,228 @@
+"""
+Page-level cache of processed spaCy Docs.
+
+Each page of a resume is stored as a DocBin blob (tokens, lemmas, POS tags,
+dependencies and entities) keyed by the hash of its text and the pipeline
+that produced it. A revised resume that changes a line or two shares most
+of its page hashes with the previous version, so only the changed pages go
+through the neural models; the page Docs, which only need the vocabulary
+to deserialize, are then joined into one Doc for the extractors. The skill
+entities the skills NER model finds on a page are stored with it, so that
+model too only runs over the changed pages.
+
+A stored candidate keeps the page hashes of its resume, and its pages are
+pinned under an owner key (pin_pages), so that load_pages can give back the
+Doc and the rule-based extractors and scoring can be re-run over it
+without either model (see resume_parser.reanalyze_resume). Other pages are
+bounded in size by the doc_cache_mb setting: once over it, the unpinned
+pages used least recently are dropped, including those of older
+pipelines, which are never read.
+"""
+
+import hashlib
+import sqlite3
+from contextlib import contextmanager
+from datetime import datetime
+
+from utils.settings_manager import SettingsManager
+
+CACHE_DB = 'data/doc_cache.db'
+
+
+def text_hash(text):
+    """Return the cache key of a text"""
+    return hashlib.sha256(text.encode('utf-8')).hexdigest()
+
+
+def pipeline_id(nlp):
+    """Identify the pipeline, so Docs from another model version are never reused"""
+    return f"{nlp.meta.get('lang', '')}_{nlp.meta.get('name', '')}-{nlp.meta.get('version', '')}"
+
+
+def max_cache_bytes():
+    return SettingsManager().get_setting('parser', 'doc_cache_mb') * 1024 * 1024
+
+
+def _now():
+    return datetime.now().strftime('%Y-%m-%d %H:%M:%S')
+
+
+@contextmanager
+def _connect(db_path):
+    conn = sqlite3.connect(db_path)
+    try:
+        conn.execute('''
+            CREATE TABLE IF NOT EXISTS doc_cache (
+                text_hash TEXT NOT NULL,
+                pipeline TEXT NOT NULL,
+                doc_bin BLOB NOT NULL,
+                created_at TEXT,
+                used_at TEXT,
+                PRIMARY KEY (text_hash, pipeline)
+            )
+        ''')
+        # Caches created before pages were evicted have no used_at column
+        if 'used_at' not in [row[1] for row in conn.execute("PRAGMA table_info(doc_cache)")]:
+            conn.execute("ALTER TABLE doc_cache ADD COLUMN used_at TEXT")
+            conn.execute("UPDATE doc_cache SET used_at = created_at")
+        # Pages that something stored (a candidate) refers to, exempt from eviction
+        conn.execute('''
+            CREATE TABLE IF NOT EXISTS doc_refs (
+                owner TEXT NOT NULL,
+                text_hash TEXT NOT NULL,
+                pipeline TEXT NOT NULL,
+                PRIMARY KEY (owner, text_hash, pipeline)
+            )
+        ''')
+        yield conn
+    finally:
+        conn.close()
+
+
+def _load_docs(nlp, text_hashes, db_path, pipeline=None):
+    """{text_hash: Doc} of the given hashes cached for this pipeline, marking them as used"""
+    from spacy.tokens import DocBin
+
+    text_hashes = list(text_hashes)
+    if not text_hashes:
+        return {}
+    placeholders = ', '.join('?' * len(text_hashes))
+    params = [pipeline or pipeline_id(nlp), *text_hashes]
+    docs = {}
+    with _connect(db_path) as conn:
+        rows = conn.execute(f'SELECT text_hash, doc_bin FROM doc_cache WHERE pipeline = ? '
+                            f'AND text_hash IN ({placeholders})', params)
+        for key, blob in rows:
+            doc = next(DocBin(store_user_data=True).from_bytes(blob).get_docs(nlp.vocab), None)
+            if doc is not None:
+                docs[key] = doc
+        if docs:
+            conn.execute(f'UPDATE doc_cache SET used_at = ? WHERE pipeline = ? AND text_hash IN ({placeholders})',
+                         [_now(), *params])
+            conn.commit()
+    return docs
+
+
+def store_docs(docs, nlp, db_path=CACHE_DB, max_bytes=None, pipeline=None):
+    """
+    Store processed Docs, with their user_data, under the hashes of their
+    texts in one transaction, then evict the least recently used pages while
+    the cache is over max_bytes (the doc_cache_mb setting by default).
+    """
+    from spacy.tokens import DocBin
+
+    pipeline = pipeline or pipeline_id(nlp)
+    now = _now()
+    rows = []
+    for doc in docs:
+        doc_bin = DocBin(store_user_data=True)
+        doc_bin.add(doc)
+        rows.append((text_hash(doc.text), pipeline, doc_bin.to_bytes(), now, now))
+    with _connect(db_path) as conn:
+        conn.executemany('INSERT OR REPLACE INTO doc_cache (text_hash, pipeline, doc_bin, created_at, used_at) '
+                         'VALUES (?, ?, ?, ?, ?)', rows)
+        # Keep the pinned pages, and the most recently used others that fit in what is left of max_bytes
+        conn.execute('''
+            WITH pinned AS (
+                SELECT c.rowid AS id, length(c.doc_bin) AS size FROM doc_cache c
+                JOIN doc_refs r ON r.text_hash = c.text_hash AND r.pipeline = c.pipeline
+                GROUP BY c.rowid
+            )
+            DELETE FROM doc_cache WHERE rowid IN (
+                SELECT rowid FROM (
+                    SELECT rowid, SUM(length(doc_bin)) OVER (ORDER BY used_at DESC, rowid DESC) AS kept
+                    FROM doc_cache WHERE rowid NOT IN (SELECT id FROM pinned)
+                ) WHERE kept > ? - (SELECT COALESCE(SUM(size), 0) FROM pinned)
+            )
+        ''', (max_cache_bytes() if max_bytes is None else max_bytes,))
+        conn.commit()
+
+
+def pin_pages(owner, page_hashes, pipeline, db_path=CACHE_DB):
+    """Keep the pages of owner (e.g. 'candidate:12') out of eviction, replacing any it had"""
+    with _connect(db_path) as conn:
+        conn.execute('DELETE FROM doc_refs WHERE owner = ?', (owner,))
+        conn.executemany('INSERT OR IGNORE INTO doc_refs (owner, text_hash, pipeline) VALUES (?, ?, ?)',
+                         [(owner, page_hash, pipeline) for page_hash in page_hashes])
+        conn.commit()
+
+
+def unpin_pages(owner, db_path=CACHE_DB):
+    """Let the pages of owner be evicted again"""
+    with _connect(db_path) as conn:
+        conn.execute('DELETE FROM doc_refs WHERE owner = ?', (owner,))
+        conn.commit()
+
+
+def cache_pipeline(nlp, skills_pipeline=''):
+    """Pipeline key of pages parsed by nlp, with the skill entities of skills_pipeline when given"""
+    return f"{pipeline_id(nlp)}+{skills_pipeline}" if skills_pipeline else pipeline_id(nlp)
+
+
+def join_pages(page_docs, nlp):
+    """
+    Join page Docs into one Doc whose text is the pages' texts joined, with
+    the skill entities of every page, if they have them, in
+    user_data['skill_entities'].
+    """
+    from spacy.tokens import Doc
+
+    non_empty = [doc for doc in page_docs if len(doc)]
+    if not non_empty:
+        doc = nlp(''.join(page.text for page in page_docs))
+    elif len(non_empty) == 1:
+        doc = non_empty[0]
+    else:
+        # The page texts already hold their own whitespace, so the joined text is unchanged
+        doc = Doc.from_docs(non_empty, ensure_whitespace=False, exclude=['user_data'])
+    if all('skill_entities' in page.user_data for page in page_docs):
+        doc.user_data['skill_entities'] = [entity for page in page_docs for entity in page.user_data['skill_entities']]
+    return doc
+
+
+def get_or_parse_pages(texts, nlp, db_path=CACHE_DB, skills=None):
+    """
+    Return (Doc, page hashes, pages reused) for a document given as page
+    texts: pages already in the cache are loaded, only the others go
+    through nlp, and the page Docs are joined into one Doc whose text is
+    ''.join(texts).
+
+    skills, when given, is a (skills pipeline ID, function) pair; the
+    function returns the skill entity texts of each of a list of page texts.
+    It is only called for the pages not in the cache, and the entities of
+    every page end up in the Doc's user_data['skill_entities'].
+    """
+    pipeline = cache_pipeline(nlp, skills[0] if skills else '')
+    page_hashes = [text_hash(text) for text in texts]
+    try:
+        docs = _load_docs(nlp, set(page_hashes), db_path, pipeline)
+    except Exception as e:
+        print(f"Error reading doc cache: {str(e)}")
+        docs = {}
+    reused = sum(page_hash in docs for page_hash in page_hashes)
+
+    changed = {page_hash: text for page_hash, text in zip(page_hashes, texts) if page_hash not in docs}
+    if changed:
+        parsed = list(nlp.pipe(changed.values()))
+        if skills:
+            for page_doc, entities in zip(parsed, skills[1](list(changed.values()))):
+                page_doc.user_data['skill_entities'] = list(entities)
+        docs.update(zip(changed, parsed))
+        try:
+            store_docs(parsed, nlp, db_path, pipeline=pipeline)
+        except Exception as e:
+            print(f"Error writing doc cache: {str(e)}")
+
+    return join_pages([docs[page_hash] for page_hash in page_hashes], nlp), page_hashes, reused
+
+
+def load_pages(page_hashes, nlp, skills_pipeline='', db_path=CACHE_DB):
+    """
+    The Doc of a document from its cached pages, as get_or_parse_pages
+    returned it, without running any model; None when a page is no longer
+    in the cache for this pipeline.
+    """
+    docs = _load_docs(nlp, set(page_hashes), db_path, cache_pipeline(nlp, skills_pipeline))
+    if not page_hashes or any(page_hash not in docs for page_hash in page_hashes):
+        return None
+    return join_pages([docs[page_hash] for page_hash in page_hashes], nlp)
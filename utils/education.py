@@ -0,0 +1,141 @@
+"""
+Education extraction from an institution gazetteer and compiled degree patterns.
+
+Known institution names from data/institutions.csv (read from the lexicon
+artifact) are compiled on first use, the generic "University of X" /
+"X College" shapes once at import. The education section is read in a
+single pass that assembles institution, degree, dates and GPA entries.
+spaCy is only asked about entries that have no recognizable institution,
+and then in one nlp.pipe batch.
+"""
+
+import re
+from functools import lru_cache
+
+from utils.lexicon_artifact import load_lexicons
+from utils.regex_guard import guarded, DEGREE, GPA, EMPLOYMENT_DATES
+from utils.sections import segment_sections, section_lines
+
+# Lines longer than this are descriptions, never a bare institution name
+MAX_CANDIDATE_WORDS = 8
+BULLETS = ('•', '-', '*', '▪', '◦', '●', '–')
+
+_KEYWORD = r"(?i:University|College|Institute|School|Academy|Polytechnic)"
+_NAME_WORD = r"[A-Z][\w&.'-]{0,40}"
+
+
+def compile_institutions(names):
+    """
+    Compile names into one word-bounded pattern, longest first. Names with an
+    acronym in them (MIT, IIT Delhi, Texas A&M) are matched case-sensitively.
+    """
+    exact, folded = [], []
+    for name in sorted(set(names), key=len, reverse=True):
+        has_acronym = any(len(word) > 1 and word.isupper() for word in name.split())
+        (exact if has_acronym else folded).append(re.escape(name))
+    alternatives = []
+    if folded:
+        alternatives.append(f"(?i:{'|'.join(folded)})")
+    if exact:
+        alternatives.append('|'.join(exact))
+    if not alternatives:
+        return guarded('known_institution', r"(?!)")
+    return guarded('known_institution', rf"(?<!\w)(?:{'|'.join(alternatives)})(?!\w)")
+
+
+@lru_cache(maxsize=None)
+def get_known_institution():
+    """The institution gazetteer pattern, compiled once on first use"""
+    return compile_institutions(load_lexicons().institutions)
+
+
+# "University of Toronto", "Indian Institute of Science", "Dartmouth College", ...
+INSTITUTION_NAME = guarded('institution_name',
+                           rf"\b{_KEYWORD}[ \t]{{1,3}}(?i:of)(?:[ \t]{{1,3}}(?:(?i:the|and|for)[ \t]{{1,3}})?"
+                           rf"{_NAME_WORD}){{1,6}}"
+                           rf"|\b(?:{_NAME_WORD}[ \t]{{1,3}}){{1,6}}{_KEYWORD}\b")
+
+
+def find_institution(line):
+    """Return the match for the institution named in line, preferring known names"""
+    return get_known_institution().search(line) or INSTITUTION_NAME.search(line)
+
+
+def _new_entry(entries, candidate):
+    entry = {'institution': '', 'degree': '', 'dates': '', 'gpa': '', 'candidate': candidate}
+    entries.append(entry)
+    return entry
+
+
+def _degree_text(line, degree, cut_points):
+    """Return the degree phrase, cut short where dates or the institution begin"""
+    end = degree.end()
+    for match in cut_points:
+        if match and degree.start() < match.start() < end:
+            end = match.start()
+    return line[degree.start():end].strip(' ,|-–—(')
+
+
+def parse_education(text, nlp=None, batch_size=32):
+    """
+    Return education entries as dicts with 'institution', 'degree', 'dates'
+    and 'gpa'. Only the education section is read; without one, lines naming
+    a degree or an institution anywhere in the text are used. When nlp is
+    given, short lines of entries without a recognizable institution are
+    confirmed as ORG entities in a single batch.
+    """
+    lines = section_lines(segment_sections(text), 'education')
+    in_section = bool(lines)
+    if not in_section:
+        lines = text.splitlines()
+
+    entries = []
+    entry = None
+    pending = ''
+
+    for raw_line in lines:
+        line = raw_line.strip()
+        if not line:
+            continue
+        institution = find_institution(line)
+        degree = DEGREE.search(line)
+        if not in_section and not (institution or degree):
+            continue
+        dates = EMPLOYMENT_DATES.search(line)
+        gpa = GPA.search(line)
+
+        if institution:
+            if entry is None or entry['institution']:
+                entry, pending = _new_entry(entries, pending), ''
+            entry['institution'] = institution.group(0).strip(' ,')
+        if degree:
+            if entry is None or entry['degree']:
+                entry, pending = _new_entry(entries, pending), ''
+            entry['degree'] = _degree_text(line, degree, (dates, gpa, institution))
+
+        # A short line with nothing recognizable may be an institution unknown to the gazetteer
+        is_candidate = not (institution or degree or dates or gpa or line.startswith(BULLETS)
+                            or len(line.split()) > MAX_CANDIDATE_WORDS)
+        if is_candidate:
+            if entry is None or entry['institution']:
+                # Most likely names the institution of the next entry
+                pending = pending or line
+            elif not entry['candidate']:
+                entry['candidate'] = line
+        if entry is None:
+            continue
+        if dates and not entry['dates']:
+            entry['dates'] = '-'.join(filter(None, (dates.group('start'), dates.group('end'))))
+        if gpa and not entry['gpa']:
+            entry['gpa'] = gpa.group(1)
+
+    ambiguous = [entry for entry in entries if not entry['institution'] and entry['candidate']]
+    if ambiguous and nlp is not None:
+        docs = nlp.pipe((entry['candidate'] for entry in ambiguous), batch_size=batch_size)
+        for entry, doc in zip(ambiguous, docs):
+            org = next((ent.text for ent in doc.ents if ent.label_ == 'ORG'), '')
+            entry['institution'] = org.strip()
+
+    for entry in entries:
+        del entry['candidate']
+    return entries
@@ -0,0 +1,42 @@
+"""
+Job-title gazetteer.
+
+Titles from data/position.csv and the larger data/job_titles.csv (both
+read from the lexicon artifact) are compiled, on first use, into a single
+guarded alternation, longest titles first, so that finding the title on a
+line is one search instead of a substring test per hardcoded title.
+"""
+
+import re
+from functools import lru_cache
+
+from utils.lexicon_artifact import load_lexicons
+from utils.regex_guard import guarded
+
+
+def load_titles():
+    """Return the unique job titles of both gazetteer files, from the lexicon artifact"""
+    lexicons = load_lexicons()
+    titles = {}
+    for title in list(lexicons.positions) + lexicons.job_titles:
+        titles.setdefault(title.lower(), title)
+    return list(titles.values())
+
+
+def compile_titles(titles):
+    """Compile titles into one case-insensitive, word-bounded pattern"""
+    if not titles:
+        return guarded('job_title_gazetteer', r"(?!)")
+    alternation = '|'.join(re.escape(title) for title in sorted(titles, key=len, reverse=True))
+    return guarded('job_title_gazetteer', rf"(?<!\w)(?:{alternation})(?!\w)", re.IGNORECASE)
+
+
+@lru_cache(maxsize=None)
+def get_title_pattern():
+    """The gazetteer pattern, compiled once on first use"""
+    return compile_titles(load_titles())
+
+
+def find_title(line):
+    """Return the match for the longest known job title in line, or None"""
+    return get_title_pattern().search(line)
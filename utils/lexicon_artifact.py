@@ -0,0 +1,214 @@
+"""
+Prebuilt binary lexicon artifact.
+
+The lexicon CSVs (the skill taxonomy, majors, positions, suggested skills
+per role, job titles and institutions) are compiled by a build step into one versioned
+file, data/lexicons.bin:
+
+    MAGIC | format version | SHA-256 of payload | msgpack payload
+
+The payload holds the skill taxonomy, the token tries used to match skills
+(by every name and synonym) and majors, the position keyword index and the role -> skills map, plus the SHA-256 of
+each source file. Processes load it with a single read instead of parsing
+CSVs and building the tries on every call; a missing, corrupt or stale
+artifact is rebuilt from the CSVs.
+
+Build it from the project root with: python -m utils.lexicon_artifact
+"""
+
+import csv
+import hashlib
+import os
+import re
+import struct
+import sys
+import threading
+from pathlib import Path
+
+import srsly
+
+from utils.skill_taxonomy import TAXONOMY_FILE, SkillTaxonomy, read_taxonomy
+
+ARTIFACT_PATH = 'data/lexicons.bin'
+MAGIC = b'RPLX'
+# Bump whenever the payload layout changes
+FORMAT_VERSION = 3
+_HEADER = struct.Struct('<4sH32s')
+
+SOURCES = {
+    'skill_taxonomy': TAXONOMY_FILE,
+    'majors': 'data/majors.csv',
+    'positions': 'data/position.csv',
+    'suggested_skills': 'data/suggestedSkills.csv',
+    'job_titles': 'data/job_titles.csv',
+    'institutions': 'data/institutions.csv',
+}
+
+# Tokens keep the characters that make skills distinct (C++, C#, .NET, Node.js)
+TOKEN = re.compile(r"\.?[a-z0-9+#]+(?:\.[a-z0-9+#]+)*")
+
+
+def tokenize(text):
+    """Lowercase word tokens used both to build the tries and to match against them"""
+    return TOKEN.findall(text.lower())
+
+
+# ----------------------------------Build step------------------------------------
+def _read_rows(path, skip_header):
+    with open(path, 'r', encoding='utf-8') as file:
+        rows = [row for row in csv.reader(file) if row and row[0].strip()]
+    return rows[1:] if skip_header else rows
+
+
+def _build_trie(phrases):
+    """Map each phrase's first token to [remaining tokens, value] pairs, longest first"""
+    trie = {}
+    for phrase, value in phrases:
+        tokens = tokenize(phrase)
+        if tokens:
+            trie.setdefault(tokens[0], []).append([tokens[1:], value])
+    for entries in trie.values():
+        entries.sort(key=lambda entry: -len(entry[0]))
+    return trie
+
+
+def source_checksums():
+    """
+    SHA-256 of every source. The CSVs are small enough to hash at startup,
+    and unlike modification times the checksums survive checkouts and copies
+    that touch files without changing them, and catch edits that keep the mtime.
+    """
+    checksums = {}
+    for name, path in SOURCES.items():
+        try:
+            with open(path, 'rb') as file:
+                checksums[name] = hashlib.sha256(file.read()).hexdigest()
+        except OSError:
+            checksums[name] = None
+    return checksums
+
+
+def build_payload():
+    """Parse the source CSVs and compile the lexicon structures"""
+    taxonomy_rows = read_taxonomy(SOURCES['skill_taxonomy'])
+    taxonomy = SkillTaxonomy(taxonomy_rows)
+    majors = _read_rows(SOURCES['majors'], skip_header=True)
+    positions = {row[0]: [keyword.strip().lower() for keyword in row[1].split(',')]
+                 for row in _read_rows(SOURCES['positions'], skip_header=True) if len(row) > 1}
+    role_skills = {row[0].strip().lower(): taxonomy.canonical_list(row[1:])
+                   for row in _read_rows(SOURCES['suggested_skills'], skip_header=False)}
+    job_titles = [row[0].strip() for row in _read_rows(SOURCES['job_titles'], skip_header=True)]
+    institutions = [row[0].strip() for row in _read_rows(SOURCES['institutions'], skip_header=True)]
+
+    return {
+        'sources': source_checksums(),
+        'skill_taxonomy': taxonomy_rows,
+        # Trie values are skill IDs, so every synonym resolves to its skill
+        'skill_trie': _build_trie(taxonomy.aliases()),
+        'majors': [row[0].strip() for row in majors],
+        'major_categories': [row[1].strip() if len(row) > 1 else '' for row in majors],
+        'major_trie': _build_trie((row[0], index) for index, row in enumerate(majors)),
+        'positions': positions,
+        'role_skills': role_skills,
+        'job_titles': job_titles,
+        'institutions': institutions,
+    }
+
+
+def build_artifact(path=ARTIFACT_PATH):
+    """Compile the lexicons and write the artifact, returning the payload"""
+    payload = build_payload()
+    body = srsly.msgpack_dumps(payload)
+    # Named per process and thread, so concurrent builders never write the same file
+    tmp_path = f"{path}.{os.getpid()}.{threading.get_ident()}.tmp"
+    with open(tmp_path, 'wb') as file:
+        file.write(_HEADER.pack(MAGIC, FORMAT_VERSION, hashlib.sha256(body).digest()))
+        file.write(body)
+    os.replace(tmp_path, path)
+    return payload
+# --------------------------------------------------------------------------------
+
+
+# ----------------------------------Load step-------------------------------------
+def read_artifact(path=ARTIFACT_PATH):
+    """Read and verify the artifact in one read; returns the payload or None"""
+    try:
+        with open(path, 'rb') as file:
+            data = file.read()
+    except OSError:
+        return None
+    if len(data) < _HEADER.size:
+        return None
+    magic, version, checksum = _HEADER.unpack_from(data)
+    body = memoryview(data)[_HEADER.size:]
+    if magic != MAGIC or version != FORMAT_VERSION or hashlib.sha256(body).digest() != checksum:
+        print(f"Lexicon artifact {path} is invalid or from another version, rebuilding")
+        return None
+    return srsly.msgpack_loads(bytes(body))
+
+
+class Lexicons:
+    """Lexicon structures loaded from the artifact"""
+
+    def __init__(self, payload):
+        self.taxonomy = SkillTaxonomy(payload['skill_taxonomy'])
+        self.skills = self.taxonomy.names()
+        self.majors = payload['majors']
+        self.major_categories = payload['major_categories']
+        self.positions = payload['positions']
+        self.role_skills = payload['role_skills']
+        self.job_titles = payload['job_titles']
+        self.institutions = payload['institutions']
+        self._skill_trie = payload['skill_trie']
+        self._major_trie = payload['major_trie']
+
+    @staticmethod
+    def _match(trie, tokens):
+        """Yield the value of every phrase found in tokens, longest match at each position"""
+        for i, token in enumerate(tokens):
+            for tail, value in trie.get(token, ()):
+                if tokens[i + 1:i + 1 + len(tail)] == tail:
+                    yield value
+                    break
+
+    def match_skill_ids(self, text):
+        """Return the IDs of the skills mentioned in text by any name or synonym, in order of first mention"""
+        return tuple(dict.fromkeys(self._match(self._skill_trie, tokenize(text))))
+
+    def match_skills(self, text):
+        """Return the canonical names of the skills mentioned in text"""
+        return [self.taxonomy.name(skill_id) for skill_id in self.match_skill_ids(text)]
+
+    def match_major(self, text):
+        """Return the first major mentioned in text, or ''"""
+        for index in self._match(self._major_trie, tokenize(text)):
+            return self.majors[index]
+        return ""
+
+
+_lexicons = None
+
+
+def load_lexicons(path=ARTIFACT_PATH):
+    """Return the process-wide Lexicons, building the artifact if missing or stale"""
+    global _lexicons
+    if _lexicons is None:
+        payload = read_artifact(path)
+        if payload is None or payload.get('sources') != source_checksums():
+            try:
+                payload = build_artifact(path)
+            except OSError as e:
+                # Read-only deployments still work, they just pay for the build
+                print(f"Could not write lexicon artifact {path}: {str(e)}")
+                payload = build_payload()
+        _lexicons = Lexicons(payload)
+    return _lexicons
+# --------------------------------------------------------------------------------
+
+
+if __name__ == '__main__':
+    # Run from the project root so the data/ paths resolve
+    os.chdir(Path(__file__).resolve().parent.parent)
+    result = build_artifact(sys.argv[1] if len(sys.argv) > 1 else ARTIFACT_PATH)
+    print(f"Built {ARTIFACT_PATH}: {len(result['skill_taxonomy'])} skills, {len(result['majors'])} majors, "
+          f"{len(result['positions'])} positions, {len(result['role_skills'])} roles")
@@ -0,0 +1,142 @@
+"""
+Lexicon classifier for seniority and position.
+
+Keyword lexicons (the seniority tiers below and the position keywords of
+data/position.csv, read from the lexicon artifact) are turned into a sorted
+array of spaCy string hashes plus a keyword x class weight matrix. A
+document is classified from the lemma, lowercase form and POS IDs returned
+by doc.to_array: its tokens are looked up in the hash table with
+np.searchsorted and the hit counts are multiplied into the class matrix, so
+every class is scored in one pass. Multi-word keywords ("social media") are
+stored as a key rolled from the hashes of their words, and matched against
+the same key over every run of that many consecutive lowercase tokens.
+"""
+
+import numpy as np
+from spacy.attrs import LEMMA, LOWER, POS
+from spacy.strings import hash_string
+from spacy.symbols import ADJ, NOUN, PROPN, VERB
+
+from utils.lexicon_artifact import load_lexicons
+
+# Most senior first; ties between tiers go to the more senior one
+SENIORITY_KEYWORDS = {
+    'Senior': ['lead', 'manage', 'direct', 'oversee', 'supervise', 'orchestrate', 'govern'],
+    'Mid-Senior': ['develop', 'design', 'analyze', 'implement', 'coordinate', 'execute', 'strategize'],
+    'Mid-Junior': ['assist', 'support', 'collaborate', 'participate', 'aid', 'facilitate', 'contribute'],
+}
+ENTRY_LEVEL = 'Entry Level'
+
+# Seniority is read from verbs only, positions from all content words
+SENIORITY_POS = (VERB,)
+POSITION_POS = (VERB, NOUN, PROPN, ADJ)
+
+# Multiplier of the rolling key of a multi-word keyword (uint64 arithmetic wraps around)
+_PHRASE_PRIME = np.uint64(1099511628211)
+
+
+def phrase_keys(token_hashes, length):
+    """Rolling key of every run of length consecutive token hashes"""
+    token_hashes = np.asarray(token_hashes, dtype=np.uint64)
+    count = len(token_hashes) - length + 1
+    if count <= 0:
+        return np.zeros(0, dtype=np.uint64)
+    keys = token_hashes[:count].copy()
+    for offset in range(1, length):
+        keys = keys * _PHRASE_PRIME + token_hashes[offset:offset + count]
+    return keys
+
+
+def keyword_hash(keyword):
+    """Table key of a keyword: its string hash, or the rolling key of its words for a phrase"""
+    words = keyword.split()
+    if len(words) == 1:
+        return np.uint64(hash_string(keyword))
+    return phrase_keys([hash_string(word) for word in words], len(words))[0]
+
+
+class LexiconTable:
+    """Sorted keyword hashes and the keyword x class weight matrix"""
+
+    def __init__(self, class_keywords):
+        self.classes = list(class_keywords)
+        keywords = sorted({' '.join(keyword.split()) for words in class_keywords.values() for keyword in words
+                           if keyword.strip()})
+        self.hashes = np.array([keyword_hash(keyword) for keyword in keywords], dtype=np.uint64)
+        # Word counts of the multi-word keywords, each matched over runs of that many tokens
+        self.phrase_lengths = sorted({len(keyword.split()) for keyword in keywords} - {1})
+        order = np.argsort(self.hashes)
+        self.hashes = self.hashes[order]
+        row_of = {keywords[i]: row for row, i in enumerate(order)}
+
+        self.weights = np.zeros((len(keywords), len(self.classes)), dtype=np.float32)
+        for column, words in enumerate(class_keywords.values()):
+            for keyword in words:
+                keyword = ' '.join(keyword.split())
+                if keyword in row_of:
+                    self.weights[row_of[keyword], column] = 1.0
+        # Positions with more keywords should not outscore those with fewer
+        self.class_sizes = np.maximum(self.weights.sum(axis=0), 1.0)
+
+    def lookup(self, token_hashes):
+        """Return the table row of each hash and whether it is in the table"""
+        if not len(self.hashes):
+            return np.zeros(len(token_hashes), dtype=np.intp), np.zeros(len(token_hashes), dtype=bool)
+        rows = np.minimum(np.searchsorted(self.hashes, token_hashes), len(self.hashes) - 1)
+        return rows, self.hashes[rows] == token_hashes
+
+    def score(self, lemmas, lowers, sequence=None):
+        """
+        Return per-class scores for tokens given as lemma and lowercase
+        hashes. Multi-word keywords are looked for in sequence, the lowercase
+        hashes of the whole text in order (lowers when not given).
+        """
+        rows, found = self.lookup(lemmas)
+        lower_rows, lower_found = self.lookup(lowers)
+        # Fall back to the lowercase form where the lemma is unknown (e.g. proper nouns)
+        rows = np.where(found, rows, lower_rows)
+        found |= lower_found
+        matched = [rows[found]]
+        for length in self.phrase_lengths:
+            phrase_rows, phrase_found = self.lookup(phrase_keys(lowers if sequence is None else sequence, length))
+            matched.append(phrase_rows[phrase_found])
+        counts = np.bincount(np.concatenate(matched), minlength=len(self.hashes)).astype(np.float32)
+        return (counts @ self.weights) / self.class_sizes
+
+
+def _ranked(classes, scores):
+    """Return (class, share of the total score) pairs, best first, zero scores dropped"""
+    total = float(scores.sum())
+    if total <= 0:
+        return []
+    order = np.argsort(-scores, kind='stable')
+    return [(classes[i], round(float(scores[i]) / total, 3)) for i in order if scores[i] > 0]
+
+
+class LexiconClassifier:
+    """Scores seniority tiers and positions for a processed spaCy Doc"""
+
+    def __init__(self, position_keywords=None):
+        self.seniority = LexiconTable(SENIORITY_KEYWORDS)
+        self.positions = LexiconTable(position_keywords if position_keywords is not None
+                                      else load_lexicons().positions)
+
+    def classify(self, doc):
+        """
+        Return {'seniority': [(level, score), ...], 'positions': [(position, score), ...]},
+        both ranked best first. Scores are each class's share of the matched
+        keywords; 'seniority' is [('Entry Level', 1.0)] when no tier matches.
+        """
+        array = doc.to_array([LEMMA, LOWER, POS])
+        lemmas, lowers, pos = array[:, 0], array[:, 1], array[:, 2]
+
+        verbs = np.isin(pos, SENIORITY_POS)
+        seniority = _ranked(self.seniority.classes, self.seniority.score(lemmas[verbs], lowers[verbs]))
+
+        content = np.isin(pos, POSITION_POS)
+        positions = _ranked(self.positions.classes, self.positions.score(lemmas[content], lowers[content], lowers))
+
+        return {
+            'seniority': seniority or [(ENTRY_LEVEL, 1.0)],
+            'positions': positions
+        }
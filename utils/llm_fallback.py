@@ -0,0 +1,160 @@
+"""
+Confidence-gated Gemini fallback for fields the rule-based extractors miss.
+
+Resume text is personal data, so nothing is sent unless the
+llm_deep_parsing setting is switched on; it is off by default. Only fields
+whose extractor confidence is below the threshold are sent, each with just
+the section of the resume it comes from, and never from the speculative
+parsing threads. Every answer is cached by the hash of that text so a
+resume is never sent twice, and a failed request is not retried for that
+text until FAILURE_BACKOFF has passed.
+"""
+
+import hashlib
+import json
+import os
+import sqlite3
+import threading
+from contextlib import contextmanager
+from datetime import datetime, timedelta
+from importlib.util import find_spec
+
+from utils.settings_manager import SettingsManager
+
+CACHE_DB = 'data/llm_cache.db'
+MODEL_NAME = 'gemini-1.5-flash'
+# Upper bound on the section text sent for a single field
+MAX_SECTION_CHARS = 6000
+# Seconds a Gemini request may take before the field keeps its rule-based value;
+# parsing waits on it on the page
+REQUEST_TIMEOUT = 15
+# How long a text whose request failed is not sent again
+FAILURE_BACKOFF = timedelta(hours=1)
+# Prefix of the speculative parsing threads (utils.speculative), which never send anything
+BACKGROUND_THREAD_PREFIX = 'speculative'
+
+# What to ask for, per field, and the JSON shape expected back
+FIELD_PROMPTS = {
+    'name': (
+        "Extract the candidate's name from the top of this resume.",
+        '{"first_name": "...", "last_name": "..."}'
+    ),
+    'work_experience': (
+        "Extract every job from this work experience section of a resume. Use \"Present\" "
+        "as end_date for current jobs and empty strings for anything that is not stated.",
+        '{"work_experiences": [{"position": "...", "company": "...", "start_date": "...", "end_date": "..."}]}'
+    ),
+}
+
+PROMPT_TEMPLATE = """{instruction}
+Respond with JSON only, exactly in this shape: {shape}
+
+Text:
+{text}
+"""
+
+
+def is_enabled():
+    """
+    Deep parsing and the opt-in llm_deep_parsing setting are on, this is not
+    a background parsing thread, and a Gemini client and API key are available
+    """
+    settings = SettingsManager()
+    if not (settings.get_setting('parser', 'deep_parsing') and settings.get_setting('parser', 'llm_deep_parsing')):
+        return False
+    if threading.current_thread().name.startswith(BACKGROUND_THREAD_PREFIX):
+        return False
+    return bool(_has_client() and _api_key())
+
+
+def _has_client():
+    # Checked without importing the (slow to import) client itself
+    try:
+        return find_spec('google.generativeai') is not None
+    except ImportError:
+        return False
+
+
+def confidence_threshold():
+    return SettingsManager().get_setting('parser', 'deep_parsing_threshold')
+
+
+def _api_key():
+    return os.getenv("GOOGLE_API_KEY") or SettingsManager().get_setting('api', 'api_key')
+
+
+def _cache_key(field, text):
+    return hashlib.sha256(f"{MODEL_NAME}\0{field}\0{text}".encode('utf-8')).hexdigest()
+
+
+@contextmanager
+def _connect(db_path):
+    conn = sqlite3.connect(db_path)
+    try:
+        conn.execute('''
+            CREATE TABLE IF NOT EXISTS llm_cache (
+                cache_key TEXT PRIMARY KEY,
+                field TEXT,
+                response TEXT,
+                created_at TEXT
+            )
+        ''')
+        yield conn
+    finally:
+        conn.close()
+
+
+def _ask_gemini(field, text):
+    import google.generativeai as genai
+
+    instruction, shape = FIELD_PROMPTS[field]
+    genai.configure(api_key=_api_key())
+    model = genai.GenerativeModel(MODEL_NAME)
+    response = model.generate_content(
+        PROMPT_TEMPLATE.format(instruction=instruction, shape=shape, text=text),
+        generation_config={"temperature": 0, "response_mime_type": "application/json"},
+        request_options={"timeout": REQUEST_TIMEOUT}
+    )
+    raw = response.text.strip()
+    # Tolerate a fenced code block around the JSON
+    if raw.startswith('```'):
+        raw = raw.strip('`').removeprefix('json').strip()
+    return json.loads(raw)
+
+
+def deep_parse(field, text, db_path=CACHE_DB):
+    """
+    Return the structured extraction of one field from its section text, or
+    None when deep parsing is unavailable or the request fails.
+    """
+    if field not in FIELD_PROMPTS or not text or not text.strip() or not is_enabled():
+        return None
+    text = text[:MAX_SECTION_CHARS]
+    key = _cache_key(field, text)
+
+    try:
+        with _connect(db_path) as conn:
+            row = conn.execute('SELECT response, created_at FROM llm_cache WHERE cache_key = ?', (key,)).fetchone()
+        if row and row[0] is not None:
+            return json.loads(row[0])
+        # A failed request is remembered with no response; don't block on it again yet
+        if row and datetime.now() - datetime.strptime(row[1], '%Y-%m-%d %H:%M:%S') < FAILURE_BACKOFF:
+            return None
+    except Exception as e:
+        print(f"Error reading LLM cache: {str(e)}")
+
+    try:
+        result = _ask_gemini(field, text)
+    except Exception as e:
+        print(f"Error in Gemini deep parsing of {field}: {str(e)}")
+        result = None
+
+    try:
+        with _connect(db_path) as conn:
+            conn.execute('INSERT OR REPLACE INTO llm_cache (cache_key, field, response, created_at) VALUES (?, ?, ?, ?)',
+                         (key, field, None if result is None else json.dumps(result),
+                          datetime.now().strftime('%Y-%m-%d %H:%M:%S')))
+            conn.commit()
+    except Exception as e:
+        print(f"Error writing LLM cache: {str(e)}")
+    return result
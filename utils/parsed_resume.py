@@ -0,0 +1,203 @@
+"""
+Typed record for parse results.
+
+ParsedResume replaces the nested dicts of strings, lists and sets that the
+extractors return when a result has to be held, cached, stored or sent to
+another process. Every record class uses __slots__, known skills are kept
+as integer IDs of the skill taxonomy and any other skill by its name, and
+records serialize to compact positional msgpack bytes or to JSON, both
+tagged with SCHEMA_VERSION.
+"""
+
+import json
+from dataclasses import dataclass, field, fields
+
+import srsly
+
+from utils.lexicon_artifact import load_lexicons
+
+# Bump whenever a field is added, removed or reordered
+SCHEMA_VERSION = 2
+# Version 1 stored every skill by name, which version 2 still reads
+READABLE_VERSIONS = (1, SCHEMA_VERSION)
+
+
+def skill_key(name):
+    """Key of a skill on a record: its taxonomy ID when it is a known skill, its name otherwise"""
+    skill_id = load_lexicons().taxonomy.id_of(name)
+    return skill_id if skill_id is not None else name.strip()
+
+
+def skill_keys(names):
+    """Keys of skill names, in order and once per skill (the first spelling of an unknown skill wins)"""
+    keys = {}
+    for name in names:
+        if name and name.strip():
+            key = skill_key(name)
+            keys.setdefault(key.lower() if isinstance(key, str) else key, key)
+    return tuple(keys.values())
+
+
+def skill_name(key):
+    return load_lexicons().taxonomy.name(key) if isinstance(key, int) else key
+
+
+@dataclass(slots=True)
+class Contact:
+    email: str = ''
+    phone: str = ''
+    linkedin: str = ''
+    github: str = ''
+    portfolio: str = ''
+
+
+@dataclass(slots=True)
+class EducationEntry:
+    institution: str = ''
+    degree: str = ''
+    dates: str = ''
+    gpa: str = ''
+
+
+@dataclass(slots=True)
+class WorkEntry:
+    position: str = ''
+    company: str = ''
+    start_date: str = ''
+    end_date: str = ''
+    duration: str = ''
+
+
+def _values(record):
+    return [getattr(record, f.name) for f in fields(record)]
+
+
+@dataclass(slots=True)
+class ParsedResume:
+    first_name: str = ''
+    last_name: str = ''
+    contact: Contact = field(default_factory=Contact)
+    degree_major: str = ''
+    level_of_experience: str = ''
+    suggested_position: str = ''
+    # Taxonomy IDs of known skills, names of the others (see skill_keys)
+    skill_keys: tuple = ()
+    education: list = field(default_factory=list)
+    work: list = field(default_factory=list)
+
+    @property
+    def skills(self):
+        return [skill_name(key) for key in self.skill_keys]
+
+    @classmethod
+    def from_resume_info(cls, info):
+        """Build a record from the dict returned by extract_resume_info (either parser)"""
+        experience = info.get('experience') or {}
+        education = []
+        for entry in info.get('education') or []:
+            if isinstance(entry, str):
+                education.append(EducationEntry(institution=entry))
+            else:
+                education.append(EducationEntry(
+                    institution=entry.get('institution') or entry.get('university', ''),
+                    degree=entry.get('degree', ''),
+                    dates=entry.get('dates') or entry.get('duration', ''),
+                    gpa=entry.get('gpa', '')))
+        work = [WorkEntry(
+            position=entry.get('position') or entry.get('title', ''),
+            company=entry.get('company', ''),
+            start_date=entry.get('start_date') or entry.get('dates', ''),
+            end_date=entry.get('end_date', ''),
+            duration=entry.get('duration', ''))
+            for entry in experience.get('work_experiences') or []]
+
+        return cls(
+            first_name=info.get('first_name') or '',
+            last_name=info.get('last_name') or '',
+            contact=Contact(**{name: info.get(name) or '' for name in Contact.__slots__}),
+            degree_major=info.get('degree_major') or '',
+            level_of_experience=experience.get('level_of_experience', ''),
+            suggested_position=experience.get('suggested_position', ''),
+            skill_keys=skill_keys(info.get('skills') or []),
+            education=education,
+            work=work)
+
+    def to_dict(self):
+        """Return a JSON-ready dict, with skill names instead of IDs"""
+        return {
+            'schema_version': SCHEMA_VERSION,
+            'first_name': self.first_name,
+            'last_name': self.last_name,
+            'contact': dict(zip(Contact.__slots__, _values(self.contact))),
+            'degree_major': self.degree_major,
+            'level_of_experience': self.level_of_experience,
+            'suggested_position': self.suggested_position,
+            'skills': self.skills,
+            'education': [dict(zip(EducationEntry.__slots__, _values(entry))) for entry in self.education],
+            'work': [dict(zip(WorkEntry.__slots__, _values(entry))) for entry in self.work],
+        }
+
+    @classmethod
+    def from_dict(cls, data):
+        _check_version(data.get('schema_version'))
+        return cls(
+            first_name=data['first_name'],
+            last_name=data['last_name'],
+            contact=Contact(**data['contact']),
+            degree_major=data['degree_major'],
+            level_of_experience=data['level_of_experience'],
+            suggested_position=data['suggested_position'],
+            skill_keys=skill_keys(data['skills']),
+            education=[EducationEntry(**entry) for entry in data['education']],
+            work=[WorkEntry(**entry) for entry in data['work']])
+
+    def to_json(self):
+        return json.dumps(self.to_dict(), ensure_ascii=False, separators=(',', ':'))
+
+    @classmethod
+    def from_json(cls, text):
+        return cls.from_dict(json.loads(text))
+
+    def to_bytes(self):
+        """
+        Serialize to msgpack as positional arrays, without field names. Known
+        skills are written as taxonomy IDs, unknown ones by name.
+        """
+        return srsly.msgpack_dumps([
+            SCHEMA_VERSION,
+            self.first_name, self.last_name,
+            _values(self.contact),
+            self.degree_major, self.level_of_experience, self.suggested_position,
+            list(self.skill_keys),
+            [_values(entry) for entry in self.education],
+            [_values(entry) for entry in self.work],
+        ])
+
+    @classmethod
+    def from_bytes(cls, data):
+        (version, first_name, last_name, contact, degree_major, level_of_experience,
+         suggested_position, skills, education, work) = srsly.msgpack.unpackb(
+            # Records hold no maps, so no object hooks are needed: passing object_pairs_hook
+            # skips srsly looking up its decoder entry points again on every call
+            data, raw=False, object_pairs_hook=None)
+        _check_version(version)
+        return cls(
+            first_name=first_name,
+            last_name=last_name,
+            contact=Contact(*contact),
+            degree_major=degree_major,
+            level_of_experience=level_of_experience,
+            suggested_position=suggested_position,
+            # A name may have joined the taxonomy since it was written
+            skill_keys=tuple(key if isinstance(key, int) else skill_key(key) for key in skills),
+            education=[EducationEntry(*entry) for entry in education],
+            work=[WorkEntry(*entry) for entry in work])
+
+    def __reduce__(self):
+        # Records cross process boundaries as their compact bytes
+        return ParsedResume.from_bytes, (self.to_bytes(),)
+
+
+def _check_version(version):
+    if version not in READABLE_VERSIONS:
+        raise ValueError(f"Unsupported ParsedResume schema version {version} (expected {SCHEMA_VERSION})")
@@ -0,0 +1,105 @@
+"""
+Page-image previews of PDFs.
+
+A PDF embedded as a base64 data URI is a third larger than the file, is
+sent again on every rerun and is refused by many browsers. Previews are
+pages instead: PNGs rendered at a low DPI with PyMuPDF, one page at a time
+and only when a page is shown. Rendered pages are kept in a process-wide
+LRU cache keyed by (content hash, page, DPI) and bounded in bytes, so
+rendering work and memory follow the pages people actually look at.
+"""
+
+import threading
+from collections import OrderedDict
+
+from utils.settings_manager import SettingsManager
+from utils.uploads import Upload, receive_upload
+
+
+class PageImageCache:
+    """LRU cache of rendered page images, evicting the least recently shown once over max_bytes"""
+
+    def __init__(self, max_bytes):
+        self.max_bytes = max_bytes
+        self.size = 0
+        self._images = OrderedDict()
+        self._lock = threading.Lock()
+
+    def get(self, key):
+        with self._lock:
+            image = self._images.get(key)
+            if image is not None:
+                self._images.move_to_end(key)
+            return image
+
+    def put(self, key, image):
+        with self._lock:
+            if key in self._images:
+                return
+            self._images[key] = image
+            self.size += len(image)
+            while self.size > self.max_bytes and len(self._images) > 1:
+                _, evicted = self._images.popitem(last=False)
+                self.size -= len(evicted)
+
+
+_cache = None
+
+
+def get_page_cache():
+    """The process-wide page image cache, sized by the preview_cache_mb setting"""
+    global _cache
+    if _cache is None:
+        _cache = PageImageCache(SettingsManager().get_setting('parser', 'preview_cache_mb') * 1024 * 1024)
+    return _cache
+
+
+def preview_dpi():
+    return SettingsManager().get_setting('parser', 'preview_dpi')
+
+
+def as_upload(pdf):
+    """An Upload for PDF bytes, an Upload or an uploaded file"""
+    if isinstance(pdf, (bytes, bytearray, memoryview)):
+        return Upload('preview.pdf', bytes(pdf))
+    return receive_upload(pdf)
+
+
+class PdfPreview:
+    """Renders the pages of one upload on demand, opening the PDF only when a page is not cached"""
+
+    def __init__(self, pdf, dpi=None):
+        self.upload = as_upload(pdf)
+        self.dpi = dpi or preview_dpi()
+        self._doc = None
+
+    @property
+    def doc(self):
+        if self._doc is None:
+            self._doc = self.upload.open_pdf()
+        return self._doc
+
+    @property
+    def page_count(self):
+        return self.doc.page_count
+
+    def page_image(self, page_number):
+        """PNG bytes of a page, from the cache or rendered now"""
+        cache = get_page_cache()
+        key = (self.upload.content_hash, page_number, self.dpi)
+        image = cache.get(key)
+        if image is None:
+            image = self.doc.load_page(page_number).get_pixmap(dpi=self.dpi, alpha=False).tobytes("png")
+            cache.put(key, image)
+        return image
+
+    def close(self):
+        if self._doc is not None:
+            self._doc.close()
+            self._doc = None
+
+    def __enter__(self):
+        return self
+
+    def __exit__(self, *exc_info):
+        self.close()
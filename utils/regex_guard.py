@@ -0,0 +1,162 @@
+"""
+Guarded regular expressions for resume parsing.
+
+Text extracted from uploaded PDFs is untrusted, so the patterns the
+extractors run against it are compiled once here, written to run in linear
+time (bounded quantifiers, no nested or overlapping repetition) and
+searched under a per-pattern time budget. When the `regex` package is
+available the budget is enforced by the engine itself; otherwise the
+standard `re` module is used and the bounded patterns are the only guard.
+"""
+
+import re
+import sys
+import time
+
+try:
+    import regex as _regex  # Supports per-call timeouts
+except ImportError:
+    _regex = None
+
+# Default time budget for a single search, in seconds
+DEFAULT_TIMEOUT = 0.5
+
+# Every guarded pattern by name, used by the backtracking benchmark
+_REGISTRY = {}
+
+
+class GuardedPattern:
+    """A compiled pattern whose searches give up once the time budget is spent"""
+
+    def __init__(self, name, pattern, flags=0, timeout=DEFAULT_TIMEOUT):
+        self.name = name
+        self.pattern = pattern
+        self.flags = flags
+        self.timeout = timeout
+        self._compiled = (_regex or re).compile(pattern, flags)
+        _REGISTRY[name] = self
+
+    def _run(self, method, default, *args):
+        func = getattr(self._compiled, method)
+        if _regex is None:
+            return func(*args)
+        started = time.perf_counter()
+        try:
+            result = func(*args, timeout=self.timeout)
+            # finditer is lazy, so drain it while the timeout still applies
+            return list(result) if method == 'finditer' else result
+        except TimeoutError:
+            elapsed = time.perf_counter() - started
+            print(f"Regex '{self.name}' exceeded its {self.timeout}s budget ({elapsed:.2f}s), skipping",
+                  file=sys.stderr)
+            return default
+
+    def search(self, text, pos=0):
+        return self._run('search', None, text, pos)
+
+    def match(self, text, pos=0):
+        return self._run('match', None, text, pos)
+
+    def finditer(self, text, pos=0, endpos=None):
+        return self._run('finditer', [], text, pos, len(text) if endpos is None else endpos)
+
+    def findall(self, text):
+        return self._run('findall', [], text)
+
+    def split(self, text):
+        return self._run('split', [text], text)
+
+
+def guarded(name, pattern, flags=0, timeout=DEFAULT_TIMEOUT):
+    """Compile and register a guarded pattern"""
+    return GuardedPattern(name, pattern, flags, timeout)
+
+
+def registered_patterns():
+    """Return all guarded patterns keyed by name"""
+    return dict(_REGISTRY)
+
+
+def find_section(text, header_pattern):
+    """
+    Return the text from a section header up to the next "HEADER:" block
+    (a blank line followed by a short capitalized label ending in a colon),
+    or None when the header is not present.
+    """
+    header = header_pattern.search(text)
+    if not header:
+        return None
+    end = SECTION_END.search(text, header.end())
+    return text[header.start():end.start() if end else len(text)]
+
+
+# ------------------------------Section boundaries--------------------------------
+# Replaces the DOTALL lookahead `.*?(?=\n\n[A-Z\s]+:|\Z)`, which rescans the rest
+# of the document from every candidate position
+SECTION_END = guarded('section_end', r"\n\n[A-Z\s]{1,80}:", re.IGNORECASE)
+
+PROFESSIONAL_EXPERIENCE_HEADER = guarded('professional_experience_header', r"PROFESSIONAL EXPERIENCE",
+                                         re.IGNORECASE)
+HONORS_HEADER = guarded('honors_header', r"HONORS AND AWARDS|HONORS & AWARDS|HONORS|AWARDS|ACHIEVEMENTS",
+                        re.IGNORECASE)
+
+# Common section headers in resumes
+SECTION_KEYWORDS = {
+    'education': r'(?:EDUCATION|ACADEMIC|QUALIFICATION|DEGREE)',
+    'experience': r'(?:EXPERIENCE|EMPLOYMENT|WORK|PROFESSIONAL|CAREER)',
+    'skills': r'(?:SKILLS|TECHNICAL|TECHNOLOGIES|EXPERTISE|PROFICIENCY)',
+    'projects': r'(?:PROJECTS|PROJECT EXPERIENCE)',
+    'certifications': r'(?:CERTIFICATIONS|CERTIFICATES)',
+    'summary': r'(?:SUMMARY|PROFILE|OBJECTIVE)'
+}
+# Header lines may only be indented with spaces or tabs; `^\s*` lets every line
+# start rescan all of the blank lines that follow it
+SECTION_HEADERS = {
+    name: guarded(f'section_header_{name}', rf"^[ \t]*{keywords}.*", re.IGNORECASE | re.MULTILINE)
+    for name, keywords in SECTION_KEYWORDS.items()
+}
+NEXT_SECTION = guarded('next_section', '|'.join(SECTION_KEYWORDS.values()), re.IGNORECASE)
+# --------------------------------------------------------------------------------
+
+# -------------------------------Experience entries-------------------------------
+# Free-text captures are capped at sixty characters and anchored to word starts,
+# so each candidate position does a bounded amount of work
+_TITLE_KEYWORD = r"(?:Engineer|Developer|Designer|Manager|Director|Analyst|Consultant|Architect)"
+# The title keyword with at most five words of the same line before it (e.g. a
+# seniority); the lazy `[\w\s]{1,60}?` it replaces retried every keyword at each
+# of sixty characters after every word start
+JOB_TITLE = guarded('job_title', rf"\b((?:\w{{1,25}}[ \t]{{1,3}}){{0,5}}?{_TITLE_KEYWORD})", re.IGNORECASE)
+COMPANY_AFTER_PREPOSITION = guarded('company_after_preposition',
+                                    r"\b(?:at|with|for)\s{1,5}([\w\s&]{1,60}?)(?:,|\.|in|\(|\)|\n|$)",
+                                    re.IGNORECASE)
+COMPANY_LEADING = guarded('company_leading', r"\b([\w\s&]{1,60}?)(?:,|\.|in|\(|\)|\n|$)", re.IGNORECASE)
+FIELD_OF_STUDY = guarded('field_of_study', r"\bin\s{1,5}([A-Za-z\s]{1,60}?)(?:,|\.|from|\(|\)|\n|$)",
+                         re.IGNORECASE)
+# One date (MM/YYYY, Month YYYY or a bare year) optionally followed by the end of
+# the range, so a line's employment dates are found with a single search
+_DATE = r"(?:\d{1,2}/\d{4}|(?:Jan|Feb|Mar|Apr|May|Jun|Jul|Aug|Sep|Oct|Nov|Dec)[a-z]{0,6}\.?\s{1,3}\d{4}|(?:19|20)\d{2})"
+EMPLOYMENT_DATES = guarded('employment_dates',
+                           rf"\b(?P<start>{_DATE})\b(?:(?:\s{{0,3}}(?:[-–—]|to)\s{{0,3}}|\s{{1,3}})"
+                           rf"(?P<end>{_DATE}|Present|Current|Now)\b)?",
+                           re.IGNORECASE)
+TITLE_COMPANY_SEPARATOR = guarded('title_company_separator',
+                                  r"[ \t]{0,3}(?:at[ \t]|@|,|\||[-–—][ \t])[ \t]{0,3}(\S.{0,100})", re.IGNORECASE)
+# --------------------------------------------------------------------------------
+
+# -----------------------------------Education------------------------------------
+# Degree keyword followed by the rest of its phrase, up to a separator
+_DEGREE_REST = r"[^,\n|(]{0,80}"
+DEGREE = guarded('degree',
+                 rf"\b(?i:Bachelor|Master|Doctor)(?:'s|s)?\b{_DEGREE_REST}"
+                 rf"|\b(?i:Associate)(?:'s)?[ \t](?i:Degree|of)\b{_DEGREE_REST}"
+                 rf"|\b(?:Ph\.?[ \t]?D|M\.?B\.?A|B\.?Tech|M\.?Tech|B\.?Sc|M\.?Sc|BCA|MCA|B\.[SAE]|M\.[SAE])\b\.?{_DEGREE_REST}"
+                 rf"|\b(?:(?i:High)[ \t](?i:School)[ \t])?(?i:Diploma)\b{_DEGREE_REST}"
+                 rf"|\b(?i:Post)[ \t]?(?i:Graduate)\b{_DEGREE_REST}")
+GPA = guarded('gpa', r"\b(?:C?GPA|Grade Point Average)[:\s]{1,3}([0-9]{1,2}(?:\.[0-9]{1,3})?)"
+                     r"(?:[ \t]{0,2}/[ \t]{0,2}[0-9]{1,2}(?:\.[0-9]{1,2})?)?", re.IGNORECASE)
+# --------------------------------------------------------------------------------
+
+# ------------------------------------Contact-------------------------------------
+# Local part and domain lengths follow the RFC 5321 limits
+EMAIL = guarded('email', r"\b[A-Za-z0-9._%+-]{1,64}@[A-Za-z0-9.-]{1,255}\.[A-Za-z]{2,24}\b")
+# --------------------------------------------------------------------------------
@@ -0,0 +1,169 @@
+"""
+Background re-scoring of the candidates table.
+
+resume_score is written when a candidate is added. After the weights in
+data/scoring_weights.json change, an admin starts a RescoreJob, which reads
+the candidates that have a stored parse result in id order, scores each
+batch with one call to the scoring engine and writes the changed scores
+back with executemany, one short transaction per batch. It pauses between
+batches so the recruiter pages' queries are not held up behind its writes.
+Candidates added by hand have no parse result and keep the score they were
+given, and so do candidates whose score a recruiter changed when adding
+them (score_edited); the job counts both, so the page can say how many
+candidates it left as they were.
+
+Started with a reanalyze function (resume_parser.reanalyze_resume), the
+job first re-runs the rule-based extractors over the cached pages of each
+candidate's resume, so changes to the extractors or lexicons reach stored
+candidates without running the models or re-uploading anything.
+"""
+
+import sqlite3
+import threading
+import time
+
+from utils.parsed_resume import ParsedResume
+from utils.scoring import ScoringEngine, candidate_features, get_scoring_engine, load_weights
+from utils.settings_manager import SettingsManager
+
+DB_PATH = 'data/user_pdfs.db'
+
+IDLE = 'idle'
+RUNNING = 'running'
+DONE = 'done'
+CANCELLED = 'cancelled'
+FAILED = 'failed'
+
+_COLUMNS = ('id, first_name, last_name, email, phone, skills, experience_years, education, resume_score, '
+            'score_edited, parsed_resume, page_hashes')
+
+
+class RescoreJob:
+    """Re-scores every parsed candidate in a daemon thread, recording its progress"""
+
+    def __init__(self, db_path=DB_PATH):
+        self.db_path = db_path
+        self.state = IDLE
+        self.total = 0
+        self.processed = 0
+        self.updated = 0
+        self.reanalyzed = 0
+        # Candidates without a parse result, and parsed ones whose score was entered by hand
+        self.skipped = 0
+        self.kept = 0
+        self.reanalyze = None
+        self.error = ''
+        self.started_at = None
+        self.finished_at = None
+        self._cancel = threading.Event()
+        self._thread = None
+        self._lock = threading.Lock()
+
+    @property
+    def running(self):
+        return self.state == RUNNING
+
+    @property
+    def elapsed(self):
+        if self.started_at is None:
+            return 0.0
+        return (self.finished_at or time.perf_counter()) - self.started_at
+
+    def start(self, reanalyze=None):
+        """
+        Start the job; reanalyze, when given, maps a candidate's page hashes
+        to a fresh extract_resume_info dict, or None when they are not cached
+        """
+        with self._lock:
+            if self.running:
+                return
+            self.state = RUNNING
+            self.reanalyze = reanalyze
+            self.processed = self.updated = self.reanalyzed = self.skipped = self.kept = 0
+            self.error = ''
+            self.started_at, self.finished_at = time.perf_counter(), None
+            self._cancel.clear()
+            self._thread = threading.Thread(target=self._run, name='rescore', daemon=True)
+            self._thread.start()
+
+    def cancel(self):
+        self._cancel.set()
+
+    def wait(self, timeout=None):
+        if self._thread is not None:
+            self._thread.join(timeout)
+
+    def _run(self):
+        try:
+            self.rescore()
+            self.state = CANCELLED if self._cancel.is_set() else DONE
+        except Exception as e:
+            print(f"Re-scoring failed: {e}")
+            self.error = str(e)
+            self.state = FAILED
+        finally:
+            self.finished_at = time.perf_counter()
+
+    def rescore(self):
+        settings = SettingsManager()
+        batch_size = settings.get_setting('database', 'rescore_batch_size')
+        pause = settings.get_setting('database', 'rescore_pause')
+        # Read the weights file again, and have new uploads use the new weights too
+        engine = ScoringEngine(load_weights())
+        get_scoring_engine.cache_clear()
+
+        conn = sqlite3.connect(self.db_path, timeout=30)
+        conn.row_factory = sqlite3.Row
+        try:
+            self.total, self.skipped = conn.execute('''
+                SELECT COUNT(parsed_resume), COUNT(*) - COUNT(parsed_resume) FROM candidates
+            ''').fetchone()
+            last_id = 0
+            while not self._cancel.is_set():
+                # Keyset pagination: each batch is an index range scan, however far along the job is
+                rows = conn.execute(f'''
+                    SELECT {_COLUMNS} FROM candidates
+                    WHERE id > ? AND parsed_resume IS NOT NULL
+                    ORDER BY id LIMIT ?
+                ''', (last_id, batch_size)).fetchall()
+                if not rows:
+                    break
+                last_id = rows[-1]['id']
+                candidates, reparsed = self._reanalyze(rows)
+                scores = engine.totals([candidate_features(candidate) for candidate in candidates])
+                changed = [(int(score), row['id']) for score, row in zip(scores, rows)
+                           if score != row['resume_score'] and not row['score_edited']]
+                if changed or reparsed:
+                    with conn:
+                        conn.executemany('UPDATE candidates SET parsed_resume = ? WHERE id = ?', reparsed)
+                        conn.executemany('UPDATE candidates SET resume_score = ? WHERE id = ?', changed)
+                self.reanalyzed += len(reparsed)
+                self.processed += len(rows)
+                self.updated += len(changed)
+                self.kept += sum(bool(row['score_edited']) for row in rows)
+                # Leave the database to interactive queries between batches
+                time.sleep(pause)
+        finally:
+            conn.close()
+
+    def _reanalyze(self, rows):
+        """Rows as dicts, with the ParsedResume re-extracted from cached pages when reanalyzing, and the new ones"""
+        candidates, reparsed = [dict(row) for row in rows], []
+        if self.reanalyze is None:
+            return candidates, reparsed
+        for candidate in candidates:
+            if not candidate['page_hashes']:
+                continue
+            resume_info = self.reanalyze(candidate['page_hashes'].split(','))
+            if resume_info is not None:
+                candidate['parsed_resume'] = ParsedResume.from_resume_info(resume_info).to_bytes()
+                reparsed.append((candidate['parsed_resume'], candidate['id']))
+        return candidates, reparsed
+
+
+_job = RescoreJob()
+
+
+def get_rescore_job():
+    """The process-wide re-scoring job, so every session sees the same progress"""
+    return _job
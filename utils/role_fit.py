@@ -0,0 +1,108 @@
+"""
+Role fit across the whole role catalogue.
+
+The role -> skills map (data/suggestedSkills.csv, through the lexicon
+artifact) is turned once into a sparse binary roles x skills matrix whose
+columns are skill keys: taxonomy IDs, so that synonyms and spellings of a
+skill match. A candidate's skills become a 0/1 vector over the same
+columns, and one sparse matrix-vector product counts the matching skills
+of every role. The fit of a role is the share of its skills the candidate
+has, and only the best k roles are sorted, so ranking stays fast when the
+catalogue grows to thousands of roles.
+"""
+
+import re
+from collections import namedtuple
+from functools import lru_cache
+
+import numpy as np
+
+# fit is the share of the role's skills the candidate has, from 0 to 1
+RoleFit = namedtuple('RoleFit', ['role', 'fit', 'matching', 'missing'])
+
+# Words of role names shown in capitals rather than title case
+ROLE_ACRONYMS = {'ai': 'AI', 'ar': 'AR', 'vr': 'VR', 'ml': 'ML', 'ui': 'UI', 'ux': 'UX', 'hr': 'HR', 'it': 'IT',
+                 'qa': 'QA', 'seo': 'SEO', 'sre': 'SRE', 'gis': 'GIS', 'iot': 'IoT'}
+
+
+def display_role(role):
+    """Role name in title case, keeping acronyms such as AI and AR/VR in capitals"""
+    return re.sub(r"[A-Za-z]+", lambda word: ROLE_ACRONYMS.get(word.group().lower(), word.group().capitalize()), role)
+
+
+def skill_key(taxonomy, skill):
+    """Column key of a skill: its taxonomy ID, or its lowercased name when it is not in the taxonomy"""
+    return taxonomy.id_of(skill) or skill.strip().lower()
+
+
+class RoleFitIndex:
+    """Sparse roles x skills matrix with the skill names of each role, for ranking roles by fit"""
+
+    def __init__(self, role_skills, taxonomy):
+        from scipy.sparse import csr_matrix
+
+        self.taxonomy = taxonomy
+        self.roles = []
+        self.role_skills = []
+        self.columns = {}
+        indices, indptr = [], [0]
+        for role, skills in role_skills.items():
+            keys = {}
+            for skill in skills:
+                keys.setdefault(self.columns.setdefault(skill_key(taxonomy, skill), len(self.columns)), skill)
+            if not keys:
+                continue
+            self.roles.append(role)
+            self.role_skills.append(list(keys.items()))
+            indices.extend(keys)
+            indptr.append(len(indices))
+        data = np.ones(len(indices), dtype=np.float32)
+        self.matrix = csr_matrix((data, indices, indptr), shape=(len(self.roles), len(self.columns)))
+        self.sizes = np.diff(self.matrix.indptr).astype(np.float32)
+
+    def skill_vector(self, skills):
+        """0/1 vector over the matrix columns; skills no role asks for are left out"""
+        vector = np.zeros(len(self.columns), dtype=np.float32)
+        columns = [self.columns.get(skill_key(self.taxonomy, skill)) for skill in skills]
+        vector[[column for column in columns if column is not None]] = 1
+        return vector
+
+    def fits(self, vector):
+        """(matching skill count, fit) of every role for a skill vector, in self.roles order"""
+        counts = self.matrix @ vector
+        return counts, counts / self.sizes
+
+    def top_roles(self, skills, k=5):
+        """
+        The k roles that best fit skills, best first, with their matching and
+        missing skills. Roles none of the skills match are left out.
+        """
+        if not self.roles or k <= 0:
+            return []
+        vector = self.skill_vector(skills)
+        counts, fit = self.fits(vector)
+        matched = np.flatnonzero(counts > 0)
+        k = min(k, len(matched))
+        if not k:
+            return []
+        # Partition out the k best, then sort only those (fit, then matching count, then name)
+        best = matched[np.argpartition(-fit[matched], k - 1)[:k]] if k < len(matched) else matched
+        best = sorted(best, key=lambda row: (-fit[row], -counts[row], self.roles[row]))
+        results = []
+        for row in best:
+            matching = [name for column, name in self.role_skills[row] if vector[column]]
+            missing = [name for column, name in self.role_skills[row] if not vector[column]]
+            results.append(RoleFit(self.roles[row], float(fit[row]), matching, missing))
+        return results
+
+
+@lru_cache(maxsize=1)
+def get_role_fit_index():
+    """The index of every role in the lexicons, built once per process"""
+    from resume_parser import SPECIALIZED_ROLE_SKILLS, suggest_skills_for_job
+    from utils.lexicon_artifact import load_lexicons
+
+    lexicons = load_lexicons()
+    # suggest_skills_for_job keeps the curated skill lists of a few roles, so the ranking agrees with it
+    roles = sorted(set(lexicons.role_skills) | set(SPECIALIZED_ROLE_SKILLS))
+    return RoleFitIndex({role: suggest_skills_for_job(role) for role in roles}, lexicons.taxonomy)
@@ -0,0 +1,155 @@
+"""
+Resume scoring engine.
+
+Every resume score in the app comes from here. A resume is reduced to the
+numeric features in FEATURES, and data/scoring_weights.json says how they
+add up: each component (Skills, Experience, ...) is a sum of capped terms
+weight * feature, itself capped at the component's maximum. Scoring is a
+few NumPy operations on a (resumes x features) matrix, so a single resume
+and the whole candidates table go through the same code.
+"""
+
+import json
+import re
+from functools import lru_cache
+
+import numpy as np
+
+from utils.dates import calculate_duration, parse_date
+from utils.parsed_resume import Contact, EducationEntry, ParsedResume, skill_keys
+
+WEIGHTS_FILE = 'data/scoring_weights.json'
+# Bump whenever the weights file layout changes
+WEIGHTS_VERSION = 1
+
+# Columns of the feature matrix
+FEATURES = ('has_name', 'has_email', 'has_phone', 'skills', 'experience_years', 'positions',
+            'seniority', 'education', 'has_major')
+
+# Tiers of the lexicon classifier, scored 1 (entry) to 4 (senior)
+SENIORITY_TIERS = {'Entry Level': 1, 'Mid-Junior': 2, 'Mid-Senior': 3, 'Senior': 4}
+
+_YEARS = re.compile(r"(\d+) year")
+_MONTHS = re.compile(r"(\d+) month")
+
+
+def duration_years(duration):
+    """Years in a work entry duration such as '2 years, 3 months'"""
+    years = _YEARS.search(duration)
+    months = _MONTHS.search(duration)
+    return (int(years.group(1)) if years else 0) + (int(months.group(1)) / 12 if months else 0)
+
+
+def entry_years(entry):
+    """
+    Years of a WorkEntry. Records stored before ongoing jobs got a duration
+    have none, so it is worked out from their dates.
+    """
+    if entry.duration or not entry.start_date:
+        return duration_years(entry.duration)
+    return duration_years(calculate_duration(parse_date(entry.start_date), parse_date(entry.end_date or 'Present')))
+
+
+def resume_features(parsed, experience_years=None):
+    """Return the FEATURES row of a ParsedResume; experience_years overrides the sum of its work durations"""
+    if experience_years is None:
+        experience_years = sum(entry_years(entry) for entry in parsed.work)
+    return (
+        bool(parsed.first_name or parsed.last_name),
+        bool(parsed.contact.email),
+        bool(parsed.contact.phone),
+        len(parsed.skill_keys),
+        experience_years,
+        len(parsed.work),
+        SENIORITY_TIERS.get(parsed.level_of_experience, 0),
+        len(parsed.education),
+        bool(parsed.degree_major),
+    )
+
+
+def candidate_features(candidate):
+    """
+    Return the FEATURES row of a candidates table row (a dict). The stored
+    ParsedResume is used when there is one; the editable columns (skills,
+    contact details, years of experience) take precedence over it.
+    """
+    if candidate.get('parsed_resume'):
+        parsed = ParsedResume.from_bytes(candidate['parsed_resume'])
+    else:
+        parsed = ParsedResume(education=[EducationEntry(institution=entry.strip())
+                                          for entry in (candidate.get('education') or '').split(',') if entry.strip()])
+    parsed.first_name = candidate.get('first_name') or parsed.first_name
+    parsed.last_name = candidate.get('last_name') or parsed.last_name
+    parsed.contact = Contact(email=candidate.get('email') or parsed.contact.email,
+                             phone=candidate.get('phone') or parsed.contact.phone)
+    if candidate.get('skills'):
+        parsed.skill_keys = skill_keys(candidate['skills'].split(','))
+    return resume_features(parsed, candidate.get('experience_years') or None)
+
+
+class ScoringEngine:
+    """Scores feature matrices with the weights of one weights file"""
+
+    def __init__(self, config):
+        self.components = list(config['components'])
+        feature_index, weights, caps, owners = [], [], [], []
+        for position, (component, spec) in enumerate(config['components'].items()):
+            for feature, term in spec['terms'].items():
+                if feature not in FEATURES:
+                    raise ValueError(f"Unknown feature '{feature}' in component {component}")
+                feature_index.append(FEATURES.index(feature))
+                weights.append(term['weight'])
+                caps.append(term.get('max', np.inf))
+                owners.append(position)
+        self._feature_index = np.array(feature_index, dtype=np.intp)
+        self._weights = np.array(weights, dtype=np.float64)
+        self._caps = np.array(caps, dtype=np.float64)
+        # (terms x components) 0/1 matrix that sums each component's terms
+        self._membership = np.zeros((len(weights), len(self.components)))
+        self._membership[np.arange(len(weights)), owners] = 1
+        self._maxima = np.array([spec['max'] for spec in config['components'].values()], dtype=np.float64)
+
+    def score_matrix(self, features):
+        """(resumes x FEATURES) -> (resumes x components) integer points"""
+        features = np.asarray(features, dtype=np.float64).reshape(-1, len(FEATURES))
+        terms = np.minimum(features[:, self._feature_index] * self._weights, self._caps)
+        return np.rint(np.minimum(terms @ self._membership, self._maxima)).astype(np.int64)
+
+    def score(self, features):
+        """Component points of one FEATURES row, as {component: points}"""
+        return dict(zip(self.components, self.score_matrix(features)[0].tolist()))
+
+    def totals(self, feature_rows):
+        """Total score of every FEATURES row, as an integer array"""
+        if not len(feature_rows):
+            return np.zeros(0, dtype=np.int64)
+        return self.score_matrix(feature_rows).sum(axis=1)
+
+
+def load_weights(file_path=WEIGHTS_FILE):
+    with open(file_path, 'r', encoding='utf-8') as file:
+        config = json.load(file)
+    if config.get('version') != WEIGHTS_VERSION:
+        raise ValueError(f"Scoring weights {file_path} have version {config.get('version')}, "
+                         f"expected {WEIGHTS_VERSION}")
+    return config
+
+
+@lru_cache(maxsize=None)
+def get_scoring_engine():
+    """The process-wide engine for WEIGHTS_FILE"""
+    return ScoringEngine(load_weights())
+
+
+def score_resume(resume_info):
+    """Component points, {component: points}, of the dict returned by extract_resume_info"""
+    return get_scoring_engine().score(resume_features(ParsedResume.from_resume_info(resume_info)))
+
+
+def total_score(components):
+    return sum(components.values())
+
+
+def score_candidates(candidates):
+    """Total scores of candidates table rows (dicts), in one vectorized call"""
+    return get_scoring_engine().totals([candidate_features(candidate) for candidate in candidates])
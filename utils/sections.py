@@ -0,0 +1,84 @@
+"""
+Resume section segmenter.
+
+Splits resume text into sections (experience, education, skills, ...) in a
+single pass over its lines. A line is a section header when, once stripped
+of surrounding punctuation, it is one of the known header phrases, or when
+it is a short ALL CAPS line, which still closes the previous section.
+"""
+
+from collections import namedtuple
+
+# Header phrases for each canonical section, compared lowercased
+SECTION_ALIASES = {
+    'summary': ('summary', 'professional summary', 'career summary', 'profile', 'professional profile',
+                'objective', 'career objective', 'about me'),
+    'experience': ('experience', 'work experience', 'professional experience', 'relevant experience',
+                   'employment', 'employment history', 'work history', 'career history', 'work',
+                   'internships', 'internship experience'),
+    'education': ('education', 'academic background', 'academic qualifications', 'qualifications',
+                  'education and training', 'academics'),
+    'skills': ('skills', 'technical skills', 'core skills', 'key skills', 'skills and abilities',
+               'technologies', 'technical expertise', 'expertise', 'core competencies', 'competencies'),
+    'projects': ('projects', 'academic projects', 'personal projects', 'project experience', 'key projects'),
+    'certifications': ('certifications', 'certificates', 'licenses and certifications',
+                       'licenses & certifications', 'courses'),
+    'honors': ('honors', 'awards', 'honors and awards', 'honors & awards', 'achievements', 'accomplishments'),
+    'publications': ('publications', 'research', 'research experience'),
+    'languages': ('languages',),
+    'interests': ('interests', 'hobbies', 'hobbies and interests'),
+    'volunteer': ('volunteer', 'volunteering', 'volunteer experience'),
+    'references': ('references',),
+    'contact': ('contact', 'contact information', 'contact details', 'personal information', 'personal details'),
+}
+
+_HEADER_LOOKUP = {alias: name for name, aliases in SECTION_ALIASES.items() for alias in aliases}
+
+# Lines before the first header, usually the name and contact details
+PREAMBLE = 'preamble'
+# Unrecognized ALL CAPS headers
+OTHER = 'other'
+
+MAX_HEADER_CHARS = 50
+
+Section = namedtuple('Section', ['name', 'header', 'start_line', 'lines'])
+
+
+def header_name(line):
+    """Return the canonical section name if line is a section header, else None"""
+    stripped = line.strip()
+    if not stripped or len(stripped) > MAX_HEADER_CHARS:
+        return None
+    key = ' '.join(stripped.strip(':-|•*#').split()).lower()
+    if key in _HEADER_LOOKUP:
+        return _HEADER_LOOKUP[key]
+    letters = stripped.replace(' ', '').replace('&', '')
+    if len(letters) > 3 and letters.isalpha() and letters.isupper():
+        return OTHER
+    return None
+
+
+def segment_sections(text):
+    """Return the sections of text, in document order, as Section tuples"""
+    lines = text.splitlines()
+    sections = []
+    name, header, start, body = PREAMBLE, '', 0, []
+    for i, line in enumerate(lines):
+        found = header_name(line)
+        if found is None:
+            body.append(line)
+            continue
+        if body or name != PREAMBLE:
+            sections.append(Section(name, header, start, body))
+        name, header, start, body = found, line.strip(), i, []
+    sections.append(Section(name, header, start, body))
+    return sections
+
+
+def section_lines(sections, name):
+    """Return the lines of every section with the given name, concatenated"""
+    lines = []
+    for section in sections:
+        if section.name == name:
+            lines.extend(section.lines)
+    return lines
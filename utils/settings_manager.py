@@ -9,12 +9,24 @@ class SettingsManager:
         "parser": {
             "max_pdf_size": 5,
             "enabled_features": ["Contact Details", "Education", "Work Experience", "Skills"],
-            "deep_parsing": True
+            "deep_parsing": True,
+            "llm_deep_parsing": False,
+            "deep_parsing_threshold": 0.7,
+            "ner_batch_size": 32,
+            "ner_chunk_chars": 2000,
+            "doc_cache": True,
+            "doc_cache_mb": 256,
+            "upload_spool_mb": 2,
+            "speculative_parsing": True,
+            "preview_dpi": 72,
+            "preview_cache_mb": 64
         },
         "database": {
             "host": "localhost",
             "name": "resume_parser_db",
-            "auto_backup": True
+            "auto_backup": True,
+            "rescore_batch_size": 2000,
+            "rescore_pause": 0.05
         },
         "security": {
             "admin_email": "admin@example.com",
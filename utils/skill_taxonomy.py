@@ -0,0 +1,105 @@
+"""
+Canonical skill taxonomy.
+
+data/skill_taxonomy.csv lists every known skill once, with a stable integer
+ID, a category and the synonyms and abbreviations it is also written as
+(js -> JavaScript, k8s -> Kubernetes). IDs are never renumbered or reused:
+new skills are appended with the next free ID, so IDs stored in the
+candidates database stay valid. Extraction, storage, search and analytics
+work on these IDs and only look names up for display.
+"""
+
+import csv
+import re
+
+TAXONOMY_FILE = 'data/skill_taxonomy.csv'
+OTHER = 'Other'
+
+# "Amazon Web Services (AWS)", "Redux (State management for JavaScript apps)"
+_QUALIFIED = re.compile(r"^(.*?)\s*\((.*)\)\s*$")
+
+
+def _key(text):
+    return ' '.join(text.lower().split())
+
+
+def read_taxonomy(file_path=TAXONOMY_FILE):
+    """Return the taxonomy as [id, name, category, [synonyms]] rows, checking that IDs and names are unique"""
+    rows = []
+    seen_ids, seen_names = set(), {}
+    with open(file_path, 'r', encoding='utf-8') as file:
+        for row in csv.DictReader(file):
+            skill_id = int(row['id'])
+            synonyms = [synonym.strip() for synonym in row['synonyms'].split('|') if synonym.strip()]
+            if skill_id in seen_ids:
+                raise ValueError(f"Duplicate skill ID {skill_id} in {file_path}")
+            seen_ids.add(skill_id)
+            for alias in [row['name']] + synonyms:
+                if seen_names.setdefault(_key(alias), skill_id) != skill_id:
+                    raise ValueError(f"'{alias}' names two skills in {file_path}")
+            rows.append([skill_id, row['name'].strip(), row['category'].strip() or OTHER, synonyms])
+    return rows
+
+
+class SkillTaxonomy:
+    """Skill IDs, canonical names, categories and the aliases that resolve to them"""
+
+    __slots__ = ('_names', '_categories', '_ids', 'categories', 'max_id')
+
+    def __init__(self, rows):
+        self._names = {}
+        self._categories = {}
+        self._ids = {}
+        for skill_id, name, category, synonyms in rows:
+            self._names[skill_id] = name
+            self._categories[skill_id] = category
+            for alias in [name] + synonyms:
+                self._ids[_key(alias)] = skill_id
+        self.categories = list(dict.fromkeys(self._categories.values()))
+        self.max_id = max(self._names, default=0)
+
+    def __len__(self):
+        return len(self._names)
+
+    def __contains__(self, skill_id):
+        return skill_id in self._names
+
+    def name(self, skill_id):
+        return self._names[skill_id]
+
+    def category(self, skill_id):
+        return self._categories.get(skill_id, OTHER)
+
+    def names(self):
+        return list(self._names.values())
+
+    def aliases(self):
+        """Return (lowercase alias, ID) pairs for every name and synonym"""
+        return list(self._ids.items())
+
+    def id_of(self, text):
+        """Return the ID of the skill text names or abbreviates, or None"""
+        skill_id = self._ids.get(_key(text))
+        if skill_id is None:
+            qualified = _QUALIFIED.match(text)
+            if qualified:
+                skill_id = self._ids.get(_key(qualified.group(1))) or self._ids.get(_key(qualified.group(2)))
+        return skill_id
+
+    def canonical(self, text):
+        """Return the canonical name for text, or text itself when it is not a known skill"""
+        skill_id = self.id_of(text)
+        return self._names[skill_id] if skill_id is not None else text.strip()
+
+    def canonical_list(self, names):
+        """Canonicalize names, dropping duplicates that resolve to the same skill"""
+        unique = {}
+        for name in names:
+            if name and name.strip():
+                canonical = self.canonical(name)
+                unique.setdefault(canonical.lower(), canonical)
+        return list(unique.values())
+
+    def ids_of(self, names):
+        """Return the unique IDs of the known skills among names, in order"""
+        return tuple(dict.fromkeys(skill_id for skill_id in map(self.id_of, names) if skill_id is not None))
@@ -0,0 +1,86 @@
+"""
+Speculative work on uploaded resumes.
+
+Pages used to start on an upload only when they needed the result: the
+Job Matcher extracted the text on Submit, and the Users and Recruiters
+pages parsed in the script run, starting over whenever an interaction cut
+that run short. submit() hands the work to a small pool of background
+threads as soon as a file lands in an uploader, keyed by the task and the
+upload's content hash. The user fills in the rest of the page while it
+runs, and result() picks up the finished (or still running) work; reruns
+and other sessions uploading the same file wait on it instead of
+repeating it.
+"""
+
+import threading
+from collections import OrderedDict
+from concurrent.futures import ThreadPoolExecutor
+
+from utils.llm_fallback import BACKGROUND_THREAD_PREFIX
+from utils.settings_manager import SettingsManager
+from utils.uploads import receive_upload
+
+WORKERS = 2
+# Finished results kept for reruns and repeated uploads
+MAX_RESULTS = 16
+
+_executor = None
+_futures = OrderedDict()
+_lock = threading.Lock()
+
+
+def enabled():
+    return SettingsManager().get_setting('parser', 'speculative_parsing')
+
+
+def _evict():
+    """Drop the oldest finished results beyond MAX_RESULTS; running ones are never dropped"""
+    for key in [key for key, future in _futures.items() if future.done()][:max(len(_futures) - MAX_RESULTS, 0)]:
+        del _futures[key]
+
+
+def submit(task, file):
+    """
+    Start task(upload) for an upload (an Upload or an uploaded file) in the
+    background and return its Future; the same task on the same content
+    returns the Future already started. Returns None when speculative
+    parsing is disabled.
+    """
+    global _executor
+    if not enabled():
+        return None
+    upload = receive_upload(file)
+    key = (task, upload.content_hash)
+    with _lock:
+        future = _futures.get(key)
+        # A failed run is tried again rather than failing every later caller
+        if future is None or (future.done() and future.exception() is not None):
+            if _executor is None:
+                _executor = ThreadPoolExecutor(max_workers=WORKERS, thread_name_prefix=BACKGROUND_THREAD_PREFIX)
+            future = _futures[key] = _executor.submit(task, upload)
+            _evict()
+        else:
+            _futures.move_to_end(key)
+    return future
+
+
+def result(task, file):
+    """The result of task for an upload, waiting for the background run (or running it here when disabled)"""
+    future = submit(task, file)
+    if future is None:
+        return task(receive_upload(file))
+    return future.result()
+
+
+def parse_resume(file):
+    """Start the text extraction and spaCy parse of an uploaded resume"""
+    from resume_parser import extract_resume_info_from_pdf
+
+    return submit(extract_resume_info_from_pdf, file)
+
+
+def parsed_resume(file):
+    """The spaCy Doc of an uploaded resume, from its speculative parse when there is one"""
+    from resume_parser import extract_resume_info_from_pdf
+
+    return result(extract_resume_info_from_pdf, file)
@@ -0,0 +1,112 @@
+"""
+Text normalization stage for extracted PDF text.
+
+Runs once per document, before tokenization. Character-level cleanup
+(ligatures, bullets, exotic spaces, quotes and dashes) goes through one
+precomputed str.translate table, then a single compiled pass rejoins words
+hyphenated across line breaks and normalizes line endings. An offset map
+from every normalized character back to the raw text is kept, so spans
+found in the normalized text can be reported against the original.
+"""
+
+import re
+
+import numpy as np
+
+# Canonical bullet every bullet glyph is mapped to
+BULLET = '•'
+
+_LIGATURES = {'ﬀ': 'ff', 'ﬁ': 'fi', 'ﬂ': 'fl', 'ﬃ': 'ffi', 'ﬄ': 'ffl', 'ﬅ': 'st', 'ﬆ': 'st'}
+_BULLETS = '•●⚫▪■□◦‣∙⁃◆◇►▶➢➤✓✔⭐○'
+_SPACES = '\u00a0\u2000\u2001\u2002\u2003\u2004\u2005\u2006\u2007\u2008\u2009\u200a\u202f\u205f\u3000'
+_ZERO_WIDTH = '\u200b\u200c\u200d\u2060\ufeff'
+_PUNCTUATION = {'‘': "'", '’': "'", '‚': "'", '′': "'", '“': '"', '”': '"', '„': '"', '″': '"',
+                '‐': '-', '‑': '-', '−': '-', '…': '...'}
+
+TRANSLATION_TABLE = str.maketrans({
+    **_LIGATURES,
+    **{char: BULLET for char in _BULLETS},
+    **{char: ' ' for char in _SPACES},
+    **{char: None for char in _ZERO_WIDTH},
+    **_PUNCTUATION,
+})
+
+# Length of each code point's replacement, for the code points whose length changes
+_LENGTH_CHANGES = {code: (0 if repl is None else len(repl))
+                   for code, repl in TRANSLATION_TABLE.items() if repl is None or len(repl) != 1}
+_CHANGED_CODES = np.array(sorted(_LENGTH_CHANGES), dtype=np.uint32)
+_CHANGED_LENGTHS = np.array([_LENGTH_CHANGES[code] for code in sorted(_LENGTH_CHANGES)], dtype=np.int64)
+
+# Soft hyphens (with any line break after them), words hyphenated across a line
+# break ("soft-\nware") and Windows / old Mac line endings
+_REJOIN = re.compile(r"\u00ad[ \t]{0,20}(?:\r?\n[ \t]{0,20})?"
+                     r"|(?<=[a-z])-[ \t]{0,20}\r?\n[ \t]{0,20}(?=[a-z])"
+                     r"|(?P<newline>\r\n?)")
+
+
+class NormalizedText:
+    """Normalized text plus the raw text and the offset map between them"""
+
+    __slots__ = ('text', 'raw', 'offsets')
+
+    def __init__(self, text, raw, offsets):
+        self.text = text
+        self.raw = raw
+        # offsets[i] is the raw index of normalized character i; one extra entry for len(text)
+        self.offsets = offsets
+
+    def raw_offset(self, index):
+        """Map an offset in the normalized text to an offset in the raw text"""
+        return int(self.offsets[min(max(index, 0), len(self.text))])
+
+    def raw_span(self, start, end):
+        """Map a normalized [start, end) span to the matching raw text span"""
+        if end <= start:
+            raw_start = self.raw_offset(start)
+            return raw_start, raw_start
+        return self.raw_offset(start), int(self.offsets[min(end, len(self.text)) - 1]) + 1
+
+    def split(self, raw_starts):
+        """Split the normalized text where the raw text starts each part (e.g. each PDF page)"""
+        cuts = np.searchsorted(self.offsets, raw_starts[1:]).tolist()
+        bounds = [0] + [min(cut, len(self.text)) for cut in cuts] + [len(self.text)]
+        return [self.text[start:end] for start, end in zip(bounds, bounds[1:])]
+
+    def __str__(self):
+        return self.text
+
+
+def _translate(raw):
+    """Apply the translation table and return the text with its offset map"""
+    text = raw.translate(TRANSLATION_TABLE)
+    if len(text) == len(raw) and not any(chr(code) in raw for code in _LENGTH_CHANGES):
+        return text, np.arange(len(raw) + 1, dtype=np.int64)
+    codes = np.frombuffer(raw.encode('utf-32-le'), dtype=np.uint32)
+    lengths = np.ones(len(codes), dtype=np.int64)
+    positions = np.searchsorted(_CHANGED_CODES, codes)
+    positions = np.minimum(positions, len(_CHANGED_CODES) - 1)
+    changed = _CHANGED_CODES[positions] == codes
+    lengths[changed] = _CHANGED_LENGTHS[positions[changed]]
+    offsets = np.repeat(np.arange(len(raw), dtype=np.int64), lengths)
+    return text, np.append(offsets, len(raw))
+
+
+def normalize_text(raw):
+    """Normalize extracted text once and return a NormalizedText"""
+    raw = raw or ''
+    text, offsets = _translate(raw)
+
+    parts, offset_parts = [], []
+    last = 0
+    for match in _REJOIN.finditer(text):
+        replacement = '\n' if match.group('newline') else ''
+        parts.append(text[last:match.start()])
+        offset_parts.append(offsets[last:match.start()])
+        parts.append(replacement)
+        offset_parts.append(offsets[match.start():match.start() + len(replacement)])
+        last = match.end()
+    if not parts:
+        return NormalizedText(text, raw, offsets)
+    parts.append(text[last:])
+    offset_parts.append(offsets[last:])
+    return NormalizedText(''.join(parts), raw, np.concatenate(offset_parts))
@@ -0,0 +1,130 @@
+"""
+Single handling path for uploaded PDFs.
+
+receive_upload checks the size against the max_pdf_size setting before
+reading anything (Streamlit reports the size of an upload up front; other
+streams are read in chunks and abandoned as soon as they pass the limit),
+hashes it, and returns an Upload that hashing, the blob store and the text
+extractors all share. The bytes of a Streamlit upload are used as they are:
+BytesIO.getvalue() hands out the buffer itself, not a copy, and since they
+are in memory already they stay there. Other streams larger than
+upload_spool_mb are spooled to a temporary file as they are read, which
+PyMuPDF then opens by path instead of being given the bytes.
+"""
+
+import hashlib
+import io
+import os
+import tempfile
+import weakref
+
+from utils.settings_manager import SettingsManager
+
+CHUNK_SIZE = 1 << 20
+
+
+class UploadTooLarge(ValueError):
+    """The upload is over the max_pdf_size setting"""
+
+
+def max_upload_mb():
+    return SettingsManager().get_setting('parser', 'max_pdf_size')
+
+
+def _too_large(limit_mb):
+    return UploadTooLarge(f"File size exceeds maximum allowed size of {limit_mb}MB")
+
+
+class Upload:
+    """An uploaded PDF held once, in memory or in a spool file, with its size and SHA-256"""
+
+    def __init__(self, name, data=None, path=None, content_hash=None, size=None):
+        self.name = name
+        self.data = data
+        self.path = path
+        self.size = len(data) if data is not None else size
+        self.content_hash = content_hash or hashlib.sha256(data).hexdigest()
+        if path is not None:
+            # The spool file goes away with the last reference to the upload
+            weakref.finalize(self, _remove, path)
+
+    def open_pdf(self):
+        """Open with PyMuPDF: from the spool file by path, otherwise from the shared bytes"""
+        import fitz
+
+        if self.path is not None:
+            return fitz.open(self.path)
+        return fitz.open(stream=self.data, filetype="pdf")
+
+
+def _remove(path):
+    try:
+        os.remove(path)
+    except OSError:
+        pass
+
+
+def receive_upload(file, name=None):
+    """
+    Return an Upload for a file-like object (a Streamlit UploadedFile or any
+    binary stream), raising UploadTooLarge when it is over max_pdf_size.
+    """
+    if isinstance(file, Upload):
+        return file
+    settings = SettingsManager()
+    limit_mb = settings.get_setting('parser', 'max_pdf_size')
+    limit = limit_mb * 1024 * 1024
+    spool_at = settings.get_setting('parser', 'upload_spool_mb') * 1024 * 1024
+    name = name or getattr(file, 'name', 'upload.pdf')
+
+    # Streamlit knows the size of an upload before anything is read
+    if getattr(file, 'size', 0) > limit:
+        raise _too_large(limit_mb)
+
+    # A Streamlit upload is already in memory; spooling it too would only hold it twice
+    if isinstance(file, io.BytesIO):
+        data = file.getvalue()
+        if len(data) > limit:
+            raise _too_large(limit_mb)
+        return Upload(name, data)
+
+    # Any other stream is read in chunks, hashed as it arrives and spooled once it is large
+    digest = hashlib.sha256()
+    memory = io.BytesIO()
+    spool_file, path, size = None, None, 0
+    try:
+        while chunk := file.read(CHUNK_SIZE):
+            size += len(chunk)
+            if size > limit:
+                raise _too_large(limit_mb)
+            digest.update(chunk)
+            if spool_file is None and size > spool_at:
+                fd, path = tempfile.mkstemp(prefix='upload-', suffix='.pdf')
+                spool_file = os.fdopen(fd, 'wb')
+                spool_file.write(memory.getbuffer())
+                memory = None
+            if spool_file is not None:
+                spool_file.write(chunk)
+            else:
+                memory.write(chunk)
+    except BaseException:
+        if spool_file is not None:
+            spool_file.close()
+            _remove(path)
+        raise
+    if spool_file is not None:
+        spool_file.close()
+        return Upload(name, path=path, content_hash=digest.hexdigest(), size=size)
+    # getvalue() hands back the BytesIO's own buffer rather than a copy of it
+    return Upload(name, memory.getvalue(), content_hash=digest.hexdigest())
+
+
+def open_pdf(source):
+    """Open an Upload, a file path or PDF bytes with PyMuPDF, without an extra BytesIO copy"""
+    import fitz
+
+    if isinstance(source, Upload):
+        return source.open_pdf()
+    if isinstance(source, (str, os.PathLike)):
+        return fitz.open(source)
+    return fitz.open(stream=source, filetype="pdf")
@@ -0,0 +1,158 @@
+"""
+Background warmup.
+
+serve.py starts the warmup once per server process, in a daemon thread,
+before Streamlit serves the first page, so that the spaCy models, lexicons
+and database schema checks are loaded before the first user opens Users or
+Recruiters instead of on their first request (under a plain `streamlit run
+main.py`, main.py starts it on the first script run). It finishes with a
+parse of a small sample resume so that the lazily imported parsing
+dependencies and the regular expressions are compiled too. The login page
+and the modules that parse resumes show the progress without waiting for
+it; a model still being loaded is waited for on first use.
+"""
+
+import threading
+import time
+
+PENDING = 'pending'
+RUNNING = 'running'
+READY = 'ready'
+FAILED = 'failed'
+
+SAMPLE_RESUME = """Jane Doe
+jane.doe@example.com | +1 555 010 2030 | linkedin.com/in/janedoe
+
+Professional Experience
+Senior Software Engineer at Example Corp
+Jan 2020 - Present
+• Built data pipelines in Python and SQL on AWS
+
+Software Developer at Sample Ltd
+June 2016 - December 2019
+• Developed web applications with JavaScript and React
+
+Education
+University of Example
+Bachelor of Science in Computer Science, 2016
+
+Skills
+Python, Java, Docker, Kubernetes, Machine Learning
+"""
+
+
+def _load_lexicons():
+    from resume_parser import get_lexicon_classifier
+    from utils.lexicon_artifact import load_lexicons
+    from utils.role_fit import get_role_fit_index
+
+    load_lexicons()
+    get_lexicon_classifier()
+    get_role_fit_index()
+
+
+def _load_models():
+    from resume_parser import get_nlp, get_skills_nlp
+
+    get_nlp()
+    get_skills_nlp()
+
+
+def _check_database():
+    from modules.recruiters import create_candidates_table, migrate_candidates_table
+    from modules.users import create_table
+
+    create_table()
+    create_candidates_table()
+    # The UI-free migration: st.success/st.error need a script run, which this thread has not
+    migrate_candidates_table()
+
+
+def _parse_sample():
+    import resume_parser
+    from utils.contact_scanner import contact_values
+    from utils.text_normalizer import normalize_text
+
+    # The extractors of extract_resume_info, without the Gemini deep parsing or the Doc cache
+    doc = resume_parser.get_nlp()(normalize_text(SAMPLE_RESUME).text)
+    resume_parser.extract_name_with_confidence(doc)
+    contact_values(doc.text)
+    resume_parser.extract_skills(doc)
+    resume_parser.extract_major(doc)
+    resume_parser.extract_experience(doc)
+    resume_parser.extract_education_from_resume(doc)
+
+
+# Run in order: the sample parse needs the lexicons and models of the earlier steps
+STEPS = (
+    ('Lexicons', _load_lexicons),
+    ('Language models', _load_models),
+    ('Database', _check_database),
+    ('Sample parse', _parse_sample),
+)
+
+
+class Warmup:
+    """Runs STEPS once in a background thread and records the state and duration of each"""
+
+    def __init__(self, steps=STEPS):
+        self.steps = steps
+        self.status = {name: (PENDING, None, '') for name, _ in steps}
+        self._thread = None
+        self._lock = threading.Lock()
+
+    def start(self):
+        with self._lock:
+            if self._thread is None:
+                self._thread = threading.Thread(target=self._run, name='warmup', daemon=True)
+                self._thread.start()
+
+    def _run(self):
+        for name, step in self.steps:
+            self.status[name] = (RUNNING, None, '')
+            started = time.perf_counter()
+            try:
+                step()
+            except Exception as e:
+                # A failed step is retried by the module that needs it, on first use
+                print(f"Warmup step {name} failed: {e}")
+                self.status[name] = (FAILED, time.perf_counter() - started, str(e))
+            else:
+                self.status[name] = (READY, time.perf_counter() - started, '')
+
+    @property
+    def done(self):
+        return all(state in (READY, FAILED) for state, _, _ in self.status.values())
+
+    @property
+    def ready(self):
+        return all(state == READY for state, _, _ in self.status.values())
+
+    def wait(self, timeout=None):
+        """Block until every step has finished or timeout seconds have passed; returns done"""
+        if self._thread is not None:
+            self._thread.join(timeout)
+        return self.done
+
+    def progress(self):
+        """Return (finished steps, total steps, name of the running step or None)"""
+        finished = sum(state in (READY, FAILED) for state, _, _ in self.status.values())
+        running = next((name for name, (state, _, _) in self.status.items() if state == RUNNING), None)
+        return finished, len(self.steps), running
+
+
+_warmup = Warmup()
+
+
+def start_warmup():
+    """Start the process-wide warmup if it is not running yet and return it"""
+    _warmup.start()
+    return _warmup
+
+
+if __name__ == '__main__':
+    # Time each step in the foreground: python -m utils.warmup
+    warmup = start_warmup()
+    warmup.wait()
+    for name, (state, seconds, error) in warmup.status.items():
+        print(f"{name:<16} {state:<8} {seconds:6.2f}s {error}")